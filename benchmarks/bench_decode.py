@@ -0,0 +1,69 @@
+"""Benchmark: decode + extract latency and peak memory for stdlib, orjson/msgspec and streaming partial extraction.
+
+Usage: python benchmarks/bench_decode.py [--items 50000] [--depth 1] [--repeat 5]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.decode import get_decoder, stream_extract
+from src.extract import STATEMENT_FIELDS, FieldExtractor
+
+from payloads import make_balancesheet
+
+
+def _measure(fn, repeat: int):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    ex = FieldExtractor(STATEMENT_FIELDS["balancesheet"])
+    payload = make_balancesheet(args.items, args.depth)
+    body = json.dumps(payload).encode("utf-8")
+    # same document with the target section first, where streaming can stop early
+    early = json.dumps({"sections": payload["sections"][-1:] + payload["sections"][:-1]}).encode("utf-8")
+    del payload
+
+    cases = [("json.loads + extract", lambda b: ex.extract(json.loads(b)))]
+    for name in ("orjson", "msgspec"):
+        try:
+            decode = get_decoder(name)
+        except ImportError:
+            print(f"{name}: not installed, skipped")
+            continue
+        cases.append((f"{name} + extract", lambda b, decode=decode: ex.extract(decode(b))))
+    cases.append(("stream_extract", lambda b: stream_extract(ex, b)))
+
+    print(f"body: {len(body) / 1e6:.2f} MB  ({args.items} line items, depth {args.depth})")
+    expected = ex.extract(json.loads(body))
+    for label, doc in (("targets last", body), ("targets first", early)):
+        print(label)
+        for name, fn in cases:
+            result, best, peak = _measure(lambda: fn(doc), args.repeat)
+            assert result == expected, f"{name} disagrees with the full decode"
+            print(f"  {name:22s} {best * 1000:8.2f} ms  peak={peak / 1e6:8.2f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Micro-benchmark: per-field `_find_value` calls vs a single `FieldExtractor` pass vs compiled payload shapes.
+
+Usage: python benchmarks/bench_extract.py [--items 5000] [--depth 1] [--repeat 5]
+"""
+import argparse
+import os
+import sys
+import time
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.cogs import _find_value
+from src.extract import FieldExtractor
+from src.schema import ShapeRegistry
+
+from payloads import make_balancesheet
+
+
+BS_KEYS = ["inventory", "capitalWorkInProgress"]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=1, help="nesting depth (>1 falls back to the generic walk)")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    payload = make_balancesheet(args.items, args.depth)
+    extractor = FieldExtractor(BS_KEYS)
+    registry = ShapeRegistry()
+    shaped = FieldExtractor(BS_KEYS, registry=registry)
+
+    expected = {k: _find_value(payload, k) for k in BS_KEYS}
+    assert extractor.extract(payload) == expected, "extractor disagrees with _find_value"
+    assert shaped.extract(payload) == expected, "shape accessor disagrees with _find_value"
+
+    per_field = _best(lambda: [_find_value(payload, k) for k in BS_KEYS], args.repeat)
+    single_pass = _best(lambda: extractor.extract(payload), args.repeat)
+    compiled = _best(lambda: shaped.extract(payload), args.repeat)
+
+    print(f"line items:         {args.items}")
+    print(f"_find_value x{len(BS_KEYS)}:     {per_field * 1000:.2f} ms")
+    print(f"FieldExtractor:     {single_pass * 1000:.2f} ms  ({per_field / single_pass:.2f}x)")
+    print(f"compiled shape:     {compiled * 1000:.2f} ms  ({per_field / compiled:.2f}x)  hits={registry.stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Benchmark: CLI startup and import cost, measured with `python -X importtime` in fresh interpreters.
+
+Usage: python benchmarks/bench_import.py [--repeat 5] [--output import.json]
+
+For each entry point it reports the wall time of the whole process and the import time on top of a bare
+interpreter (`python -c pass`), best of `--repeat` runs, plus the heaviest top-level imports. `run_suite.py`
+includes the same numbers under "import", so `--compare` flags a regression.
+"""
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+CASES = {
+    "cli_help": ["main.py", "--help"],
+    "import_main": ["-c", "import main"],
+    "import_graph": ["-c", "import src.graph"],
+    "import_client": ["-c", "import src.ac_api_client"],
+}
+
+_LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|( +)(\S+)")
+
+
+def _importtime(args):
+    """(wall seconds, {top-level module: cumulative us}) for one fresh interpreter."""
+    start = time.perf_counter()
+    proc = subprocess.run([sys.executable, "-X", "importtime", *args], cwd=ROOT, capture_output=True, text=True)
+    wall = time.perf_counter() - start
+    top = {}
+    for m in _LINE.finditer(proc.stderr):
+        if len(m.group(3)) == 1:
+            top[m.group(4)] = top.get(m.group(4), 0) + int(m.group(2))
+    return wall, top
+
+
+def measure(repeat: int = 5) -> dict:
+    """`<case>_wall_ms` and `<case>_import_ms` for every case, plus `heaviest` (not a metric)."""
+    base_wall, base_import = float("inf"), float("inf")
+    for _ in range(repeat):
+        wall, top = _importtime(["-c", "pass"])
+        base_wall, base_import = min(base_wall, wall), min(base_import, sum(top.values()))
+    results, heaviest = {"baseline_wall_ms": base_wall * 1000}, {}
+    for name, args in CASES.items():
+        best_wall, best_import, best_top = float("inf"), float("inf"), {}
+        for _ in range(repeat):
+            wall, top = _importtime(args)
+            best_wall = min(best_wall, wall)
+            if sum(top.values()) < best_import:
+                best_import, best_top = sum(top.values()), top
+        results[f"{name}_wall_ms"] = best_wall * 1000
+        results[f"{name}_import_ms"] = max(0.0, best_import - base_import) / 1000
+        heaviest[name] = sorted(best_top.items(), key=lambda kv: -kv[1])[:5]
+    return {"metrics": results, "heaviest": heaviest}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--output", help="write the metrics as JSON here")
+    args = parser.parse_args()
+
+    report = measure(args.repeat)
+    for name in CASES:
+        top = ", ".join(f"{mod} {us / 1000:.1f}" for mod, us in report["heaviest"][name])
+        print(f"{name:14s} wall={report['metrics'][f'{name}_wall_ms']:7.1f} ms  "
+              f"imports={report['metrics'][f'{name}_import_ms']:7.1f} ms  [{top}]")
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report["metrics"], fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""Benchmark: scalar Decimal compute path vs the columnar numpy kernel (float and exact int64 modes).
+
+Usage: python benchmarks/bench_kernel.py [--rows 200000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+import numpy as np
+
+from src.cogs import compute_cogs_from_formula, compute_cwip_transfers, compute_implied_purchases
+from src.kernel import FIELDS, cogs_kernel, cogs_kernel_exact, to_scaled
+from src.models import FinancialState
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=200000)
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    columns = {f: [Decimal(rng.randint(0, 10 ** 11)).scaleb(-2) for _ in range(args.rows)] for f in FIELDS}
+    rows = [FinancialState(**{f: columns[f][i] for f in FIELDS}) for i in range(args.rows)]
+
+    def scalar():
+        out = []
+        for fin in rows:
+            cwip = compute_cwip_transfers(fin)["data"]
+            purchases = compute_implied_purchases(fin)["data"]
+            out.append(compute_cogs_from_formula(fin.opening_inventory, purchases, cwip, fin.closing_inventory)["data"])
+        return out
+
+    scaled = {f: to_scaled(columns[f]) for f in FIELDS}
+    floats = {f: scaled[f] / 10 ** 4 for f in FIELDS}
+
+    _, t_scalar = _timed(scalar)
+    _, t_float = _timed(lambda: cogs_kernel(*(floats[f] for f in FIELDS)))
+    exact, t_exact = _timed(lambda: cogs_kernel_exact(*(scaled[f] for f in FIELDS)))
+    _, t_convert = _timed(lambda: [to_scaled(columns[f]) for f in FIELDS])
+    assert np.all(exact["reconciliation"] == 0)
+
+    print(f"rows:                    {args.rows}")
+    print(f"scalar Decimal path:     {t_scalar * 1000:9.1f} ms")
+    print(f"kernel float64:          {t_float * 1000:9.1f} ms  ({t_scalar / t_float:.0f}x)")
+    print(f"kernel exact int64:      {t_exact * 1000:9.1f} ms  ({t_scalar / t_exact:.0f}x)")
+    print(f"Decimal -> int64 import: {t_convert * 1000:9.1f} ms  (one-off, when loading a Decimal panel)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Benchmark: construction cost and per-instance memory of FinancialState vs CompactFinancialState.
+
+Usage: python benchmarks/bench_models.py [--count 100000]
+"""
+import argparse
+import gc
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.models import FIELDS, CompactFinancialState, FinancialState
+
+
+def _measure(build, count):
+    gc.collect()
+    start = time.perf_counter()
+    objs = [build(i) for i in range(count)]
+    elapsed = time.perf_counter() - start
+    del objs
+
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objs = [build(i) for i in range(count)]
+    after = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objs
+    return elapsed, after - before
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--count", type=int, default=100000)
+    args = parser.parse_args()
+
+    # shared Decimal values so memory numbers reflect the container, not the operands
+    decimals = [Decimal(i) / 100 for i in range(1000)]
+    raw = [str(d) for d in decimals]
+
+    cases = {
+        "FinancialState(raw strings)": lambda i: FinancialState(**{f: raw[(i + k) % 1000] for k, f in enumerate(FIELDS)}),
+        "FinancialState(Decimals)": lambda i: FinancialState(**{f: decimals[(i + k) % 1000] for k, f in enumerate(FIELDS)}),
+        "Compact(raw strings)": lambda i: CompactFinancialState(*(raw[(i + k) % 1000] for k in range(5))),
+        "Compact.from_decimals": lambda i: CompactFinancialState.from_decimals(*(decimals[(i + k) % 1000] for k in range(5))),
+    }
+
+    print(f"instances: {args.count}")
+    for name, build in cases.items():
+        elapsed, mem = _measure(build, args.count)
+        print(f"{name:30s} {elapsed / args.count * 1e6:7.2f} us/instance  {mem / args.count:7.1f} B/instance")
+
+
+if __name__ == "__main__":
+    main()
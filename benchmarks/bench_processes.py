@@ -0,0 +1,84 @@
+"""Benchmark: batch throughput on large payloads, threads only versus the hybrid thread + process-pool mode.
+
+Usage: python benchmarks/bench_processes.py [--items 20000] [--companies 16] [--years 4] [--cores 1,2,4,8]
+
+The stub server runs in its own process so that serving payloads does not compete for this process's GIL.
+Scaling is capped by the machine's core count (printed first); the stub server also needs a core.
+"""
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ac_api_client import ACAPIClient
+from src.batch import run_batch
+from src.transport import PooledTransport
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _start_server(items: int, depth: int) -> subprocess.Popen:
+    port = _free_port()
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen([sys.executable, os.path.join(here, "stub_server.py"), "--port", str(port),
+                             "--items", str(items), "--depth", str(depth)], stdout=subprocess.DEVNULL, cwd=here)
+    url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(url + "/health", timeout=1).close()
+            proc.base_url = url
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError("stub server did not start")
+
+
+def _run(base_url: str, pairs, workers: int, processes: int) -> dict:
+    with PooledTransport(pool_size=max(10, workers)) as transport:
+        client = ACAPIClient(base_url, api_key="bench", transport=transport, decoder="auto")
+        stats = run_batch(client, pairs, workers=workers, audit="off", processes=processes)
+    return stats.summary()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--items", type=int, default=20000, help="balance-sheet line items per payload")
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--companies", type=int, default=16)
+    parser.add_argument("--years", type=int, default=4)
+    parser.add_argument("--workers", type=int, default=8, help="fetch threads")
+    parser.add_argument("--cores", default="1,2,4,8", help="process counts to try")
+    args = parser.parse_args()
+
+    print(f"cpus: {os.cpu_count()}  items: {args.items}  pairs: {args.companies * args.years}")
+    server = _start_server(args.items, args.depth)
+    try:
+        # distinct companies per run, so no run benefits from another's warm server-side state
+        def pairs(tag):
+            return [(f"{tag}{c:03d}", 2023 - y) for c in range(args.companies) for y in range(args.years)]
+
+        _run(server.base_url, pairs("W"), args.workers, 0)
+        base = _run(server.base_url, pairs("T"), args.workers, 0)
+        print(f"{'threads only':14s} {base['pairs_per_sec']:8.2f} pairs/s  p50={base['p50_ms']:8.1f} ms  1.00x")
+        for n in (int(c) for c in args.cores.split(",")):
+            res = _run(server.base_url, pairs(f"P{n}_"), args.workers, n)
+            ratio = res["pairs_per_sec"] / base["pairs_per_sec"] if base["pairs_per_sec"] else 0.0
+            print(f"{f'{n} processes':14s} {res['pairs_per_sec']:8.2f} pairs/s  p50={res['p50_ms']:8.1f} ms  {ratio:.2f}x")
+    finally:
+        server.terminate()
+        server.wait()
+
+
+if __name__ == "__main__":
+    main()
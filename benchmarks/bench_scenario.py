@@ -0,0 +1,59 @@
+"""Benchmark: companies x scenarios what-if grid in one batched pass vs re-running the Decimal path per scenario.
+
+Usage: python benchmarks/bench_scenario.py [--companies 1000] [--scenarios 10000]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.cogs import compute_implied_purchases
+from src.models import FIELDS, CompactFinancialState
+from src.scenario import Scenario, base_matrix, run_scenarios
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--companies", type=int, default=1000)
+    parser.add_argument("--scenarios", type=int, default=10000)
+    parser.add_argument("--outputs", default="cogs,implied_purchases,cwip_transfers,reconciliation")
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    states = [
+        CompactFinancialState.from_decimals(*(Decimal(rng.randint(0, 10 ** 9)).scaleb(-2) for _ in FIELDS))
+        for _ in range(args.companies)
+    ]
+    scenarios = [
+        Scenario(f"s{i}", shocks={"closing_inventory": rng.uniform(-20, 20), "cwip_closing": rng.uniform(-10, 10)})
+        for i in range(args.scenarios)
+    ]
+    base = base_matrix(states)
+
+    start = time.perf_counter()
+    table = run_scenarios(base, scenarios, outputs=args.outputs.split(","))
+    batched = time.perf_counter() - start
+
+    # Decimal path for a sample of cells, extrapolated
+    sample = 2000
+    start = time.perf_counter()
+    for k in range(sample):
+        st, sc = states[k % len(states)], scenarios[k % len(scenarios)]
+        shocked = CompactFinancialState.from_decimals(*(
+            getattr(st, f) * (1 + Decimal(str(sc.shocks.get(f, 0))) / 100) for f in FIELDS
+        ))
+        compute_implied_purchases(shocked, audit="off")
+    per_cell = (time.perf_counter() - start) / sample
+
+    print(f"cells:   {len(table):,} ({args.companies} companies x {args.scenarios} scenarios)")
+    print(f"batched: {batched:.2f} s  ({len(table) / batched / 1e6:.1f} M cells/s, table {table.nbytes / 1e6:.0f} MB)")
+    print(f"decimal: {per_cell * 1e6:.1f} us/cell -> ~{per_cell * len(table):.0f} s for the full grid")
+
+
+if __name__ == "__main__":
+    main()
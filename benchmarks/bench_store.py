@@ -0,0 +1,57 @@
+"""Benchmark: cold vs warm vs offline runs through the SQLite statement store.
+
+Usage: python benchmarks/bench_store.py [--companies 20] [--years 2014-2023] [--latency 0.005]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ac_api_client import ACAPIClient
+from src.batch import parse_years
+from src.graph import StateGraph
+from src.store import StatementStore, StoreBackedClient
+from src.transport import PooledTransport
+
+from stub_server import StubServer
+
+
+def _run(client, pairs):
+    graph = StateGraph(client)
+    start = time.perf_counter()
+    for company, year in pairs:
+        graph.run(company, year, audit="off")
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--companies", type=int, default=20)
+    parser.add_argument("--years", default="2014-2023")
+    parser.add_argument("--latency", type=float, default=0.005)
+    args = parser.parse_args()
+    pairs = [(f"C{i:04d}", y) for i in range(args.companies) for y in parse_years(args.years)]
+    current_year = max(y for _, y in pairs)
+
+    with tempfile.TemporaryDirectory() as tmp, StubServer(latency=args.latency) as server, PooledTransport() as transport:
+        store = StatementStore(os.path.join(tmp, "statements.sqlite"))
+        client = ACAPIClient(server.base_url, api_key="bench", transport=transport)
+        rows = []
+        for label, mode in (("cold", "incremental"), ("warm", "incremental"), ("offline", "offline")):
+            backed = StoreBackedClient(store, client, mode=mode, current_year=current_year)
+            before = server.requests
+            elapsed = _run(backed, pairs)
+            rows.append((label, elapsed, server.requests - before, backed.stats))
+        store.close()
+
+    print(f"pairs: {len(pairs)}  (server latency {args.latency * 1000:.1f} ms; current fiscal year {current_year} is revalidated)")
+    for label, elapsed, requests, stats in rows:
+        print(f"{label:8s} {elapsed * 1000:9.1f} ms  http_requests={requests:5d}  {stats}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Benchmark: per-call `requests.get` vs the pooled keep-alive transport against the local stub server.
+
+Usage: python benchmarks/bench_transport.py [--calls 300] [--latency 0.0]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ac_api_client import ACAPIClient
+from src.transport import PooledTransport
+
+from stub_server import StubServer
+
+
+def _run(client: ACAPIClient, calls: int):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        res = client.get_balancesheet("AAPL", 2000 + i % 20)
+        latencies.append(time.perf_counter() - start)
+        assert not res.get("error"), res
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=300)
+    parser.add_argument("--latency", type=float, default=0.0, help="injected server latency (s)")
+    args = parser.parse_args()
+
+    with StubServer(latency=args.latency) as server:
+        plain = ACAPIClient(server.base_url, api_key="bench")
+        before = server.connections
+        plain_lat = _run(plain, args.calls)
+        plain_conns = server.connections - before
+
+        with PooledTransport(pool_size=4) as transport:
+            pooled = ACAPIClient(server.base_url, api_key="bench", transport=transport)
+            before = server.connections
+            pooled_lat = _run(pooled, args.calls)
+            pooled_conns = server.connections - before
+
+    for name, lat, conns in (("requests.get", plain_lat, plain_conns), ("PooledTransport", pooled_lat, pooled_conns)):
+        print(
+            f"{name:16s} total={sum(lat) * 1000:8.1f} ms  mean={statistics.mean(lat) * 1000:6.3f} ms  "
+            f"p50={statistics.median(lat) * 1000:6.3f} ms  connections={conns}"
+        )
+    print(f"speedup: {sum(plain_lat) / sum(pooled_lat):.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+"""Load test: the `main.py --serve` service under concurrent clients, backed by the stub AC server.
+
+Usage: python benchmarks/load_test.py [--clients 16] [--duration 10] [--companies 50] [--years 5]
+                                      [--latency 0.005] [--mode get|batch] [--batch-size 20]
+
+The stub server and the service each run in their own process, so neither competes with the load generator
+for a GIL. Each client keeps one keep-alive session and requests random (company, year) pairs from a fixed
+key space, so after warm-up most lookups are served from the service's response cache. Prints client-side
+throughput and latency, then the service's own `/stats` (cache hits, coalesced fetches, per-route latency).
+"""
+import argparse
+import json
+import math
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)]
+
+
+def _spawn(args, health_url: str) -> subprocess.Popen:
+    proc = subprocess.Popen([sys.executable, *args], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, cwd=ROOT)
+    for _ in range(100):
+        try:
+            urllib.request.urlopen(health_url, timeout=1).close()
+            return proc
+        except OSError:
+            time.sleep(0.1)
+    proc.kill()
+    raise RuntimeError(f"{args[0]} did not start")
+
+
+def _client(base_url: str, keys, args, deadline: float, seed: int, latencies, statuses, lock) -> None:
+    rng = random.Random(seed)
+    local, counts = [], {}
+    with requests.Session() as session:
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            if args.mode == "batch":
+                body = {"pairs": rng.sample(keys, min(args.batch_size, len(keys))), "audit": args.audit}
+                resp = session.post(f"{base_url}/cogs/batch", json=body, timeout=60)
+            else:
+                company, year = rng.choice(keys)
+                resp = session.get(f"{base_url}/cogs/{company}/{year}", params={"audit": args.audit}, timeout=60)
+            resp.content
+            local.append(time.perf_counter() - start)
+            counts[resp.status_code] = counts.get(resp.status_code, 0) + 1
+    with lock:
+        latencies.extend(local)
+        for status, n in counts.items():
+            statuses[status] = statuses.get(status, 0) + n
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--clients", type=int, default=16, help="concurrent keep-alive clients")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of load")
+    parser.add_argument("--companies", type=int, default=50)
+    parser.add_argument("--years", type=int, default=5)
+    parser.add_argument("--latency", type=float, default=0.005, help="stub server latency per statement request")
+    parser.add_argument("--items", type=int, default=50, help="line items per stub payload")
+    parser.add_argument("--mode", choices=("get", "batch"), default="get")
+    parser.add_argument("--batch-size", type=int, default=20, help="pairs per POST /cogs/batch in batch mode")
+    parser.add_argument("--audit", choices=("off", "structured", "text"), default="off")
+    parser.add_argument("--workers", type=int, default=8, help="passed to the service as --workers")
+    parser.add_argument("--output", help="write the results as JSON here")
+    args = parser.parse_args()
+
+    stub_port, service_port = _free_port(), _free_port()
+    stub_url, service_url = f"http://127.0.0.1:{stub_port}", f"http://127.0.0.1:{service_port}"
+    stub = _spawn([os.path.join("benchmarks", "stub_server.py"), "--port", str(stub_port), "--items", str(args.items),
+                   "--latency", str(args.latency)], stub_url + "/health")
+    service = None
+    try:
+        service = _spawn(["main.py", "--serve", "--port", str(service_port), "--base-url", stub_url,
+                          "--workers", str(args.workers)], service_url + "/health")
+        keys = [(f"C{c:04d}", 2024 - y) for c in range(args.companies) for y in range(args.years)]
+        latencies, statuses, lock = [], {}, threading.Lock()
+        started = time.perf_counter()
+        deadline = started + args.duration
+        threads = [threading.Thread(target=_client, args=(service_url, keys, args, deadline, i, latencies, statuses, lock))
+                   for i in range(args.clients)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        elapsed = time.perf_counter() - started
+        ordered = sorted(latencies)
+        results = {
+            "mode": args.mode,
+            "clients": args.clients,
+            "requests": len(ordered),
+            "requests_per_sec": round(len(ordered) / elapsed, 2),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+            "max_ms": round(ordered[-1] * 1000, 2) if ordered else 0.0,
+            "statuses": {str(k): v for k, v in sorted(statuses.items())},
+            "service": requests.get(service_url + "/stats", timeout=10).json(),
+        }
+    finally:
+        if service is not None:
+            service.terminate()
+            service.wait()
+        stub.terminate()
+        stub.wait()
+
+    print(f"{results['requests']} requests from {args.clients} clients in {elapsed:.1f}s: "
+          f"{results['requests_per_sec']:.1f} req/s  p50={results['p50_ms']:.2f} ms  p99={results['p99_ms']:.2f} ms  "
+          f"statuses={results['statuses']}")
+    print("service:", json.dumps(results["service"]))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(results, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Synthetic AC payloads for benchmarks, shaped like the `sections[].lineItems[]` responses in scripts/demo_real_example.py.
+
+Usage: python benchmarks/payloads.py [--items 5000] [--depth 1] > payload.json
+"""
+import argparse
+import json
+import random
+import zlib
+from typing import Callable
+
+
+def _amount(rng: random.Random) -> str:
+    value = rng.randint(-50_000, 500_000) + rng.randint(0, 99) / 100
+    text = f"{abs(value):,.2f}"
+    return f"({text})" if value < 0 else text
+
+
+def _line_items(rng: random.Random, prefix: str, count: int) -> list:
+    items = []
+    for i in range(count):
+        # mix the labelled shapes the extractor understands
+        if i % 2:
+            items.append({"label": f"{prefix} item {i}", "amount": _amount(rng)})
+        else:
+            items.append({"name": f"{prefix} item {i}", "value": _amount(rng)})
+    return items
+
+
+def _section(rng: random.Random, title: str, items: int, depth: int, per_section: int) -> dict:
+    """A section holding `items` line items, split across four nested `subsections` per level while `depth` > 1."""
+    section = {"title": title}
+    if depth <= 1:
+        section["lineItems"] = _line_items(rng, title, items)
+        return section
+    share = -(-items // 4)
+    section["subsections"] = [
+        _section(rng, f"{title}.{c}", min(share, items - c * share), depth - 1, per_section)
+        for c in range(4) if items > c * share
+    ]
+    return section
+
+
+def make_balancesheet(items: int = 100, depth: int = 1, per_section: int = 50, seed: int = 0,
+                      inventory: str = "1,200", cwip: str = "300") -> dict:
+    """Balance sheet with `items` filler line items and the target fields in the last section (worst case).
+
+    `depth` > 1 nests the filler under `subsections`, which only the generic walk handles.
+    """
+    rng = random.Random(seed)
+    chunk = per_section * 4 ** (max(1, depth) - 1)
+    sections = [
+        _section(rng, f"Section {s}", min(chunk, items - s * chunk), depth, per_section)
+        for s in range(-(-max(0, items) // chunk))
+    ]
+    sections.append({"title": "Current assets", "lineItems": [
+        {"label": "Inventory", "amount": inventory},
+        {"name": "CapitalWorkInProgress", "value": cwip},
+    ]})
+    return {"sections": sections}
+
+
+def make_pnl(items: int = 20, seed: int = 0, cost_of_revenue: str = "1,023") -> dict:
+    """P&L as a `metrics[]` list with the cost line at the end."""
+    rng = random.Random(seed)
+    metrics = _line_items(rng, "Metric", items)
+    metrics.append({"name": "CostOfRevenue", "value": cost_of_revenue})
+    return {"metrics": metrics}
+
+
+def payload_factory(items: int = 100, depth: int = 1, pnl_items: int = 20) -> Callable[[str, str, int], dict]:
+    """`StubServer(payload=...)` callback serving generated statements; values vary with company and year."""
+    cache = {}
+
+    def payload(endpoint: str, company: str, year: int) -> dict:
+        key = (endpoint, company, year)
+        if key not in cache:
+            seed = zlib.crc32(f"{company}:{year}".encode())
+            if endpoint == "pnl":
+                cache[key] = make_pnl(pnl_items, seed=seed, cost_of_revenue=str(1000 + year % 100))
+            else:
+                cache[key] = make_balancesheet(items, depth, seed=seed, inventory=str(100 + year % 100),
+                                               cwip=str(50 + year % 10))
+        return cache[key]
+
+    return payload
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=5000)
+    parser.add_argument("--depth", type=int, default=1)
+    parser.add_argument("--pnl", action="store_true", help="emit a P&L instead of a balance sheet")
+    args = parser.parse_args()
+    payload = make_pnl(args.items) if args.pnl else make_balancesheet(args.items, args.depth)
+    print(json.dumps(payload))
+
+
+if __name__ == "__main__":
+    main()
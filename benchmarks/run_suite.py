@@ -0,0 +1,184 @@
+"""Benchmark suite: extraction, compute, single-run and batch throughput on generated payloads, plus CLI startup
+and import time, saved as JSON.
+
+Usage: python benchmarks/run_suite.py [--quick] [--output results.json] [--compare baseline.json]
+
+Metrics ending in `_ms` are lower-is-better; metrics ending in `_per_sec` are higher-is-better. Save one file per
+commit and pass an older one to `--compare` to see the ratio for every metric.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+
+# Ensure project root is on sys.path so `src` package imports work when running the script directly
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+
+from src.ac_api_client import ACAPIClient
+from src.batch import run_batch
+from src.cogs import calculate_cogs_for_company
+from src.extract import FieldExtractor
+from src.graph import StateGraph
+from src.schema import ShapeRegistry
+from src.transport import PooledTransport, RetryPolicy
+
+import bench_import
+from payloads import make_balancesheet, make_pnl, payload_factory
+from stub_server import StubServer
+
+
+BS_KEYS = ["inventory", "capitalWorkInProgress"]
+
+
+def _best(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def _commit() -> str:
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, timeout=10,
+                             cwd=os.path.dirname(os.path.abspath(__file__)))
+        return out.stdout.strip() or "unknown"
+    except (OSError, subprocess.SubprocessError):
+        return "unknown"
+
+
+def bench_extraction(items: int, repeat: int) -> dict:
+    results = {}
+    for depth in (1, 3):
+        payload = make_balancesheet(items, depth)
+        generic = FieldExtractor(BS_KEYS)
+        shaped = FieldExtractor(BS_KEYS, registry=ShapeRegistry())
+        results[f"generic_depth{depth}_ms"] = _best(lambda: generic.extract(payload), repeat) * 1000
+        results[f"shaped_depth{depth}_ms"] = _best(lambda: shaped.extract(payload), repeat) * 1000
+    return results
+
+
+def bench_compute(items: int, pairs: int, repeat: int) -> dict:
+    bs_current, bs_prev = make_balancesheet(items, seed=1), make_balancesheet(items, seed=2)
+    pnl = make_pnl(seed=3)
+    client = ACAPIClient("http://unused.invalid", api_key="bench")
+
+    def run(audit):
+        for _ in range(pairs):
+            calculate_cogs_for_company(client, "BENCH", 2023, audit=audit,
+                                       bs_current=bs_current, bs_prev=bs_prev, pnl_current=pnl)
+
+    return {
+        f"{audit}_pairs_per_sec": pairs / _best(lambda: run(audit), repeat)
+        for audit in ("text", "off")
+    }
+
+
+def bench_single_run(server: StubServer, runs: int) -> dict:
+    with PooledTransport(pool_size=4) as transport:
+        graph = StateGraph(ACAPIClient(server.base_url, api_key="bench", transport=transport))
+        graph.run("WARMUP", 2000)
+        latencies = []
+        for i in range(runs):
+            start = time.perf_counter()
+            graph.run("AAPL", 2000 + i % 20)
+            latencies.append(time.perf_counter() - start)
+    ordered = sorted(latencies)
+    return {
+        "mean_ms": statistics.mean(latencies) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))] * 1000,
+    }
+
+
+def bench_batch(server: StubServer, companies: int, years: int, workers: int) -> dict:
+    pairs = [(f"C{i:04d}", 2023 - y) for i in range(companies) for y in range(years)]
+    with PooledTransport(pool_size=max(10, workers)) as transport:
+        retry = RetryPolicy(backoff_factor=0.001, jitter=False)
+        client = ACAPIClient(server.base_url, api_key="bench", transport=transport, retry=retry)
+        stats = run_batch(client, pairs, workers=workers, audit="off")
+    summary = stats.summary()
+    return {
+        "pairs": summary["pairs"],
+        "failed": summary["failed"],
+        "requests": summary["requests"],
+        "pairs_per_sec": summary["pairs_per_sec"],
+        "p50_ms": summary["p50_ms"],
+        "p99_ms": summary["p99_ms"],
+    }
+
+
+def compare(current: dict, baseline: dict) -> str:
+    """Table of every shared metric with its speedup versus the baseline (>1 means faster now)."""
+    lines = [f"baseline {baseline['meta']['commit']} -> current {current['meta']['commit']}"]
+    for bench, metrics in current["results"].items():
+        old = baseline.get("results", {}).get(bench, {})
+        for name, value in metrics.items():
+            if name not in old or not old[name] or not value:
+                continue
+            if name.endswith("_ms"):
+                ratio = old[name] / value
+            elif name.endswith("_per_sec"):
+                ratio = value / old[name]
+            else:
+                continue
+            lines.append(f"{bench + '.' + name:36s} {old[name]:12.3f} {value:12.3f}  {ratio:5.2f}x")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="small sizes for a smoke run")
+    parser.add_argument("--items", type=int, default=None, help="balance-sheet line items (default 5000, quick 500)")
+    parser.add_argument("--latency", type=float, default=0.002, help="stub server latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub requests that fail")
+    parser.add_argument("--workers", type=int, default=8)
+    parser.add_argument("--output", help="write results JSON here")
+    parser.add_argument("--compare", metavar="BASELINE", help="results JSON from an earlier commit")
+    args = parser.parse_args()
+
+    items = args.items or (500 if args.quick else 5000)
+    repeat = 3 if args.quick else 5
+    server_items = min(items, 500)
+
+    results = {"extraction": bench_extraction(items, repeat)}
+    results["compute"] = bench_compute(server_items, 50 if args.quick else 300, repeat)
+    with StubServer(latency=args.latency, payload=payload_factory(server_items), error_rate=args.error_rate) as server:
+        results["single_run"] = bench_single_run(server, 20 if args.quick else 100)
+        results["batch"] = bench_batch(server, 10 if args.quick else 50, 5 if args.quick else 10, args.workers)
+        results["batch"]["injected_errors"] = server.errors
+    results["import"] = bench_import.measure(repeat)["metrics"]
+
+    report = {
+        "meta": {
+            "commit": _commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "items": items,
+            "server_items": server_items,
+            "latency": args.latency,
+            "error_rate": args.error_rate,
+            "workers": args.workers,
+            "quick": args.quick,
+        },
+        "results": {bench: {k: round(v, 4) for k, v in metrics.items()} for bench, metrics in results.items()},
+    }
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            fh.write(text + "\n")
+    print(text)
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as fh:
+            print(compare(report, json.load(fh)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""Local stub AC server for benchmarks: serves balance sheets and P&Ls over HTTP/1.1 keep-alive.
+
+Usage: python benchmarks/stub_server.py [--port 3000] [--latency 0.005] [--error-rate 0.05] [--items 500]
+"""
+import argparse
+import hashlib
+import json
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional, Tuple
+from urllib.parse import parse_qs, urlparse
+
+from payloads import payload_factory
+
+
+def default_payload(endpoint: str, company: str, year: int) -> dict:
+    if endpoint == "pnl":
+        return {"metrics": [{"name": "CostOfRevenue", "value": str(1000 + year % 100)}]}
+    return {
+        "sections": [
+            {"lineItems": [{"label": "Inventory", "amount": str(100 + year % 100)}]},
+            {"lineItems": [{"name": "CapitalWorkInProgress", "value": str(50 + year % 10)}]},
+        ]
+    }
+
+
+class StubServer:
+    """Threaded stub server; use as a context manager, then point `ACAPIClient` at `.base_url`.
+
+    `latency` (+ uniform `jitter`) is slept before every response. A seeded `error_rate` fraction of statement
+    requests fails with `error_status` (counted in `.errors`), so retry and error paths can be benchmarked.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0, payload=default_payload,
+                 jitter: float = 0.0, error_rate: float = 0.0, error_status: int = 503, seed: int = 0):
+        self.latency = latency
+        self.jitter = jitter
+        self.payload = payload
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.requests = 0
+        self.connections = 0
+        self.errors = 0
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def _count(self, attr: str) -> None:
+        with self._lock:
+            setattr(self, attr, getattr(self, attr) + 1)
+
+    def _delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def _inject_error(self) -> bool:
+        if not self.error_rate:
+            return False
+        with self._lock:
+            failed = self._rng.random() < self.error_rate
+            self.errors += failed
+        return failed
+
+    def _route(self, raw_path: str) -> Tuple[int, dict]:
+        url = urlparse(raw_path)
+        parts = url.path.strip("/").split("/")
+        if url.path == "/health":
+            return 200, {"status": "ok"}
+        if len(parts) == 4 and parts[:2] == ["server", "company"] and parts[2] in ("balancesheet", "pnl"):
+            if self._inject_error():
+                return self.error_status, {"error": "injected failure"}
+            year = int(parse_qs(url.query).get("calendarYear", ["0"])[0])
+            return 200, self.payload(parts[2], parts[3], year)
+        return 404, {"error": "not found"}
+
+    def _handler(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # headers and body go out in separate writes; avoid the delayed-ACK stall on keep-alive sockets
+            disable_nagle_algorithm = True
+
+            def setup(self):
+                super().setup()
+                server._count("connections")
+
+            def do_GET(self):
+                server._count("requests")
+                delay = server._delay()
+                if delay:
+                    time.sleep(delay)
+                status, body = server._route(self.path)
+                data = json.dumps(body).encode("utf-8")
+                etag = '"' + hashlib.sha1(data).hexdigest() + '"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    self.send_response(304)
+                    self.send_header("ETag", etag)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                if status == 200:
+                    self.send_header("ETag", etag)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def start(self) -> "StubServer":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def __enter__(self) -> "StubServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--port", type=int, default=3000)
+    parser.add_argument("--latency", type=float, default=0.0)
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra uniform random latency (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of statement requests that fail")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--items", type=int, default=None, help="serve generated balance sheets with this many line items")
+    parser.add_argument("--depth", type=int, default=1, help="nesting depth of generated balance sheets")
+    args = parser.parse_args()
+    payload = payload_factory(args.items, args.depth) if args.items is not None else default_payload
+    server = StubServer(port=args.port, latency=args.latency, payload=payload, jitter=args.jitter,
+                        error_rate=args.error_rate, error_status=args.error_status)
+    print(f"Stub AC server on {server.base_url}")
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,209 @@
-import os
+import argparse
 import json
+import os
+import sys
+
+# src modules are imported where they are used: `--help` and store-only runs skip requests, pydantic and
+# python-dotenv entirely (benchmarks/bench_import.py tracks this)
+
+
+def make_client(base_url: str | None = None, pool_size: int = 10, store: str | None = None,
+                store_mode: str = "incremental", max_age_days: float | None = None, hooks=None, partial: bool = False,
+                scheduler=None, cache=None):
+    """ACAPIClient on a pooled transport with the fastest installed JSON decoder, optionally fronted by a local
+    statement store. `partial` reads only the needed fields from each response body. An offline store gets no
+    HTTP client at all."""
+    client = None
+    if store is None or store_mode != "offline":
+        from src.ac_api_client import ACAPIClient
+        from src.env import load_env
+        from src.transport import PooledTransport
+
+        load_env()
+        base = base_url or os.getenv("AC_BASE_URL", "http://localhost:3000")
+        client = ACAPIClient(base, transport=PooledTransport(pool_size=pool_size), hooks=hooks, decoder="auto",
+                             partial=partial, scheduler=scheduler, cache=cache)
+    if store is None:
+        return client
+    from src.store import StatementStore, StoreBackedClient
 
-from src.ac_api_client import ACAPIClient
-from src.graph import StateGraph
+    max_age = max_age_days * 86400 if max_age_days is not None else None
+    return StoreBackedClient(StatementStore(store), client, mode=store_mode, max_age=max_age)
 
 
-def main(company: str = "AAPL", year: int = 2023, base_url: str | None = None):
-    base = base_url or os.getenv("AC_BASE_URL", "http://localhost:3000")
-    client = ACAPIClient(base)
-    graph = StateGraph(client)
-    state = graph.run(company, year)
+def main(company: str = "AAPL", year: int = 2023, base_url: str | None = None, audit: str = "text",
+         store: str | None = None, store_mode: str = "incremental", max_age_days: float | None = None, hooks=None,
+         partial: bool = False, fail_fast: bool = False, scheduler=None):
+    from src.graph import StateGraph
+
+    client = make_client(base_url, store=store, store_mode=store_mode, max_age_days=max_age_days, hooks=hooks,
+                         partial=partial, scheduler=scheduler)
+    # the three statement fetches are independent nodes, so they run side by side
+    with StateGraph(client, hooks=hooks, workers=3) as graph:
+        state = graph.run(company, year, audit=audit, fail_fast=fail_fast)
     return state
 
 
+def run_batch_cli(args, hooks=None, scheduler=None) -> dict:
+    """Batch mode: one compact JSON report per line, written as each (company, year) completes."""
+    from src.batch import dedupe_pairs, load_pairs_csv, parse_years, run_batch
+    from src.output import JsonlWriter, completed_pairs
+
+    years = parse_years(args.years) if args.years else []
+    pairs = []
+    if args.batch:
+        pairs.extend(load_pairs_csv(args.batch, years))
+    if args.companies:
+        pairs.extend((c.strip(), y) for c in args.companies.split(",") if c.strip() for y in years)
+    pairs = dedupe_pairs(pairs)
+
+    skipped = 0
+    if args.resume and args.output:
+        done = completed_pairs(args.output, compress=args.gzip or None)
+        skipped = sum(1 for p in pairs if p in done)
+        pairs = [p for p in pairs if p not in done]
+
+    client = make_client(args.base_url, pool_size=max(10, args.workers), store=args.store,
+                         store_mode=args.store_mode, max_age_days=args.max_age_days, hooks=hooks,
+                         partial=args.partial, scheduler=scheduler)
+    tracker = None
+    if args.results_db:
+        from src.incremental import ResultTracker
+
+        tracker = ResultTracker(args.results_db)
+    columnar = None
+    if args.columnar_out:
+        from src.columnar import ColumnarWriter  # pyarrow is only needed for this export
+
+        columnar = ColumnarWriter(args.columnar_out)
+    try:
+        with JsonlWriter(args.output, compress=args.gzip or None, append=args.resume) as writer:
+            stats = run_batch(client, pairs, workers=args.workers, sink=writer, audit=args.audit,
+                              hooks=hooks, processes=args.processes, on_result=columnar, tracker=tracker)
+    finally:
+        if columnar is not None:
+            columnar.close()
+        if tracker is not None:
+            tracker.close()
+    summary = stats.summary()
+    summary["skipped"] = skipped
+    flight = getattr(getattr(client, "client", client), "flight", None)
+    if flight is not None:
+        summary["coalesced"] = flight.coalesced
+    if scheduler is not None:
+        summary["throttle"] = scheduler.stats()
+    return summary
+
+
+def serve(args, hooks=None, scheduler=None) -> None:
+    """Service mode: answer lookups over HTTP from one warm client (pooled connections, response cache)."""
+    from src.cache import MemoryCache
+    from src.instrumentation import Profiler
+    from src.service import CogsService
+
+    hooks = hooks if hooks is not None else Profiler()
+    client = make_client(args.base_url, pool_size=max(10, args.workers * 3), store=args.store,
+                         store_mode=args.store_mode, max_age_days=args.max_age_days, hooks=hooks,
+                         partial=args.partial, scheduler=scheduler,
+                         cache=MemoryCache(maxsize=args.cache_size, ttl=args.cache_ttl))
+    service = CogsService(client, host=args.host, port=args.port, hooks=hooks, fetch_workers=max(3, args.workers * 3),
+                          batch_workers=args.workers)
+    print(f"serving on {service.base_url}", file=sys.stderr)
+    try:
+        service.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Compute COGS for a company/year from the AC API.")
+    parser.add_argument("--company", default="AAPL")
+    parser.add_argument("--year", type=int, default=2023)
+    parser.add_argument("--base-url", default=None, help="AC server URL (default: $AC_BASE_URL or http://localhost:3000)")
+    parser.add_argument("--format", choices=("json", "jsonl"), default="json",
+                        help="single-run output: indented JSON (default) or one compact line")
+    parser.add_argument("--series", metavar="START-END", help="multi-year run for --company, e.g. 2010-2024")
+    parser.add_argument("--audit", choices=("off", "structured", "text"), default="text",
+                        help="audit trail: rendered text in logs (default), structured step records, or off")
+    parser.add_argument("--rate-limit", type=float, default=None, help="max requests per second to each AC host")
+    parser.add_argument("--rate-limit-shared", metavar="DIR",
+                        help="share the --rate-limit budget with every process using the same directory")
+    parser.add_argument("--fail-fast", action="store_true",
+                        help="single run: skip the calculation when a statement fetch fails")
+    parser.add_argument("--partial", action="store_true",
+                        help="stream only the needed fields out of each response instead of decoding it whole")
+    parser.add_argument("--profile", action="store_true",
+                        help="print per-node, per-HTTP-call and extraction timings to stderr when done")
+    parser.add_argument("--metrics-out", metavar="PATH",
+                        help="write collected metrics as Prometheus text, or OTLP/JSON if PATH ends in .json")
+    store = parser.add_argument_group("local statement store")
+    store.add_argument("--store", metavar="SQLITE", help="keep fetched statements in this SQLite file")
+    store.add_argument("--store-mode", choices=("incremental", "offline", "refresh"), default="incremental",
+                       help="incremental: refetch only the current fiscal year and stale entries; offline: never fetch")
+    store.add_argument("--max-age-days", type=float, default=None, help="refetch stored entries older than this")
+    batch = parser.add_argument_group("batch mode")
+    batch.add_argument("--batch", metavar="CSV", help="CSV with a company/ticker column and optional year column")
+    batch.add_argument("--companies", help="comma-separated tickers (used with --years)")
+    batch.add_argument("--years", help="years for rows without one, e.g. 2015-2024 or 2022,2023")
+    batch.add_argument("--workers", type=int, default=8)
+    batch.add_argument("--processes", type=int, default=0,
+                       help="decode, extract and compute on this many worker processes; --workers threads only fetch")
+    batch.add_argument("--output", help="JSON-lines output file, gzip-compressed if it ends in .gz (default: stdout)")
+    batch.add_argument("--gzip", action="store_true", help="gzip the output regardless of its extension")
+    batch.add_argument("--results-db", metavar="SQLITE",
+                       help="reuse results whose three input statements are unchanged since they were recorded here")
+    batch.add_argument("--columnar-out", metavar="PATH",
+                       help="also write typed inputs and outputs as Parquet (.parquet) or Arrow IPC (.arrow); needs pyarrow")
+    batch.add_argument("--resume", action="store_true", help="append to --output, skipping pairs it already contains")
+    service = parser.add_argument_group("service mode")
+    service.add_argument("--serve", action="store_true",
+                         help="run an HTTP service (GET /cogs/COMPANY/YEAR, POST /cogs/batch, /metrics) instead")
+    service.add_argument("--host", default="127.0.0.1")
+    service.add_argument("--port", type=int, default=8080)
+    service.add_argument("--cache-size", type=int, default=65536, help="statements kept in the response cache")
+    service.add_argument("--cache-ttl", type=float, default=300.0, help="seconds a cached statement stays fresh")
+    args = parser.parse_args(argv)
+    if args.rate_limit_shared and not args.rate_limit:
+        parser.error("--rate-limit-shared needs --rate-limit")
+    if args.series:
+        start, _, end = (part.strip() for part in args.series.partition("-"))
+        if not (start.isdigit() and end.isdigit() and int(start) <= int(end)):
+            parser.error(f"--series must be START-END with START <= END, e.g. 2010-2024 (got {args.series!r})")
+        args.series = (int(start), int(end))
+    return args
+
+
 if __name__ == "__main__":
-    result = main()
-    # Print final report as JSON for CLI use
-    print(json.dumps(result.get("final_report", {}), indent=2))
+    args = parse_args()
+    from src.instrumentation import Profiler
+    from src.ratelimit import RequestScheduler
+
+    profiler = Profiler() if args.profile or args.metrics_out else None
+    scheduler = RequestScheduler(args.rate_limit, shared_dir=args.rate_limit_shared) if args.rate_limit else None
+    if args.serve:
+        serve(args, hooks=profiler, scheduler=scheduler)
+    elif args.batch or args.companies:
+        summary = run_batch_cli(args, hooks=profiler, scheduler=scheduler)
+        print(json.dumps(summary), file=sys.stderr)
+    elif args.series:
+        start, end = args.series
+        client = make_client(args.base_url, store=args.store, store_mode=args.store_mode, max_age_days=args.max_age_days,
+                             hooks=profiler, partial=args.partial, scheduler=scheduler)
+        from src.graph import StateGraph
+
+        result = StateGraph(client, hooks=profiler).run_range(args.company, start, end, audit=args.audit)
+        print(json.dumps(result["final_report"], indent=2 if args.format == "json" else None,
+                         separators=None if args.format == "json" else (",", ":")))
+    else:
+        result = main(args.company, args.year, args.base_url, audit=args.audit, store=args.store, store_mode=args.store_mode,
+                      max_age_days=args.max_age_days, hooks=profiler,
+                      partial=args.partial, fail_fast=args.fail_fast, scheduler=scheduler)
+        # Print final report as JSON for CLI use
+        if args.format == "jsonl":
+            print(json.dumps(result.get("final_report", {}), separators=(",", ":")))
+        else:
+            print(json.dumps(result.get("final_report", {}), indent=2))
+    if args.profile:
+        print(profiler.format_summary(), file=sys.stderr)
+    if args.metrics_out:
+        profiler.write(args.metrics_out)
@@ -6,10 +6,12 @@ import sys
 sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
 
 from src.ac_api_client import ACAPIClient
+from src.env import load_env
 from src.graph import StateGraph
 
 
 def run_live(company: str = "RELIANCE", year: int = 2023):
+    load_env()
     base = os.getenv("AC_BASE_URL", "http://localhost:3000")
     client = ACAPIClient(base)
 
@@ -1,35 +1,160 @@
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, Optional, Tuple, Union
 import os
-from dotenv import load_dotenv
+from time import perf_counter
 import requests
 
-
-# Load .env automatically (if present)
-load_dotenv()
+from .cache import ResponseCache
+from .decode import get_decoder, stream_extract
+from .env import load_env
+from .extract import STATEMENT_FIELDS, FieldExtractor
+from .instrumentation import Hooks
+from .ratelimit import RequestScheduler
+from .singleflight import SingleFlight
+from .transport import PooledTransport, RetryPolicy, get_with_retry
 
 
 class ACAPIClient:
-    def __init__(self, base_url: str, api_key: Optional[str] = None, timeout: int = 10):
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: int = 10,
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[PooledTransport] = None,
+        retry: Optional[RetryPolicy] = None,
+        hooks: Optional[Hooks] = None,
+        decoder: Union[str, Callable[[bytes], Any], None] = None,
+        partial: bool = False,
+        scheduler: Optional[RequestScheduler] = None,
+        coalesce: bool = True,
+    ):
         self.base_url = base_url.rstrip("/")
-        # Prefer explicit API key, otherwise fall back to environment
+        # Prefer explicit API key, otherwise fall back to environment (.env included)
+        load_env()
         self.api_key = api_key or os.getenv("AC_API_KEY")
         self.timeout = timeout
+        # Optional response cache keyed by (endpoint, company, calendarYear), e.g. src.cache.MemoryCache
+        self.cache = cache
+        # Pooled keep-alive transport; without one every call goes through a fresh `requests.get`
+        self.transport = transport
+        self.retry = retry if retry is not None else RetryPolicy()
+        # Told the latency, body size and JSON decode time of every call (src.instrumentation)
+        self.hooks = hooks
+        # JSON decoder for response bodies (src.decode.get_decoder name or callable); None keeps `resp.json()`
+        self.decoder = get_decoder(decoder) if decoder is not None else None
+        # Partial mode: statements come back as `{field: value}` for just the fields src.cogs reads,
+        # pulled from the raw body without decoding the whole document (src.decode.stream_extract)
+        self.partial = partial
+        self._partial_fields = {ep: FieldExtractor(keys) for ep, keys in STATEMENT_FIELDS.items()} if partial else {}
+        # Per-host request budget (src.ratelimit); every attempt, retries included, waits for a slot
+        self.scheduler = scheduler
+        # Concurrent identical GETs share one in-flight call; `flight.coalesced` counts the ones that did
+        self.flight = SingleFlight() if coalesce else None
+
+    def _get(self, path: str, params: Dict[str, Any] | None = None, fields: Optional[FieldExtractor] = None) -> Dict[str, Any]:
+        payload, _ = self.conditional_get(path, params=params, fields=fields)
+        return payload
+
+    def conditional_get(
+        self, path: str, params: Dict[str, Any] | None = None, etag: Optional[str] = None, last_modified: Optional[str] = None,
+        fields: Optional[FieldExtractor] = None,
+    ) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
+        """GET with optional `If-None-Match`/`If-Modified-Since` validators.
+
+        Returns `(payload, meta)` where meta holds `status_code`, `etag` and `last_modified`. The payload is
+        None on 304 Not Modified, and the usual error dict on failure. With `fields`, the payload is just
+        `fields.extract(<body>)`, read straight from the raw bytes. Identical calls made while one is in flight
+        wait for it and get the same (shared) result.
+        """
+        if self.flight is None:
+            return self._fetch(path, params, etag, last_modified, fields)
+        key = (path, tuple(sorted((params or {}).items())), etag, last_modified, id(fields))
+        return self.flight.do(key, lambda: self._fetch(path, params, etag, last_modified, fields))
+
+    def get_raw(self, endpoint: str, company: str, calendarYear: int | None = None) -> Union[bytes, Dict[str, Any]]:
+        """A statement's response body as the server sent it, or the usual error dict.
+
+        For handing bodies to other processes (src.hybrid) without pickling decoded trees; bypasses the cache
+        and partial mode, but still retries, rate-limits and coalesces.
+        """
+        path = f"/server/company/{endpoint}/{company}"
+        params = {"calendarYear": calendarYear} if calendarYear is not None else None
+        if self.flight is None:
+            return self._fetch(path, params, None, None, None, raw=True)[0]
+        key = (path, tuple(sorted((params or {}).items())), None, None, "raw")
+        return self.flight.do(key, lambda: self._fetch(path, params, None, None, None, raw=True))[0]
 
-    def _get(self, path: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+    def _fetch(self, path: str, params: Dict[str, Any] | None, etag: Optional[str], last_modified: Optional[str],
+               fields: Optional[FieldExtractor], raw: bool = False) -> Tuple[Optional[Dict[str, Any]], Dict[str, Any]]:
         url = f"{self.base_url}{path}"
         headers = {"x-api-key": self.api_key} if self.api_key else {}
+        if etag:
+            headers["If-None-Match"] = etag
+        if last_modified:
+            headers["If-Modified-Since"] = last_modified
+        start = perf_counter()
         try:
-            resp = requests.get(url, headers=headers, params=params, timeout=self.timeout)
+            get = self.transport.get if self.transport is not None else requests.get
+            if self.scheduler is not None:
+                get = self.scheduler.wrap(get)
+            resp = get_with_retry(get, url, self.retry, headers=headers, params=params, timeout=self.timeout)
+            elapsed = perf_counter() - start
             resp.raise_for_status()
-            return resp.json()
+            resp_headers = getattr(resp, "headers", None) or {}
+            meta = {
+                "status_code": getattr(resp, "status_code", None),
+                "etag": resp_headers.get("ETag"),
+                "last_modified": resp_headers.get("Last-Modified"),
+            }
+            if meta["status_code"] == 304:
+                self._report(path, meta["status_code"], elapsed, resp, 0.0)
+                return None, meta
+            if raw:
+                self._report(path, meta["status_code"], elapsed, resp, 0.0)
+                return bytes(resp.content), meta
+            decode_start = perf_counter()
+            try:
+                payload = self._decode(resp, fields)
+            except ValueError as exc:
+                # a 200 whose body is not JSON (an HTML error page, a truncated body) is a failed fetch too
+                payload = {"error": True, "message": f"invalid JSON body: {exc}", "status_code": meta["status_code"]}
+            self._report(path, meta["status_code"], elapsed, resp, perf_counter() - decode_start)
+            return payload, meta
         except requests.RequestException as exc:
             # Return a structured error dict instead of raising to allow graph-level handling
-            return {"error": True, "message": str(exc), "status_code": getattr(getattr(exc, "response", None), "status_code", None)}
+            status = getattr(getattr(exc, "response", None), "status_code", None)
+            self._report(path, status, perf_counter() - start, getattr(exc, "response", None), 0.0)
+            return {"error": True, "message": str(exc), "status_code": status}, {"status_code": status, "etag": None, "last_modified": None}
 
-    def get_balancesheet(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+    def _decode(self, resp, fields: Optional[FieldExtractor]) -> Dict[str, Any]:
+        if fields is not None:
+            return stream_extract(fields, resp.content)
+        if self.decoder is not None:
+            return self.decoder(resp.content)
+        return resp.json()
+
+    def _report(self, path: str, status: Optional[int], seconds: float, resp, decode_seconds: float) -> None:
+        if self.hooks is None:
+            return
+        content = getattr(resp, "content", None)
+        size = len(content) if isinstance(content, (bytes, bytearray)) else 0
+        self.hooks.on_http(path, status, seconds, size, decode_seconds)
+
+    def _get_statement(self, endpoint: str, company: str, calendarYear: int | None) -> Dict[str, Any]:
+        key = (endpoint, company, calendarYear)
+        if self.cache is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
         params = {"calendarYear": calendarYear} if calendarYear is not None else None
-        return self._get(f"/server/company/balancesheet/{company}", params=params)
+        res = self._get(f"/server/company/{endpoint}/{company}", params=params, fields=self._partial_fields.get(endpoint))
+        # Never cache error dicts: a transient failure must not stick
+        if self.cache is not None and not (isinstance(res, dict) and res.get("error")):
+            self.cache.set(key, res)
+        return res
+
+    def get_balancesheet(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+        return self._get_statement("balancesheet", company, calendarYear)
 
     def get_pnl(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
-        params = {"calendarYear": calendarYear} if calendarYear is not None else None
-        return self._get(f"/server/company/pnl/{company}", params=params)
+        return self._get_statement("pnl", company, calendarYear)
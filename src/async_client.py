@@ -0,0 +1,66 @@
+import asyncio
+from typing import Any, Dict, Optional
+
+from .ac_api_client import ACAPIClient
+from .cache import ResponseCache
+from .instrumentation import Hooks
+from .ratelimit import RequestScheduler
+from .singleflight import AsyncSingleFlight
+from .transport import PooledTransport, RetryPolicy
+
+
+class AsyncACAPIClient:
+    """asyncio counterpart of `ACAPIClient` with the same `get_balancesheet`/`get_pnl` surface.
+
+    Each call runs the blocking client (cache, retries, error dicts included) on the default executor,
+    so several awaited calls are in flight at once. Pair it with a `PooledTransport` sized at least
+    as large as the expected concurrency to keep connections warm. Identical calls awaited at the same time
+    share one executor job (`flight`), on top of the sync client's own cross-thread coalescing.
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: Optional[str] = None,
+        timeout: int = 10,
+        cache: Optional[ResponseCache] = None,
+        transport: Optional[PooledTransport] = None,
+        retry: Optional[RetryPolicy] = None,
+        hooks: Optional[Hooks] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        coalesce: bool = True,
+    ):
+        self.sync = ACAPIClient(base_url, api_key=api_key, timeout=timeout, cache=cache, transport=transport, retry=retry,
+                                hooks=hooks, scheduler=scheduler, coalesce=coalesce)
+        self.flight = AsyncSingleFlight() if coalesce else None
+
+    @classmethod
+    def wrap(cls, client: ACAPIClient) -> "AsyncACAPIClient":
+        """Build an async client sharing an existing `ACAPIClient`'s configuration, cache and transport."""
+        inst = cls.__new__(cls)
+        inst.sync = client
+        inst.flight = AsyncSingleFlight() if getattr(client, "flight", None) is not None else None
+        return inst
+
+    @property
+    def base_url(self) -> str:
+        return self.sync.base_url
+
+    @property
+    def coalesced(self) -> int:
+        """Calls served by another caller's in-flight request, across both the async and sync layers."""
+        return sum(f.coalesced for f in (self.flight, getattr(self.sync, "flight", None)) if f is not None)
+
+    async def _call(self, key, fn, *args) -> Dict[str, Any]:
+        if self.flight is None:
+            return await asyncio.to_thread(fn, *args)
+        return await self.flight.do(key, lambda: asyncio.to_thread(fn, *args))
+
+    async def _get(self, path: str, params: Dict[str, Any] | None = None) -> Dict[str, Any]:
+        return await self._call(("get", path, tuple(sorted((params or {}).items()))), self.sync._get, path, params)
+
+    async def get_balancesheet(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+        return await self._call(("balancesheet", company, calendarYear), self.sync.get_balancesheet, company, calendarYear)
+
+    async def get_pnl(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+        return await self._call(("pnl", company, calendarYear), self.sync.get_pnl, company, calendarYear)
@@ -0,0 +1,68 @@
+from typing import Any, Dict, List, NamedTuple, Optional
+
+
+AUDIT_MODES = ("off", "structured", "text")
+
+# Text rendering of each operation; identical to the f-strings the compute functions used to build eagerly
+_TEMPLATES = {
+    "fetch": (
+        "Fetched balancesheet for {company} {year} and {prior_year}. "
+        "Opening inventory={opening_inventory}, Closing inventory={closing_inventory}, "
+        "CWIP opening={cwip_opening}, CWIP closing={cwip_closing}. "
+        "Fetched P&L costOfRevenue={cost_of_revenue}."
+    ),
+    "cwip_transfers": "CWIP transfers = cwip_opening ({cwip_opening}) - cwip_closing ({cwip_closing}) = {result}",
+    "implied_purchases": (
+        "Implied purchases = costOfRevenue ({cost_of_revenue}) - opening_inventory ({opening_inventory}) - "
+        "cwip_transfers ({cwip_transfers}) + closing_inventory ({closing_inventory}) = {result}"
+    ),
+    "cogs": (
+        "COGS = opening_inventory ({opening_inventory}) + purchases ({purchases}) + cwip_transfers ({cwip_transfers}) "
+        "- closing_inventory ({closing_inventory}) = {result}"
+    ),
+    "reconciliation": "Reconciliation (calculated COGS - reported costOfRevenue) = {result}",
+}
+
+
+class AuditStep(NamedTuple):
+    """One arithmetic step, kept as raw operands so text is only produced when someone reads it."""
+
+    operation: str
+    operands: Dict[str, Any]
+    result: Any = None
+
+    def render(self) -> str:
+        return _TEMPLATES[self.operation].format(result=self.result, **self.operands)
+
+    def to_record(self) -> Dict[str, Any]:
+        """JSON-ready form: numbers as strings, like the rest of the report."""
+        return {
+            "operation": self.operation,
+            "operands": {k: v if isinstance(v, (int, str)) else str(v) for k, v in self.operands.items()},
+            "result": None if self.result is None else str(self.result),
+        }
+
+
+class AuditTrail(list):
+    """List of `AuditStep`s for one calculation."""
+
+    def render(self, sep: str = " | ") -> str:
+        return sep.join(step.render() for step in self)
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        return [step.to_record() for step in self]
+
+
+def check_audit_mode(audit: str) -> str:
+    if audit not in AUDIT_MODES:
+        raise ValueError(f"audit must be one of {AUDIT_MODES}, got {audit!r}")
+    return audit
+
+
+def emit(step: AuditStep, audit: str) -> Optional[Any]:
+    """What a compute function puts in `audit_trail` for the given mode."""
+    if audit == "text":
+        return step.render()
+    if audit == "structured":
+        return step
+    return None
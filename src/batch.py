@@ -0,0 +1,306 @@
+import csv
+import math
+import threading
+import time
+from array import array
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .audit import check_audit_mode
+from .graph import State, StateGraph
+from .instrumentation import Hooks
+from .ratelimit import TokenBucket
+
+if TYPE_CHECKING:
+    from .ac_api_client import ACAPIClient
+    from .incremental import ResultTracker
+
+
+Pair = Tuple[str, int]
+
+
+def parse_years(spec: str) -> List[int]:
+    """Parse `2019-2023`, `2021,2023` or a mix of both into a sorted list of years."""
+    years = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            start, end = (int(x) for x in part.split("-", 1))
+            years.update(range(start, end + 1))
+        else:
+            years.add(int(part))
+    return sorted(years)
+
+
+def load_pairs_csv(path: str, years: Sequence[int] = ()) -> List[Pair]:
+    """Read (company, year) pairs from a CSV with a `company` (or `ticker`) column and an optional `year` column.
+
+    Rows without a year are expanded over `years`.
+    """
+    pairs: List[Pair] = []
+    with open(path, newline="", encoding="utf-8") as fh:
+        for row in csv.DictReader(fh):
+            row = {(k or "").strip().lower(): (v or "").strip() for k, v in row.items()}
+            company = row.get("company") or row.get("ticker")
+            if not company:
+                continue
+            if row.get("year"):
+                pairs.append((company, int(row["year"])))
+            else:
+                pairs.extend((company, y) for y in years)
+    return pairs
+
+
+def dedupe_pairs(pairs: Iterable[Pair]) -> List[Pair]:
+    seen = set()
+    out = []
+    for pair in pairs:
+        if pair not in seen:
+            seen.add(pair)
+            out.append(pair)
+    return out
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return 0.0
+    # nearest-rank percentile
+    idx = max(0, math.ceil(pct / 100 * len(sorted_values)) - 1)
+    return sorted_values[idx]
+
+
+@dataclass
+class BatchStats:
+    pairs: int = 0
+    failed: int = 0
+    requests: int = 0
+    reused: int = 0
+    elapsed: float = 0.0
+    # compact float64 storage so 100k-pair runs do not accumulate Python float objects
+    latencies: "array[float]" = field(default_factory=lambda: array("d"), repr=False)
+
+    @property
+    def pairs_per_sec(self) -> float:
+        return self.pairs / self.elapsed if self.elapsed else 0.0
+
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.latencies)
+        return {
+            "pairs": self.pairs,
+            "failed": self.failed,
+            "requests": self.requests,
+            "reused": self.reused,
+            "elapsed_s": round(self.elapsed, 3),
+            "pairs_per_sec": round(self.pairs_per_sec, 2),
+            "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+            "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+        }
+
+
+class _CompanyFetcher:
+    """Client stand-in for one company's years: each statement is requested at most once per batch.
+
+    Year N's balance sheet is reused as the prior year of N+1. Error payloads are not kept, so a later
+    year gets a fresh attempt.
+    """
+
+    def __init__(self, client: "ACAPIClient", limiter: Optional[TokenBucket], counter: Callable[[], None]):
+        self.client = client
+        self.limiter = limiter
+        self._count = counter
+        self._seen: Dict[Tuple[str, int], Dict] = {}
+
+    def _fetch(self, endpoint: str, company: str, year: int, get: Callable[[str, int], Dict]) -> Dict:
+        key = (endpoint, year)
+        if key in self._seen:
+            return self._seen[key]
+        if self.limiter is not None:
+            self.limiter.acquire()
+        self._count()
+        res = get(company, year)
+        if not (isinstance(res, dict) and res.get("error")):
+            self._seen[key] = res
+        return res
+
+    def get_balancesheet(self, company: str, calendarYear: int) -> Dict:
+        return self._fetch("balancesheet", company, calendarYear, self.client.get_balancesheet)
+
+    def get_pnl(self, company: str, calendarYear: int) -> Dict:
+        return self._fetch("pnl", company, calendarYear, self.client.get_pnl)
+
+    def inputs(self, company: str, year: int, raw: bool = False) -> Tuple:
+        """(current balance sheet, prior balance sheet, P&L) for one pair. With `raw`, as response bytes where
+        the client offers `get_raw`; otherwise as decoded payloads."""
+        get_raw = getattr(self.client, "get_raw", None) if raw else None
+        if get_raw is None:
+            return self.get_balancesheet(company, year), self.get_balancesheet(company, year - 1), self.get_pnl(company, year)
+        return (
+            self._fetch("balancesheet", company, year, lambda c, y: get_raw("balancesheet", c, y)),
+            self._fetch("balancesheet", company, year - 1, lambda c, y: get_raw("balancesheet", c, y)),
+            self._fetch("pnl", company, year, lambda c, y: get_raw("pnl", c, y)),
+        )
+
+
+def _has_fetch_error(state: State) -> bool:
+    return any(
+        isinstance(state.get(k), dict) and state[k].get("error")
+        for k in ("raw_balancesheet_current", "raw_balancesheet_prior", "raw_pnl")
+    )
+
+
+def _failed_state(company: str, year: int, audit: str, exc: Exception) -> State:
+    """Stand-in result for a pair whose run raised: an empty report with the exception in its logs."""
+    logs = [f"error: {type(exc).__name__}: {exc}"]
+    final = {"company": company, "year": year, "report": {}, "logs": logs}
+    return {"company": company, "year": year, "logs": logs, "report": {}, "final_report": final,
+            "audit_mode": audit, "halted": logs[0], "error": str(exc)}
+
+
+def run_batch(
+    client: "ACAPIClient",
+    pairs: Iterable[Pair],
+    workers: int = 8,
+    rate_limit: Optional[float] = None,
+    on_result: Optional[Callable[[State], None]] = None,
+    sink: Optional[Callable[[Dict], None]] = None,
+    audit: str = "text",
+    hooks: Optional[Hooks] = None,
+    processes: int = 0,
+    tracker: Optional["ResultTracker"] = None,
+) -> BatchStats:
+    """Compute COGS for many (company, year) pairs.
+
+    Pairs are grouped per company and each group runs on one of `workers` threads in year order, so shared
+    prior-year balance sheets are fetched once. `rate_limit` caps requests per second to the client's host.
+    `on_result` is called with each finished state as soon as it completes (from a single thread at a time).
+    `sink` is handed to every `StateGraph` and receives each final report straight from `audit_node`; it must
+    be thread-safe (e.g. `src.output.JsonlWriter`). States are not retained, so memory stays flat.
+    `audit` is passed to `StateGraph.run`; "off" skips audit-text formatting when only `report` is kept. An
+    unknown mode raises `ValueError` before any work starts.
+    `hooks` (src.instrumentation) is shared by every graph and must be thread-safe, e.g. a `Profiler`.
+
+    With `processes` > 0 the run is hybrid: the `workers` threads only fetch (raw bytes via `get_raw` when the
+    client has it), and decoding, extraction and compute run on that many worker processes (`src.hybrid`).
+    `sink` and `on_result` are then called in the parent with the state the worker returns, which has no raw
+    payloads except error dicts; `hooks` sees the HTTP calls only, as graph nodes run in the workers.
+
+    With a `tracker` (`src.incremental.ResultTracker`), every pair is still fetched, but a pair whose three
+    payloads hash the same as when its stored result was computed is not recomputed: the stored report goes to
+    `sink`, and `on_result` gets a state with `reused=True`. Recomputed results are recorded for the next run.
+
+    A pair whose run raises (e.g. a value that fails validation) does not stop the batch: `sink` and
+    `on_result` get a report with an empty `report` and the exception in `logs` (`state["error"]`), it is
+    counted in `failed`, and the company's remaining years still run.
+    """
+    check_audit_mode(audit)
+    groups: Dict[str, List[int]] = {}
+    for company, year in dedupe_pairs(pairs):
+        groups.setdefault(company, []).append(year)
+
+    if tracker is not None:
+        from .hybrid import Prefetched
+        from .incremental import input_hashes
+
+    stats = BatchStats()
+    limiter = TokenBucket(rate_limit) if rate_limit else None
+    lock = threading.Lock()
+
+    def count_request():
+        with lock:
+            stats.requests += 1
+
+    def record(state: State, latency: float) -> None:
+        with lock:
+            stats.pairs += 1
+            stats.reused += bool(state.get("reused"))
+            stats.failed += _has_fetch_error(state) or "error" in state
+            stats.latencies.append(latency)
+            if on_result is not None:
+                on_result(state)
+
+    def reuse(company: str, year: int, payloads: Tuple) -> Tuple[Optional[State], Optional[Tuple]]:
+        hashes = input_hashes(payloads)
+        state = tracker.lookup(company, year, hashes, audit)
+        if state is not None and sink is not None:
+            sink(state["final_report"])
+        return state, hashes
+
+    def fail(company: str, year: int, exc: Exception) -> State:
+        state = _failed_state(company, year, audit, exc)
+        if sink is not None:
+            sink(state["final_report"])
+        return state
+
+    def run_pair(fetcher: _CompanyFetcher, graph: StateGraph, company: str, year: int) -> State:
+        if tracker is None:
+            return graph.run(company, year, audit=audit)
+        payloads = fetcher.inputs(company, year)
+        state, hashes = reuse(company, year, payloads)
+        if state is None:
+            state = StateGraph(Prefetched(year, *payloads), sink=sink, hooks=hooks).run(company, year, audit=audit)
+            tracker.record(state, hashes)
+        return state
+
+    def run_company(company: str, years: List[int]) -> None:
+        fetcher = _CompanyFetcher(client, limiter, count_request)
+        graph = StateGraph(fetcher, sink=sink, hooks=hooks)
+        for year in sorted(years):
+            start = time.perf_counter()
+            try:
+                state = run_pair(fetcher, graph, company, year)
+            except Exception as exc:
+                state = fail(company, year, exc)
+            record(state, time.perf_counter() - start)
+
+    def fetch_company(company: str, years: List[int]) -> None:
+        fetcher = _CompanyFetcher(client, limiter, count_request)
+        submitted = []
+        for year in sorted(years):
+            start = time.perf_counter()
+            try:
+                payloads = fetcher.inputs(company, year, raw=True)
+                hashes = None
+                if tracker is not None:
+                    state, hashes = reuse(company, year, payloads)
+                    if state is not None:
+                        record(state, time.perf_counter() - start)
+                        continue
+                fut = procs.submit(compute_pair, company, year, payloads, audit)
+            except Exception as exc:
+                record(fail(company, year, exc), time.perf_counter() - start)
+                continue
+            # completion is stamped as soon as the worker answers, not when this thread gets round to it
+            fut.add_done_callback(lambda f: setattr(f, "finished_at", time.perf_counter()))
+            submitted.append((fut, company, year, start, hashes))
+        for fut, company, year, started, hashes in submitted:
+            try:
+                state = fut.result()
+            except Exception as exc:
+                record(fail(company, year, exc), time.perf_counter() - started)
+                continue
+            if tracker is not None:
+                tracker.record(state, hashes)
+            if sink is not None:
+                sink(state["final_report"])
+            record(state, (getattr(fut, "finished_at", None) or time.perf_counter()) - started)
+
+    procs = None
+    if processes > 0:
+        from .hybrid import compute_pair, process_pool
+
+        procs = process_pool(processes)
+    start = time.perf_counter()
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            task = fetch_company if procs is not None else run_company
+            futures = [pool.submit(task, company, years) for company, years in groups.items()]
+            for fut in as_completed(futures):
+                fut.result()
+    finally:
+        if procs is not None:
+            procs.shutdown(wait=True, cancel_futures=True)
+    stats.elapsed = time.perf_counter() - start
+    return stats
@@ -0,0 +1,124 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+CacheKey = Tuple[str, str, Optional[int]]
+
+
+class ResponseCache:
+    """Base class for `ACAPIClient` response caches.
+
+    Keys are `(endpoint, company, calendarYear)` tuples and values are decoded JSON payloads.
+    Subclasses implement `_load`/`_store`; hit/miss counting lives here.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._counter_lock = threading.Lock()
+
+    def get(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        value = self._load(key)
+        with self._counter_lock:
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return value
+
+    def set(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        self._store(key, value)
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses}
+
+    def _load(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def _store(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        raise NotImplementedError
+
+
+class MemoryCache(ResponseCache):
+    """Thread-safe in-memory LRU cache with an optional per-entry TTL (seconds).
+
+    When `backend` is given (e.g. a `DiskCache`), misses fall through to it and stores are written through.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: Optional[float] = None, backend: Optional[ResponseCache] = None,
+                 clock: Callable[[], float] = time.monotonic):
+        super().__init__()
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.backend = backend
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _load(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                stored_at, value = entry
+                if self.ttl is None or self._clock() - stored_at < self.ttl:
+                    self._entries.move_to_end(key)
+                    return value
+                del self._entries[key]
+        if self.backend is None:
+            return None
+        value = self.backend.get(key)
+        if value is not None:
+            self._remember(key, value)
+        return value
+
+    def _store(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        self._remember(key, value)
+        if self.backend is not None:
+            self.backend.set(key, value)
+
+    def _remember(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = (self._clock(), value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+
+class DiskCache(ResponseCache):
+    """JSON-file cache under `directory`, one file per key; entries older than `ttl` seconds are ignored."""
+
+    def __init__(self, directory: str, ttl: Optional[float] = None):
+        super().__init__()
+        self.directory = directory
+        self.ttl = ttl
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: CacheKey) -> str:
+        digest = hashlib.sha256(json.dumps(list(key)).encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def _load(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        path = self._path(key)
+        try:
+            if self.ttl is not None and time.time() - os.path.getmtime(path) >= self.ttl:
+                return None
+            with open(path, "r", encoding="utf-8") as fh:
+                return json.load(fh)
+        except (OSError, ValueError):
+            return None
+
+    def _store(self, key: CacheKey, value: Dict[str, Any]) -> None:
+        path = self._path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(value, fh)
+        # atomic so concurrent readers never see a half-written file
+        os.replace(tmp, path)
@@ -1,42 +1,18 @@
 from decimal import Decimal, getcontext, ROUND_HALF_UP
-from typing import Tuple
+from time import perf_counter
+from typing import TYPE_CHECKING, Optional, Tuple
 
-from .models import FinancialState
-from .ac_api_client import ACAPIClient
+from .models import AnyFinancialState, CompactFinancialState, _model
+from .audit import AuditStep, AuditTrail, check_audit_mode, emit
+from .extract import STATEMENT_FIELDS, FieldExtractor, candidate_norms, _extract_numeric, _normalize_name
+from .instrumentation import Hooks
+from .schema import DEFAULT_REGISTRY
 
+if TYPE_CHECKING:
+    from .ac_api_client import ACAPIClient
 
-getcontext().prec = 28
-
-
-import re
-
-
-def _normalize_name(s: str) -> str:
-    return re.sub(r"[^a-z0-9]", "", s.lower())
 
-
-def _extract_numeric(val):
-    """Try to clean common number formats and return either Decimal-friendly string or numeric types unchanged."""
-    if val is None:
-        return None
-    # If it's already numeric, return as-is
-    if isinstance(val, (int, float)):
-        return val
-    if isinstance(val, str):
-        v = val.strip()
-        # handle parentheses as negative numbers: (1,234.56)
-        negative = False
-        if v.startswith("(") and v.endswith(")"):
-            negative = True
-            v = v[1:-1].strip()
-        # remove commas and other non-numeric chars except dot and minus
-        v = re.sub(r"[^0-9.\-]", "", v)
-        if v == "":
-            return None
-        if negative:
-            v = f"-{v}"
-        return v
-    return val
+getcontext().prec = 28
 
 
 def _find_value(obj, key: str):
@@ -52,27 +28,18 @@ def _find_value(obj, key: str):
     if obj is None:
         return None
 
-    target = _normalize_name(key)
-    # possible synonym candidates
-    synonyms = {
-        "inventory": ["inventory", "inventories", "inventorytotal", "totalinventory"],
-        "capitalworkinprogress": ["capitalworkinprogress", "cwip", "workinprogress"],
-        "costofrevenue": ["costofrevenue", "costofsales", "cogs", "costofgoodsold"],
-    }
-
-    candidate_names = synonyms.get(target, [key])
-    candidate_norms = set(_normalize_name(x) for x in candidate_names)
+    candidates = candidate_norms(key)
 
     # dict handling
     if isinstance(obj, dict):
         for k, v in obj.items():
-            if _normalize_name(k) in candidate_norms:
+            if _normalize_name(k) in candidates:
                 return _extract_numeric(v)
             # check labeled entry patterns
             if isinstance(v, dict):
                 name = v.get("name") or v.get("label")
                 value = v.get("value") or v.get("amount") or v.get("quantity")
-                if name and _normalize_name(str(name)) in candidate_norms:
+                if name and _normalize_name(str(name)) in candidates:
                     return _extract_numeric(value)
                 # recurse
                 res = _find_value(v, key)
@@ -90,7 +57,7 @@ def _find_value(obj, key: str):
             if isinstance(item, dict):
                 name = item.get("name") or item.get("label")
                 value = item.get("value") or item.get("amount") or item.get("quantity")
-                if name and _normalize_name(str(name)) in candidate_norms:
+                if name and _normalize_name(str(name)) in candidates:
                     return _extract_numeric(value)
             res = _find_value(item, key)
             if res is not None:
@@ -100,25 +67,49 @@ def _find_value(obj, key: str):
     return None
 
 
-def build_financial_state(client: ACAPIClient, company: str, calendarYear: int, bs_current=None, bs_prev=None, pnl_current=None) -> dict:
-    """Fetch balancesheets for year and year-1 and pnl for year and return FinancialState.
+_BALANCESHEET_FIELDS = FieldExtractor(STATEMENT_FIELDS["balancesheet"], registry=DEFAULT_REGISTRY)
+_PNL_FIELDS = FieldExtractor(STATEMENT_FIELDS["pnl"], registry=DEFAULT_REGISTRY)
 
+
+def _extract(extractor: FieldExtractor, payload, hooks: Optional[Hooks]) -> dict:
+    if hooks is None:
+        return extractor.extract(payload)
+    start = perf_counter()
+    fields, path = extractor.extract_traced(payload)
+    if path is not None:
+        hooks.on_extract(path, perf_counter() - start)
+    return fields
+
+
+def build_financial_state(client: "ACAPIClient", company: str, calendarYear: int, bs_current=None, bs_prev=None, pnl_current=None, audit: str = "text",
+                          hooks: Optional[Hooks] = None, compact: bool = False) -> dict:
+    """Fetch balancesheets for year and year-1 and pnl for year.
+
+    Returns `{"data": FinancialState, "audit_trail": ...}`; with `compact=True`, `data` is a
+    `CompactFinancialState` instead, validated the same way without importing pydantic (the graph and
+    `calculate_cogs_for_company` use this, as they only read the five fields).
     If bs_current, bs_prev, or pnl_current are provided, they will be used instead of calling the client again.
+    `audit` selects what goes in `audit_trail`: rendered "text" (default), a "structured" `AuditStep`, or None ("off").
+    `hooks` (src.instrumentation) is told how long each payload traversal took.
     """
     bs_current = bs_current if bs_current is not None else client.get_balancesheet(company, calendarYear)
     bs_prev = bs_prev if bs_prev is not None else client.get_balancesheet(company, calendarYear - 1)
     pnl_current = pnl_current if pnl_current is not None else client.get_pnl(company, calendarYear)
 
-    closing_inventory_raw = _find_value(bs_current, "inventory")
-    opening_inventory_raw = _find_value(bs_prev, "inventory")
+    # One traversal per payload instead of one per field
+    bs_current_fields = _extract(_BALANCESHEET_FIELDS, bs_current, hooks)
+    bs_prev_fields = _extract(_BALANCESHEET_FIELDS, bs_prev, hooks)
+    pnl_fields = _extract(_PNL_FIELDS, pnl_current, hooks)
+
+    closing_inventory_raw = bs_current_fields["inventory"]
+    opening_inventory_raw = bs_prev_fields["inventory"]
 
-    cwip_closing_raw = _find_value(bs_current, "capitalWorkInProgress")
-    cwip_opening_raw = _find_value(bs_prev, "capitalWorkInProgress")
+    cwip_closing_raw = bs_current_fields["capitalWorkInProgress"]
+    cwip_opening_raw = bs_prev_fields["capitalWorkInProgress"]
 
-    cost_of_revenue_raw = _find_value(pnl_current, "costOfRevenue")
+    cost_of_revenue_raw = pnl_fields["costOfRevenue"]
 
-    # Coerce to Decimal via FinancialState validator
-    fs = FinancialState(
+    fs = (CompactFinancialState if compact else _model())(
         opening_inventory=opening_inventory_raw or 0,
         closing_inventory=closing_inventory_raw or 0,
         cwip_opening=cwip_opening_raw or 0,
@@ -126,69 +117,76 @@ def build_financial_state(client: ACAPIClient, company: str, calendarYear: int,
         cost_of_revenue=cost_of_revenue_raw or 0,
     )
 
-    audit = (
-        f"Fetched balancesheet for {company} {calendarYear} and {calendarYear -1}. "
-        f"Opening inventory={fs.opening_inventory}, Closing inventory={fs.closing_inventory}, "
-        f"CWIP opening={fs.cwip_opening}, CWIP closing={fs.cwip_closing}. "
-        f"Fetched P&L costOfRevenue={fs.cost_of_revenue}."
-    )
+    step = AuditStep("fetch", {
+        "company": company,
+        "year": calendarYear,
+        "prior_year": calendarYear - 1,
+        "opening_inventory": fs.opening_inventory,
+        "closing_inventory": fs.closing_inventory,
+        "cwip_opening": fs.cwip_opening,
+        "cwip_closing": fs.cwip_closing,
+        "cost_of_revenue": fs.cost_of_revenue,
+    })
 
-    return {"data": fs, "audit_trail": audit}
+    return {"data": fs, "audit_trail": emit(step, audit)}
 
 
-def compute_cwip_transfers(fin: FinancialState) -> dict:
+def compute_cwip_transfers(fin: AnyFinancialState, audit: str = "text") -> dict:
     """CWIP Transfers are treated as opening CWIP minus closing CWIP (positive means transferred into inventory)."""
     transfers = fin.cwip_opening - fin.cwip_closing
-    audit = (
-        f"CWIP transfers = cwip_opening ({fin.cwip_opening}) - cwip_closing ({fin.cwip_closing}) = {transfers}"
-    )
-    return {"data": transfers, "audit_trail": audit}
+    step = AuditStep("cwip_transfers", {"cwip_opening": fin.cwip_opening, "cwip_closing": fin.cwip_closing}, transfers)
+    return {"data": transfers, "audit_trail": emit(step, audit)}
 
 
-def compute_implied_purchases(fin: FinancialState) -> dict:
+def compute_implied_purchases(fin: AnyFinancialState, audit: str = "text") -> dict:
     """Imply purchases using the provided costOfRevenue (COGS) and inventory/CWIP changes:
     purchases = costOfRevenue - opening_inventory - cwip_transfers + closing_inventory
     This solves for purchases when only costOfRevenue is provided.
     """
     cwip_transfers = fin.cwip_opening - fin.cwip_closing
     purchases = fin.cost_of_revenue - fin.opening_inventory - cwip_transfers + fin.closing_inventory
-    audit = (
-        f"Implied purchases = costOfRevenue ({fin.cost_of_revenue}) - opening_inventory ({fin.opening_inventory}) - "
-        f"cwip_transfers ({cwip_transfers}) + closing_inventory ({fin.closing_inventory}) = {purchases}"
-    )
-    return {"data": purchases, "audit_trail": audit}
+    step = AuditStep("implied_purchases", {
+        "cost_of_revenue": fin.cost_of_revenue,
+        "opening_inventory": fin.opening_inventory,
+        "cwip_transfers": cwip_transfers,
+        "closing_inventory": fin.closing_inventory,
+    }, purchases)
+    return {"data": purchases, "audit_trail": emit(step, audit)}
 
 
-def compute_cogs_from_formula(opening: Decimal, purchases: Decimal, cwip_transfers: Decimal, closing: Decimal) -> dict:
+def compute_cogs_from_formula(opening: Decimal, purchases: Decimal, cwip_transfers: Decimal, closing: Decimal, audit: str = "text") -> dict:
     cogs = opening + purchases + cwip_transfers - closing
-    audit = (
-        f"COGS = opening_inventory ({opening}) + purchases ({purchases}) + cwip_transfers ({cwip_transfers}) - closing_inventory ({closing}) = {cogs}"
-    )
-    return {"data": cogs, "audit_trail": audit}
-
-
-def calculate_cogs_for_company(client: ACAPIClient, company: str, calendarYear: int) -> dict:
-    """Aggregate API calls and return final structured result. Returns JSON-ready dict."""
-    fin_res = build_financial_state(client, company, calendarYear)
-    fin: FinancialState = fin_res["data"]
+    step = AuditStep("cogs", {
+        "opening_inventory": opening,
+        "purchases": purchases,
+        "cwip_transfers": cwip_transfers,
+        "closing_inventory": closing,
+    }, cogs)
+    return {"data": cogs, "audit_trail": emit(step, audit)}
+
+
+def calculate_cogs_for_company(client: "ACAPIClient", company: str, calendarYear: int, audit: str = "text",
+                               bs_current=None, bs_prev=None, pnl_current=None) -> dict:
+    """Aggregate API calls and return final structured result. Returns JSON-ready dict.
+
+    `audit` controls the `audit_trail`: "text" (default) is the joined human-readable string, "structured"
+    an `AuditTrail` of steps that renders the same text on demand, and "off" skips it (None).
+    Already-fetched payloads may be passed in as for `build_financial_state`.
+    """
+    check_audit_mode(audit)
+    fin_res = build_financial_state(client, company, calendarYear, bs_current=bs_current, bs_prev=bs_prev,
+                                    pnl_current=pnl_current, audit=audit, compact=True)
+    fin: AnyFinancialState = fin_res["data"]
 
-    cwip_res = compute_cwip_transfers(fin)
-    purchases_res = compute_implied_purchases(fin)
+    cwip_res = compute_cwip_transfers(fin, audit=audit)
+    purchases_res = compute_implied_purchases(fin, audit=audit)
     cogs_res = compute_cogs_from_formula(
-        fin.opening_inventory, purchases_res["data"], cwip_res["data"], fin.closing_inventory
+        fin.opening_inventory, purchases_res["data"], cwip_res["data"], fin.closing_inventory, audit=audit
     )
 
     # reconcile cogs with reported costOfRevenue
     reconciliation = cogs_res["data"] - fin.cost_of_revenue
 
-    audit_lines = [
-        fin_res["audit_trail"],
-        cwip_res["audit_trail"],
-        purchases_res["audit_trail"],
-        cogs_res["audit_trail"],
-        f"Reconciliation (calculated COGS - reported costOfRevenue) = {reconciliation}",
-    ]
-
     # Return decimal values as strings to be JSON-ready
     def _format_currency(value: Decimal) -> str:
         # Ensure value is Decimal
@@ -204,4 +202,40 @@ def calculate_cogs_for_company(client: ACAPIClient, company: str, calendarYear:
         "reconciliation": _format_currency(reconciliation),
     }
 
+    if audit == "off":
+        return {"data": final, "audit_trail": None}
+
+    audit_lines = [
+        fin_res["audit_trail"],
+        cwip_res["audit_trail"],
+        purchases_res["audit_trail"],
+        cogs_res["audit_trail"],
+        emit(AuditStep("reconciliation", {}, reconciliation), audit),
+    ]
+    if audit == "structured":
+        return {"data": final, "audit_trail": AuditTrail(audit_lines)}
     return {"data": final, "audit_trail": " | ".join(audit_lines)}
+
+
+def calculate_cogs_series(client: "ACAPIClient", company: str, start_year: int, end_year: int, audit: str = "text") -> dict:
+    """COGS for every year in [start_year, end_year], fetching each statement exactly once.
+
+    Balance sheets for start_year-1..end_year and P&Ls for start_year..end_year are fetched once; each year is
+    then computed from its adjacent pair of balance sheets. Returns `{"data": [...], "audit_trail": [...]}`
+    with one entry per year in order; each `data` entry is the `calculate_cogs_for_company` data plus `year`.
+    """
+    if start_year > end_year:
+        raise ValueError("start_year must not be after end_year")
+    check_audit_mode(audit)
+    balancesheets = {y: client.get_balancesheet(company, y) for y in range(start_year - 1, end_year + 1)}
+    pnls = {y: client.get_pnl(company, y) for y in range(start_year, end_year + 1)}
+
+    data, trails = [], []
+    for year in range(start_year, end_year + 1):
+        res = calculate_cogs_for_company(
+            client, company, year, audit=audit,
+            bs_current=balancesheets[year], bs_prev=balancesheets[year - 1], pnl_current=pnls[year],
+        )
+        data.append({"year": year, **res["data"]})
+        trails.append(res["audit_trail"])
+    return {"data": data, "audit_trail": trails}
@@ -0,0 +1,160 @@
+"""Columnar export of batch results as Parquet or Arrow IPC (requires pyarrow).
+
+One row per (company, year): the five extracted `FinancialState` inputs and the four computed outputs as
+decimal128 columns, so warehouses load typed numbers instead of parsing formatted strings. Rows are buffered
+and written one row group (Parquet) or record batch (Arrow) at a time as results stream in.
+"""
+import threading
+from decimal import Decimal, ROUND_HALF_UP
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+import pyarrow as pa
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+
+from .batch import _has_fetch_error
+from .graph import State
+from .models import FIELDS, OUTPUTS, CompactFinancialState
+
+
+FORMATS = ("parquet", "arrow")
+
+_CENTS = Decimal("0.01")
+
+
+def schema(input_scale: int = 6) -> pa.Schema:
+    """Inputs keep `input_scale` decimal places; outputs are cents, as in the reports."""
+    return pa.schema(
+        [pa.field("company", pa.string(), nullable=False), pa.field("year", pa.int32(), nullable=False)]
+        + [pa.field(f, pa.decimal128(38, input_scale)) for f in FIELDS]
+        + [pa.field(f, pa.decimal128(38, 2)) for f in OUTPUTS]
+        + [pa.field("fetch_error", pa.bool_(), nullable=False)]
+    )
+
+
+def format_for(path: str) -> str:
+    """Format name from the extension: `.parquet`/`.pq` is "parquet", `.arrow`/`.feather`/`.ipc` is "arrow"."""
+    lowered = path.lower()
+    if lowered.endswith((".parquet", ".pq")):
+        return "parquet"
+    if lowered.endswith((".arrow", ".feather", ".ipc")):
+        return "arrow"
+    raise ValueError(f"cannot tell the columnar format of {path!r}; use a .parquet or .arrow extension")
+
+
+class ColumnarWriter:
+    """Thread-safe columnar sink for finished graph states; pass it as `run_batch(on_result=...)`.
+
+    States need `financial_data` and `report` (set by `StateGraph.calculate_node`); states without them, e.g.
+    halted runs, get null inputs and outputs. Inputs with more than `input_scale` decimal places are rounded
+    half-up. Every `row_group_size` rows are written out as one row group, so memory stays bounded.
+    """
+
+    def __init__(self, path: str, fmt: Optional[str] = None, row_group_size: int = 65536, input_scale: int = 6,
+                 compression: Optional[str] = "zstd"):
+        if fmt is not None and fmt not in FORMATS:
+            raise ValueError(f"fmt must be one of {FORMATS}, got {fmt!r}")
+        self.path = path
+        self.fmt = fmt or format_for(path)
+        self.row_group_size = row_group_size
+        self.schema = schema(input_scale)
+        self.written = 0
+        self._quantum = Decimal(1).scaleb(-input_scale)
+        self._columns: Dict[str, List[Any]] = {name: [] for name in self.schema.names}
+        self._lock = threading.Lock()
+        if self.fmt == "parquet":
+            self._writer = pq.ParquetWriter(path, self.schema, compression=compression)
+        else:
+            options = ipc.IpcWriteOptions(compression=compression) if compression else None
+            self._writer = ipc.new_file(path, self.schema, options=options)
+
+    def write(self, state: State) -> None:
+        fin = state.get("financial_data")
+        report = state.get("report") or {}
+        row = {
+            "company": state["company"],
+            "year": state["year"],
+            "fetch_error": _has_fetch_error(state),
+        }
+        for f in FIELDS:
+            row[f] = getattr(fin, f).quantize(self._quantum, rounding=ROUND_HALF_UP) if fin is not None else None
+        for f in OUTPUTS:
+            row[f] = Decimal(report[f]).quantize(_CENTS) if f in report else None
+        with self._lock:
+            for name, value in row.items():
+                self._columns[name].append(value)
+            if len(self._columns["company"]) >= self.row_group_size:
+                self._flush()
+
+    __call__ = write
+
+    def _flush(self) -> None:
+        # caller holds self._lock
+        count = len(self._columns["company"])
+        if not count:
+            return
+        batch = pa.record_batch([pa.array(self._columns[f.name], type=f.type) for f in self.schema], schema=self.schema)
+        if self.fmt == "parquet":
+            self._writer.write_batch(batch, row_group_size=count)
+        else:
+            self._writer.write_batch(batch)
+        self.written += count
+        for values in self._columns.values():
+            values.clear()
+
+    def close(self) -> None:
+        with self._lock:
+            self._flush()
+            self._writer.close()
+
+    def __enter__(self) -> "ColumnarWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def iter_batches(path: str, columns: Optional[Sequence[str]] = None) -> Iterator[pa.RecordBatch]:
+    """Record batches of a file written by `ColumnarWriter`, one row group at a time."""
+    if format_for(path) == "parquet":
+        pf = pq.ParquetFile(path)
+        for i in range(pf.num_row_groups):
+            yield from pf.read_row_group(i, columns=columns).to_batches()
+        return
+    with pa.memory_map(path) as source:
+        reader = ipc.open_file(source)
+        for i in range(reader.num_record_batches):
+            batch = reader.get_batch(i)
+            yield batch.select(list(columns)) if columns is not None else batch
+
+
+def read_table(path: str, columns: Optional[Sequence[str]] = None) -> pa.Table:
+    """The whole file as an Arrow table (e.g. for `.to_pandas()` or a warehouse loader)."""
+    batches = list(iter_batches(path, columns))
+    if batches:
+        return pa.Table.from_batches(batches)
+    empty = schema_of(path).empty_table()
+    return empty.select(list(columns)) if columns is not None else empty
+
+
+def schema_of(path: str) -> pa.Schema:
+    if format_for(path) == "parquet":
+        return pq.read_schema(path)
+    with pa.memory_map(path) as source:
+        return ipc.open_file(source).schema
+
+
+def read_states(path: str, skip_errors: bool = True) -> Iterator[Tuple[str, int, CompactFinancialState]]:
+    """Yield `(company, year, CompactFinancialState)` with the exact stored Decimal inputs, ready for the
+    `src.cogs` compute functions, `src.scenario` or (via `src.kernel.to_scaled`) the numpy kernels, without
+    refetching. Rows whose fetch failed are skipped unless `skip_errors` is False; rows without inputs always are.
+    """
+    for batch in iter_batches(path, ["company", "year", *FIELDS, "fetch_error"]):
+        cols = batch.to_pydict()
+        for i, (company, year) in enumerate(zip(cols["company"], cols["year"])):
+            if skip_errors and cols["fetch_error"][i]:
+                continue
+            values = [cols[f][i] for f in FIELDS]
+            if any(v is None for v in values):
+                continue
+            yield company, year, CompactFinancialState.from_decimals(*values)
@@ -0,0 +1,149 @@
+import json
+import re
+from json.decoder import scanstring
+from typing import Any, Callable, Dict, Union
+
+from .extract import FieldExtractor, _extract_numeric, _normalize_name, synonyms_version
+
+
+DECODERS = ("auto", "orjson", "msgspec", "json")
+
+_WS = re.compile(r"[ \t\n\r]*")
+_JSON = json.JSONDecoder()
+
+
+def _with_fallback(fast: Callable[[bytes], Any], errors) -> Callable[[bytes], Any]:
+    # Anything the fast decoder rejects (NaN, ints beyond 64 bits, ...) is retried with the stdlib
+    def decode(body: bytes) -> Any:
+        try:
+            return fast(body)
+        except errors:
+            return json.loads(body)
+
+    return decode
+
+
+def get_decoder(name: Union[str, Callable[[bytes], Any]] = "auto") -> Callable[[bytes], Any]:
+    """`bytes -> object` JSON decoder by name: "orjson", "msgspec", "json" (stdlib), or "auto" (fastest installed).
+
+    Optional decoders fall back to the stdlib for input they reject, so results always match `json.loads`.
+    A callable is returned unchanged.
+    """
+    if callable(name):
+        return name
+    if name == "auto":
+        for candidate in ("orjson", "msgspec"):
+            try:
+                return get_decoder(candidate)
+            except ImportError:
+                pass
+        return json.loads
+    if name == "orjson":
+        import orjson
+        return _with_fallback(orjson.loads, orjson.JSONDecodeError)
+    if name == "msgspec":
+        import msgspec
+        return _with_fallback(msgspec.json.decode, msgspec.DecodeError)
+    if name == "json":
+        return json.loads
+    raise ValueError(f"decoder must be one of {DECODERS} or a callable, got {name!r}")
+
+
+def stream_extract(ex: FieldExtractor, body: Union[bytes, str]) -> Dict[str, Any]:
+    """`ex.extract(json.loads(body))` without materializing the whole document.
+
+    The top-level object and every list are read one element at a time, so only one list element (e.g. one
+    `sections[]` entry) is decoded at once; dicts below the top level are decoded whole, as their labels must be
+    checked before their contents. Reading stops once every key is settled, so the unread tail of the
+    document is not validated. Results are identical to the full decode for well-formed input; a body that
+    is not JSON (empty, HTML, truncated) raises `json.JSONDecodeError` like `json.loads` would.
+    """
+    if ex._version != synonyms_version():
+        ex._build_index()
+    text = body.decode("utf-8") if isinstance(body, (bytes, bytearray)) else body
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    pos = _WS.match(text, 0).end()
+    if pos >= len(text) or text[pos] not in "{[":
+        # a scalar document has nothing to stream; decoding it also rejects non-JSON bodies
+        return ex.extract(json.loads(text))
+    found: Dict[str, Any] = _stream(ex, text, pos, set(ex.keys))[0] if ex.keys else {}
+    return {key: found.get(key) for key in ex.keys}
+
+
+def _merge(sub: Dict[str, Any], active: set, found: Dict[str, Any]) -> None:
+    if sub:
+        found.update(sub)
+        active.difference_update(sub)
+
+
+def _stream_child(ex: FieldExtractor, text: str, pos: int, active: set, found: Dict[str, Any]) -> int:
+    sub, end = _stream(ex, text, pos, active)
+    _merge(sub, active, found)
+    if end < 0 and active:
+        # the child stopped early but this level keeps searching: find where it ends after all
+        _, end = _JSON.raw_decode(text, pos)
+    return end
+
+
+def _stream(ex: FieldExtractor, text: str, pos: int, pending: set):
+    """Streaming twin of `FieldExtractor._walk` for the container starting at `text[pos]`.
+
+    Returns `(found, end)`; `end` is -1 when every key settled before the container's end, which is then
+    left unread (and only located if an enclosing level still needs to continue).
+    """
+    active = set(pending)
+    found: Dict[str, Any] = {}
+    is_dict = text[pos] == "{"
+    close = "}" if is_dict else "]"
+    pos = _WS.match(text, pos + 1).end()
+    if text[pos : pos + 1] == close:
+        return found, pos + 1
+
+    while True:
+        if is_dict:
+            if text[pos : pos + 1] != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", text, pos)
+            k, pos = scanstring(text, pos + 1)
+            pos = _WS.match(text, pos).end()
+            if text[pos : pos + 1] != ":":
+                raise json.JSONDecodeError("Expecting ':' delimiter", text, pos)
+            pos = _WS.match(text, pos + 1).end()
+            keys = ex._index.get(_normalize_name(k))
+            key_hit = keys and not active.isdisjoint(keys)
+            if text[pos : pos + 1] == "[" and not key_hit:
+                pos = _stream_child(ex, text, pos, active, found)
+            else:
+                v, pos = _JSON.raw_decode(text, pos)
+                if key_hit:
+                    ex._settle(keys, _extract_numeric(v), active, found)
+                if active:
+                    if isinstance(v, dict):
+                        hit = ex._labelled(v, active)
+                        if hit:
+                            ex._settle(*hit, active, found)
+                        if active:
+                            _merge(ex._walk(v, active), active, found)
+                    elif isinstance(v, list):
+                        _merge(ex._walk(v, active), active, found)
+        elif text[pos : pos + 1] == "[":
+            pos = _stream_child(ex, text, pos, active, found)
+        else:
+            item, pos = _JSON.raw_decode(text, pos)
+            if isinstance(item, dict):
+                hit = ex._labelled(item, active)
+                if hit:
+                    ex._settle(*hit, active, found)
+                if active:
+                    _merge(ex._walk(item, active), active, found)
+
+        if not active:
+            return found, -1
+        pos = _WS.match(text, pos).end()
+        sep = text[pos : pos + 1]
+        if sep == ",":
+            pos = _WS.match(text, pos + 1).end()
+        elif sep == close:
+            return found, pos + 1
+        else:
+            raise json.JSONDecodeError(f"Expecting ',' or '{close}'", text, pos)
@@ -0,0 +1,22 @@
+import threading
+
+
+_loaded = False
+_lock = threading.Lock()
+
+
+def load_env() -> None:
+    """Load a `.env` file (if present) into `os.environ` once per process; variables already set win.
+
+    Called by `ACAPIClient` and the CLI instead of at import time, so importing `src` has no side effects and
+    does not pay for python-dotenv unless a client or command actually runs.
+    """
+    global _loaded
+    if _loaded:
+        return
+    with _lock:
+        if not _loaded:
+            from dotenv import load_dotenv
+
+            load_dotenv()
+            _loaded = True
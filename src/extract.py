@@ -0,0 +1,229 @@
+import json
+import re
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Mapping, Optional, Union
+
+if TYPE_CHECKING:
+    from .schema import ShapeRegistry
+
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+_NON_NUMERIC = re.compile(r"[^0-9.\-]")
+
+# Known label variants for the fields we extract from AC payloads, keyed by normalized field name.
+# Change it through register_synonyms/load_synonyms so cached lookups are invalidated.
+SYNONYMS: Dict[str, List[str]] = {
+    "inventory": ["inventory", "inventories", "inventorytotal", "totalinventory"],
+    "capitalworkinprogress": ["capitalworkinprogress", "cwip", "workinprogress"],
+    "costofrevenue": ["costofrevenue", "costofsales", "cogs", "costofgoodsold"],
+}
+_synonyms_version = 0
+
+# Fields src.cogs reads from each AC statement endpoint
+STATEMENT_FIELDS: Dict[str, List[str]] = {
+    "balancesheet": ["inventory", "capitalWorkInProgress"],
+    "pnl": ["costOfRevenue"],
+}
+
+_UNSEEN = object()
+_LABEL_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=8192)
+def _normalize_name(s: str) -> str:
+    return _NON_ALNUM.sub("", s.lower())
+
+
+def _extract_numeric(val):
+    """Try to clean common number formats and return either Decimal-friendly string or numeric types unchanged."""
+    if val is None:
+        return None
+    # If it's already numeric, return as-is
+    if isinstance(val, (int, float)):
+        return val
+    if isinstance(val, str):
+        v = val.strip()
+        # handle parentheses as negative numbers: (1,234.56)
+        negative = False
+        if v.startswith("(") and v.endswith(")"):
+            negative = True
+            v = v[1:-1].strip()
+        # remove commas and other non-numeric chars except dot and minus
+        v = _NON_NUMERIC.sub("", v)
+        if v == "":
+            return None
+        if negative:
+            v = f"-{v}"
+        return v
+    return val
+
+
+@lru_cache(maxsize=256)
+def candidate_norms(key: str) -> frozenset:
+    """Normalized label variants that count as a match for `key`."""
+    names = SYNONYMS.get(_normalize_name(key), [key])
+    return frozenset(_normalize_name(x) for x in names)
+
+
+def synonyms_version() -> int:
+    """Bumped on every synonym change; extractors use it to rebuild their label index."""
+    return _synonyms_version
+
+
+def register_synonyms(field: str, names: Iterable[str], replace: bool = False) -> None:
+    """Add label variants for `field` (or replace them with `replace=True`)."""
+    global _synonyms_version
+    norm = _normalize_name(field)
+    current = [] if replace else SYNONYMS.get(norm, [norm])
+    SYNONYMS[norm] = list(dict.fromkeys([*current, *(_normalize_name(n) for n in names)]))
+    candidate_norms.cache_clear()
+    _synonyms_version += 1
+
+
+def load_synonyms(source: Union[str, Mapping[str, Iterable[str]]], replace: bool = True) -> None:
+    """Load `{field: [label, ...]}` from a mapping or a JSON file path; by default each listed field is replaced."""
+    if isinstance(source, str):
+        with open(source, "r", encoding="utf-8") as fh:
+            source = json.load(fh)
+    for field, names in source.items():
+        register_synonyms(field, names, replace=replace)
+
+
+class FieldExtractor:
+    """Extract several fields from a payload in a single traversal.
+
+    Every key gets exactly the result `src.cogs._find_value(payload, key)` would return:
+    the tree is walked in the same order and each key follows the same first-match rules,
+    but labels are normalized once per node instead of once per node per key.
+    """
+
+    def __init__(self, keys: Iterable[str], registry: Optional["ShapeRegistry"] = None):
+        self.keys: List[str] = list(keys)
+        # Known payload shapes (src.schema) tried before the generic walk
+        self.registry = registry
+        self._build_index()
+
+    def _build_index(self) -> None:
+        # normalized label -> keys it satisfies
+        self._index: Dict[str, List[str]] = {}
+        for key in self.keys:
+            for norm in candidate_norms(key):
+                self._index.setdefault(norm, []).append(key)
+        # raw dict keys known not to match any field (filled by compiled shape accessors)
+        self._inert_keys: set = set()
+        # raw label string -> matching keys (or None), so repeated labels skip normalization
+        self._label_keys: Dict[str, Optional[List[str]]] = {}
+        self._version = synonyms_version()
+
+    def extract(self, obj) -> Dict[str, Any]:
+        return self.extract_traced(obj)[0]
+
+    def extract_traced(self, obj):
+        """Like `extract`, but also return how the payload was read: a shape name, "generic", or None (not walked)."""
+        if self._version != synonyms_version():
+            self._build_index()
+        found: Dict[str, Any] = {}
+        path = None
+        if obj is not None and self.keys:
+            found = None
+            if self.registry is not None:
+                hit = self.registry.match_name(obj, self)
+                if hit is not None:
+                    path, found = hit
+            if found is None:
+                path = "generic"
+                found = self._walk(obj, set(self.keys))
+        return {key: found.get(key) for key in self.keys}, path
+
+    def _labelled(self, item: dict, active: set):
+        """Keys settled by an item's `name`/`label` entry (the `{'label': .., 'amount': ..}` shape).
+
+        Returns `(keys, value)`, or None when the item does not match any active key.
+        """
+        name = item.get("name") or item.get("label")
+        if not name:
+            return None
+        if name.__class__ is str:
+            keys = self._label_keys.get(name, _UNSEEN)
+            if keys is _UNSEEN:
+                if len(self._label_keys) >= _LABEL_CACHE_SIZE:
+                    self._label_keys.clear()
+                keys = self._label_keys[name] = self._index.get(_normalize_name(name))
+        else:
+            keys = self._index.get(_normalize_name(str(name)))
+        if not keys or active.isdisjoint(keys):
+            return None
+        return keys, _extract_numeric(item.get("value") or item.get("amount") or item.get("quantity"))
+
+    @staticmethod
+    def _settle(keys, value, active: set, found: Dict[str, Any]) -> None:
+        # a None match ends a key's search at the current level, exactly like _find_value
+        for key in keys:
+            if key in active:
+                active.discard(key)
+                if value is not None:
+                    found[key] = value
+
+    def _walk(self, obj, pending: set) -> Dict[str, Any]:
+        """Return the keys resolved (to non-None) within `obj`; `pending` keys are still being searched.
+
+        `pending` is never mutated: it is copied the first time a key is settled at this level.
+        """
+        index = self._index
+        active = pending
+        found: Dict[str, Any] = {}
+
+        if isinstance(obj, dict):
+            for k, v in obj.items():
+                keys = index.get(_normalize_name(k))
+                if keys and not active.isdisjoint(keys):
+                    if active is pending:
+                        active = set(pending)
+                    self._settle(keys, _extract_numeric(v), active, found)
+                    if not active:
+                        break
+                if isinstance(v, dict):
+                    hit = self._labelled(v, active)
+                    if hit:
+                        if active is pending:
+                            active = set(pending)
+                        self._settle(*hit, active, found)
+                        if not active:
+                            break
+                    sub = self._walk(v, active)
+                elif isinstance(v, list):
+                    sub = self._walk(v, active)
+                else:
+                    continue
+                if sub:
+                    if active is pending:
+                        active = set(pending)
+                    found.update(sub)
+                    active.difference_update(sub)
+                    if not active:
+                        break
+
+        elif isinstance(obj, list):
+            for item in obj:
+                if isinstance(item, dict):
+                    hit = self._labelled(item, active)
+                    if hit:
+                        if active is pending:
+                            active = set(pending)
+                        self._settle(*hit, active, found)
+                        if not active:
+                            break
+                    sub = self._walk(item, active)
+                elif isinstance(item, list):
+                    sub = self._walk(item, active)
+                else:
+                    continue
+                if sub:
+                    if active is pending:
+                        active = set(pending)
+                    found.update(sub)
+                    active.difference_update(sub)
+                    if not active:
+                        break
+
+        return found
@@ -1,47 +1,201 @@
-from typing import TypedDict, Optional, List, Dict
+import threading
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING, Callable, Iterable, TypedDict, Optional, List, Dict, Tuple
 
-from .ac_api_client import ACAPIClient
-from .models import FinancialState
+from .audit import AuditTrail, check_audit_mode
+from .instrumentation import Hooks
+from .models import AnyFinancialState
 from .cogs import calculate_cogs_for_company
 
+if TYPE_CHECKING:  # the clients pull in requests; a graph over a store or prefetched payloads does not need it
+    from .ac_api_client import ACAPIClient
+    from .async_client import AsyncACAPIClient
+
 
 class State(TypedDict, total=False):
     company: str
     year: int
-    financial_data: Optional[FinancialState]
+    financial_data: Optional[AnyFinancialState]
     logs: List[str]
     raw_balancesheet_current: Dict
     raw_balancesheet_prior: Dict
     raw_pnl: Dict
     report: Dict
     final_report: Dict
+    audit_mode: str
+    audit_trail: AuditTrail
+    fail_fast: bool
+    halted: str
+    reused: bool
+    error: str
+
+
+class HaltGraph(Exception):
+    """Raised by a node to stop the run: nodes not yet started are skipped unless declared `always`."""
+
+
+@dataclass(frozen=True)
+class Node:
+    """A graph step: `fn(state)` reads the `reads` keys and writes the `writes` keys.
+
+    `fn` may mutate the state in place or return a dict of updates. `always` nodes still run after a halt.
+    """
+
+    name: str
+    fn: Callable[[State], Optional[Dict]]
+    reads: Tuple[str, ...] = ()
+    writes: Tuple[str, ...] = ()
+    always: bool = False
+
+
+_FETCHES = (
+    ("fetch_balancesheet_current", "raw_balancesheet_current", "get_balancesheet", 0),
+    ("fetch_balancesheet_prior", "raw_balancesheet_prior", "get_balancesheet", 1),
+    ("fetch_pnl", "raw_pnl", "get_pnl", 0),
+)
+
+_FETCH_NODES = tuple(name for name, _, _, _ in _FETCHES)
 
 
 class StateGraph:
-    def __init__(self, client: ACAPIClient):
+    """Runs a DAG of `Node`s over a `State` dict.
+
+    A node depends on every earlier node that writes a key it reads or writes, or reads a key it writes, so
+    declaration order settles conflicts and the graph is acyclic by construction. With `workers` > 1, nodes
+    whose dependencies are done run concurrently on a thread pool (the three statement fetches, by default);
+    with the default of 1 they run one at a time in declaration order.
+    """
+
+    def __init__(self, client: "ACAPIClient", sink: Optional[Callable[[Dict], None]] = None, hooks: Optional[Hooks] = None,
+                 workers: int = 1):
         self.client = client
+        # Called with each final report as soon as audit_node builds it (e.g. src.output.JsonlWriter)
+        self.sink = sink
+        # Told how long each node (and each payload extraction) takes (src.instrumentation)
+        self.hooks = hooks
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        # `run` may be called from several threads at once (src.service), so the pool is created under a lock
+        self._executor_lock = threading.Lock()
+        self.nodes: List[Node] = []
+        self._deps: Dict[str, List[str]] = {}
+        for name, key, method, offset in _FETCHES:
+            self.add_node(name, self._fetch_one(key, method, offset), reads=("company", "year"), writes=(key,))
+        raw = tuple(key for _, key, _, _ in _FETCHES)
+        self.add_node("check_fetch", self.check_fetch_node, reads=raw, writes=("logs",), always=True)
+        self.add_node("calculate", self.calculate_node, reads=("company", "year", "audit_mode") + raw,
+                      writes=("report", "financial_data", "logs", "audit_trail"))
+        self.add_node("audit", self.audit_node, reads=("company", "year", "report", "logs", "audit_trail", "audit_mode"),
+                      writes=("final_report",), always=True)
 
-    def fetch_node(self, state: State) -> State:
-        company = state["company"]
-        year = state["year"]
-        logs = state.get("logs", [])
+    def add_node(self, name: str, fn: Callable[[State], Optional[Dict]], reads=(), writes=(), always: bool = False) -> Node:
+        """Append a node; its dependencies are derived from the keys it declares."""
+        if name in self._deps:
+            raise ValueError(f"duplicate node name {name!r}")
+        node = Node(name, fn, tuple(reads), tuple(writes), always)
+        self._deps[name] = [
+            other.name for other in self.nodes
+            if set(other.writes) & (set(node.reads) | set(node.writes)) or set(other.reads) & set(node.writes)
+        ]
+        self.nodes.append(node)
+        return node
 
-        bs_current = self.client.get_balancesheet(company, year)
-        if isinstance(bs_current, dict) and bs_current.get("error"):
-            logs.append(f"balancesheet(current) error: {bs_current.get('message')}")
+    def dependencies(self, name: str) -> List[str]:
+        return list(self._deps[name])
 
-        bs_prior = self.client.get_balancesheet(company, year - 1)
-        if isinstance(bs_prior, dict) and bs_prior.get("error"):
-            logs.append(f"balancesheet(prior) error: {bs_prior.get('message')}")
+    def _fetch_one(self, key: str, method: str, offset: int) -> Callable[[State], None]:
+        def fetch(state: State) -> None:
+            res = getattr(self.client, method)(state["company"], state["year"] - offset)
+            state[key] = res
+            if state.get("fail_fast") and isinstance(res, dict) and res.get("error"):
+                raise HaltGraph(f"{key[4:]} fetch failed")
 
-        pnl = self.client.get_pnl(company, year)
-        if isinstance(pnl, dict) and pnl.get("error"):
-            logs.append(f"pnl error: {pnl.get('message')}")
+        return fetch
 
-        state["raw_balancesheet_current"] = bs_current
-        state["raw_balancesheet_prior"] = bs_prior
-        state["raw_pnl"] = pnl
+    def check_fetch_node(self, state: State) -> None:
+        """Log fetch errors in a fixed order, whichever fetch finished first."""
+        logs = state.get("logs", [])
+        for label, key in (("balancesheet(current)", "raw_balancesheet_current"),
+                           ("balancesheet(prior)", "raw_balancesheet_prior"), ("pnl", "raw_pnl")):
+            res = state.get(key)
+            if isinstance(res, dict) and res.get("error"):
+                logs.append(f"{label} error: {res.get('message')}")
         state["logs"] = logs
+
+    def _call(self, node: Node, state: State) -> None:
+        start = perf_counter()
+        try:
+            result = node.fn(state)
+        finally:
+            if self.hooks is not None:
+                self.hooks.on_node(node.name, perf_counter() - start)
+        if result is not None and result is not state:
+            state.update(result)
+
+    def _pool(self) -> ThreadPoolExecutor:
+        with self._executor_lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="stategraph")
+            return self._executor
+
+    def close(self) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "StateGraph":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def execute(self, state: State, done: Iterable[str] = ()) -> State:
+        """Run every node over `state` respecting dependencies; a `HaltGraph` skips the remaining non-`always` nodes.
+
+        Nodes named in `done` are treated as already run (their keys must be in `state`), e.g. the fetch nodes
+        when the statements were fetched some other way.
+        """
+        done = set(done)
+        if self.workers <= 1:
+            for node in self.nodes:
+                if node.name in done or (state.get("halted") and not node.always):
+                    continue
+                try:
+                    self._call(node, state)
+                except HaltGraph as exc:
+                    state.setdefault("halted", str(exc))
+            return state
+
+        pending = [node for node in self.nodes if node.name not in done]
+        finished: set = set(done)
+        running: Dict = {}
+        pool = self._pool()
+        try:
+            while pending or running:
+                for node in list(pending):
+                    if state.get("halted") and not node.always:
+                        pending.remove(node)
+                        finished.add(node.name)
+                    elif all(dep in finished for dep in self._deps[node.name]):
+                        pending.remove(node)
+                        running[pool.submit(self._call, node, state)] = node
+                if not running:
+                    continue
+                completed, _ = wait(running, return_when=FIRST_COMPLETED)
+                for fut in completed:
+                    node = running.pop(fut)
+                    finished.add(node.name)
+                    try:
+                        fut.result()
+                    except HaltGraph as exc:
+                        state.setdefault("halted", str(exc))
+        except BaseException:
+            for fut in running:
+                fut.cancel()
+            raise
         return state
 
     def calculate_node(self, state: State) -> State:
@@ -60,12 +214,14 @@ class StateGraph:
         # directly to get the FinancialState and then reuse calculate_cogs_for_company for final assembly.
         from .cogs import build_financial_state, compute_cwip_transfers, compute_implied_purchases, compute_cogs_from_formula
 
-        fin_res = build_financial_state(self.client, company, year, bs_current=bs_current, bs_prev=bs_prior, pnl_current=pnl)
+        audit = state.get("audit_mode", "text")
+        fin_res = build_financial_state(self.client, company, year, bs_current=bs_current, bs_prev=bs_prior, pnl_current=pnl, audit=audit,
+                                       hooks=self.hooks, compact=True)
         fin = fin_res.get("data")
 
-        cwip_res = compute_cwip_transfers(fin)
-        purchases_res = compute_implied_purchases(fin)
-        cogs_res = compute_cogs_from_formula(fin.opening_inventory, purchases_res["data"], cwip_res["data"], fin.closing_inventory)
+        cwip_res = compute_cwip_transfers(fin, audit=audit)
+        purchases_res = compute_implied_purchases(fin, audit=audit)
+        cogs_res = compute_cogs_from_formula(fin.opening_inventory, purchases_res["data"], cwip_res["data"], fin.closing_inventory, audit=audit)
 
         # Reconstruct final using the same format as calculate_cogs_for_company
         # Format numeric fields to 2 decimals (ROUND_HALF_UP) to match main calculation output
@@ -85,10 +241,13 @@ class StateGraph:
         }
 
         state["report"] = calc_data
-        logs.append(fin_res.get("audit_trail", ""))
-        logs.append(cwip_res.get("audit_trail", ""))
-        logs.append(purchases_res.get("audit_trail", ""))
-        logs.append(cogs_res.get("audit_trail", ""))
+        state["financial_data"] = fin
+        steps = [fin_res.get("audit_trail", ""), cwip_res.get("audit_trail", ""), purchases_res.get("audit_trail", ""), cogs_res.get("audit_trail", "")]
+        if audit == "text":
+            logs.extend(steps)
+        elif audit == "structured":
+            # kept unrendered; audit_node exposes them as records
+            state["audit_trail"] = AuditTrail(steps)
         state["logs"] = logs
         return state
 
@@ -101,12 +260,86 @@ class StateGraph:
             "report": report,
             "logs": logs,
         }
+        if state.get("audit_mode") == "structured":
+            final["audit"] = state.get("audit_trail", AuditTrail()).to_records()
         state["final_report"] = final
+        if self.sink is not None:
+            self.sink(final)
         return state
 
-    def run(self, company: str, year: int) -> State:
-        state: State = {"company": company, "year": year, "logs": []}
-        state = self.fetch_node(state)
-        state = self.calculate_node(state)
-        state = self.audit_node(state)
-        return state
+    def run(self, company: str, year: int, audit: str = "text", fail_fast: bool = False) -> State:
+        """Fetch, calculate and audit one company-year.
+
+        `audit="text"` (default) appends the rendered calculation steps to `logs`; "structured" keeps them as
+        `AuditStep`s in `state["audit_trail"]` and adds their records under `final_report["audit"]`; "off"
+        records fetch errors only. With `fail_fast`, a failed fetch skips the calculation: the final report
+        carries the error logs and an empty `report`, and `state["halted"]` says why.
+        """
+        state: State = {"company": company, "year": year, "logs": [], "audit_mode": check_audit_mode(audit)}
+        if fail_fast:
+            state["fail_fast"] = True
+        return self.execute(state)
+
+
+    def run_range(self, company: str, start_year: int, end_year: int, audit: str = "text") -> Dict:
+        """Run every year in [start_year, end_year], fetching each statement exactly once.
+
+        Each year then runs every node after the fetches (`check_fetch`, `calculate`, `audit` and any added
+        with `add_node`) as in `run`, so a sink sees one report per year; the result's `final_report` holds
+        the per-year reports under `series`.
+        """
+        if start_year > end_year:
+            raise ValueError("start_year must not be after end_year")
+        check_audit_mode(audit)
+        start = perf_counter()
+        balancesheets = {y: self.client.get_balancesheet(company, y) for y in range(start_year - 1, end_year + 1)}
+        pnls = {y: self.client.get_pnl(company, y) for y in range(start_year, end_year + 1)}
+        if self.hooks is not None:
+            self.hooks.on_node("fetch", perf_counter() - start)
+
+        states = []
+        for year in range(start_year, end_year + 1):
+            state: State = {"company": company, "year": year, "logs": [], "audit_mode": audit,
+                            "raw_balancesheet_current": balancesheets[year],
+                            "raw_balancesheet_prior": balancesheets[year - 1], "raw_pnl": pnls[year]}
+            states.append(self.execute(state, done=_FETCH_NODES))
+
+        return {
+            "company": company,
+            "start_year": start_year,
+            "end_year": end_year,
+            "states": states,
+            "final_report": {
+                "company": company,
+                "start_year": start_year,
+                "end_year": end_year,
+                "series": [s["final_report"] for s in states],
+            },
+        }
+
+
+class AsyncStateGraph(StateGraph):
+    """`StateGraph` whose fetch stage issues the three statement requests concurrently.
+
+    The remaining nodes (including any added with `add_node`) then run as in `StateGraph.run`, so
+    `await arun(...)` produces the same state.
+    """
+
+    def __init__(self, client: "AsyncACAPIClient", sink: Optional[Callable[[Dict], None]] = None,
+                 hooks: Optional[Hooks] = None):
+        self.async_client = client
+        super().__init__(client.sync, sink=sink, hooks=hooks)
+
+    async def arun(self, company: str, year: int, audit: str = "text") -> State:
+        import asyncio
+
+        state: State = {"company": company, "year": year, "logs": [], "audit_mode": check_audit_mode(audit)}
+        start = perf_counter()
+        state["raw_balancesheet_current"], state["raw_balancesheet_prior"], state["raw_pnl"] = await asyncio.gather(
+            self.async_client.get_balancesheet(company, year),
+            self.async_client.get_balancesheet(company, year - 1),
+            self.async_client.get_pnl(company, year),
+        )
+        if self.hooks is not None:
+            self.hooks.on_node("fetch", perf_counter() - start)
+        return self.execute(state, done=_FETCH_NODES)
@@ -0,0 +1,62 @@
+"""Process-pool side of hybrid batch runs: statements are fetched on threads, then decoded, extracted and
+computed in worker processes, so the pure-Python extraction walk is not serialized on the parent's GIL.
+
+Workers receive response bodies as bytes (`ACAPIClient.get_raw`) and send back the finished state without
+its raw payloads, so neither direction pickles a large decoded tree.
+"""
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Tuple, Union
+
+from .decode import get_decoder
+from .graph import State, StateGraph
+
+Payload = Union[bytes, Dict[str, Any]]
+
+_RAW_KEYS = ("raw_balancesheet_current", "raw_balancesheet_prior", "raw_pnl")
+_decode = None
+
+
+class Prefetched:
+    """Client stand-in serving one pair's already-fetched statements, decoding bodies on first use."""
+
+    def __init__(self, year: int, bs_current: Payload, bs_prior: Payload, pnl: Payload):
+        self._payloads = {("balancesheet", year): bs_current, ("balancesheet", year - 1): bs_prior, ("pnl", year): pnl}
+
+    def _get(self, endpoint: str, calendarYear: int) -> Dict[str, Any]:
+        global _decode
+        payload = self._payloads[(endpoint, calendarYear)]
+        if isinstance(payload, (bytes, bytearray)):
+            if _decode is None:
+                _decode = get_decoder("auto")
+            try:
+                payload = _decode(payload)
+            except ValueError as exc:
+                # same error dict `ACAPIClient` returns for a non-JSON body, so the pair reports a failed fetch
+                payload = {"error": True, "message": f"invalid JSON body: {exc}", "status_code": 200}
+            self._payloads[(endpoint, calendarYear)] = payload
+        return payload
+
+    def get_balancesheet(self, company: str, calendarYear: int) -> Dict[str, Any]:
+        return self._get("balancesheet", calendarYear)
+
+    def get_pnl(self, company: str, calendarYear: int) -> Dict[str, Any]:
+        return self._get("pnl", calendarYear)
+
+
+def compute_pair(company: str, year: int, payloads: Tuple[Payload, Payload, Payload], audit: str = "text") -> State:
+    """Run the graph for one pair over prefetched (current balance sheet, prior balance sheet, P&L) payloads.
+
+    Runs in a worker process. The returned state keeps raw payloads only when they are error dicts.
+    """
+    state = StateGraph(Prefetched(year, *payloads)).run(company, year, audit=audit)
+    for key in _RAW_KEYS:
+        res = state.get(key)
+        if not (isinstance(res, dict) and res.get("error")):
+            state.pop(key, None)
+    return state
+
+
+def process_pool(processes: int) -> ProcessPoolExecutor:
+    """Worker pool for `compute_pair`. Uses "spawn" because the parent is running fetch threads."""
+    return ProcessPoolExecutor(max_workers=processes, mp_context=multiprocessing.get_context("spawn"))
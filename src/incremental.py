@@ -0,0 +1,150 @@
+"""Incremental recomputation: remember which raw payloads each result came from and reuse it while they are unchanged.
+
+A result for (company, year) depends on three payloads: the year's balance sheet, the prior year's balance sheet
+and the year's P&L. So a change to year N's balance sheet invalidates both N and N+1 (see `dependents`).
+"""
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+from .graph import State
+from .models import FIELDS, CompactFinancialState
+from .store import content_hash
+
+
+Pair = Tuple[str, int]
+Hashes = Tuple[str, str, str]
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    company          TEXT    NOT NULL,
+    year             INTEGER NOT NULL,
+    bs_current_hash  TEXT    NOT NULL,
+    bs_prior_hash    TEXT    NOT NULL,
+    pnl_hash         TEXT    NOT NULL,
+    audit            TEXT    NOT NULL,
+    inputs           TEXT,
+    final_report     TEXT    NOT NULL,
+    computed_at      REAL    NOT NULL,
+    PRIMARY KEY (company, year)
+)
+"""
+
+
+def payload_hash(payload: Union[bytes, Dict[str, Any], None]) -> Optional[str]:
+    """Content hash of a raw body (bytes) or decoded payload; None for error dicts, which are never reused.
+
+    Bytes and decoded payloads hash differently, so switching a batch between process-pool and threaded mode
+    recomputes everything once.
+    """
+    if isinstance(payload, (bytes, bytearray)):
+        return "raw:" + hashlib.sha256(payload).hexdigest()
+    if payload is None or (isinstance(payload, dict) and payload.get("error")):
+        return None
+    return content_hash(payload)
+
+
+def input_hashes(payloads: Sequence[Union[bytes, Dict[str, Any]]]) -> Optional[Hashes]:
+    """Hashes of (current balance sheet, prior balance sheet, P&L), or None if any of them is an error."""
+    hashes = tuple(payload_hash(p) for p in payloads)
+    return None if None in hashes else hashes
+
+
+def dependents(company: str, statement: str, year: int) -> List[Pair]:
+    """The results that read a given statement: a balance sheet feeds its own year and the next one."""
+    if statement == "balancesheet":
+        return [(company, year), (company, year + 1)]
+    return [(company, year)]
+
+
+class ResultTracker:
+    """SQLite record of computed results and the hashes of the payloads they were computed from.
+
+    `lookup` returns the stored result when all three hashes (and the audit mode) match; `record` stores a
+    freshly computed one. Writes are committed every `commit_every` records and on `close`. Thread-safe.
+    """
+
+    def __init__(self, path: str, commit_every: int = 500):
+        self.path = path
+        self.commit_every = commit_every
+        self.reused = 0
+        self.recomputed = 0
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def lookup(self, company: str, year: int, hashes: Optional[Hashes], audit: str) -> Optional[State]:
+        """The previous result as a state (`final_report`, `report`, `financial_data`, `reused=True`), or None."""
+        if hashes is None:
+            return None
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT inputs, final_report FROM results WHERE company = ? AND year = ? AND bs_current_hash = ? "
+                "AND bs_prior_hash = ? AND pnl_hash = ? AND audit = ?",
+                (company, year, *hashes, audit),
+            ).fetchone()
+            if row is not None:
+                self.reused += 1
+        if row is None:
+            return None
+        final = json.loads(row[1])
+        state: State = {"company": company, "year": year, "final_report": final, "report": final.get("report", {}),
+                        "logs": final.get("logs", []), "audit_mode": audit, "reused": True}
+        if row[0] is not None:
+            state["financial_data"] = CompactFinancialState(**json.loads(row[0]))
+        return state
+
+    def record(self, state: State, hashes: Optional[Hashes]) -> None:
+        """Remember a computed state; states built from an error payload (`hashes` None) are not kept."""
+        if hashes is None or state.get("halted") or "final_report" not in state:
+            return
+        fin = state.get("financial_data")
+        inputs = json.dumps({f: str(getattr(fin, f)) for f in FIELDS}) if fin is not None else None
+        final = json.dumps(state["final_report"], separators=(",", ":"), default=str)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (state["company"], state["year"], *hashes, state.get("audit_mode", "text"), inputs, final, time.time()),
+            )
+            self.recomputed += 1
+            self._pending += 1
+            if self._pending >= self.commit_every:
+                self._conn.commit()
+                self._pending = 0
+
+    def invalidate(self, company: str, statement: str, year: int) -> int:
+        """Forget every result that read the given statement; returns how many were dropped."""
+        with self._lock:
+            dropped = sum(
+                self._conn.execute("DELETE FROM results WHERE company = ? AND year = ?", pair).rowcount
+                for pair in dependents(company, statement, year)
+            )
+            self._conn.commit()
+        return dropped
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"reused": self.reused, "recomputed": self.recomputed}
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.commit()
+            self._conn.close()
+
+    def __enter__(self) -> "ResultTracker":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,176 @@
+import json
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+class Hooks:
+    """Instrumentation callbacks. Subclass and override what you need; every method is a no-op here.
+
+    Pass an instance as `hooks=` to `ACAPIClient` and `StateGraph` (and `build_financial_state`).
+    """
+
+    def on_node(self, node: str, seconds: float) -> None:
+        """A graph node finished: `fetch_balancesheet_current`, `fetch_balancesheet_prior`, `fetch_pnl`,
+        `check_fetch`, `calculate`, `audit` or one added with `add_node`. Series and async runs, which fetch
+        outside the graph, report their fetches as one `fetch`."""
+
+    def on_http(self, path: str, status: Optional[int], seconds: float, bytes_received: int, decode_seconds: float) -> None:
+        """An HTTP call finished; `seconds` includes retries, `decode_seconds` is JSON decoding alone."""
+
+    def on_extract(self, path: str, seconds: float) -> None:
+        """One payload traversal by the field extractor; `path` is the matched shape name or "generic"."""
+
+
+class _Stat:
+    __slots__ = ("count", "total", "min", "max")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = float("inf")
+        self.max = 0.0
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        self.min = min(self.min, value)
+        self.max = max(self.max, value)
+
+    def as_dict(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "total": self.total,
+            "mean": self.total / self.count if self.count else 0.0,
+            "min": self.min if self.count else 0.0,
+            "max": self.max,
+        }
+
+
+# metric name -> (help text, label name)
+_METRICS = {
+    "node_seconds": ("Time spent in each StateGraph node", "node"),
+    "http_seconds": ("HTTP call latency including retries", "endpoint"),
+    "http_response_bytes": ("Response body bytes received", "endpoint"),
+    "json_decode_seconds": ("JSON decode time per response", "endpoint"),
+    "extract_seconds": ("Field extraction time per payload traversal", "path"),
+}
+
+
+def _endpoint(path: str) -> str:
+    """Group `/server/company/balancesheet/AAPL` as `balancesheet` so metrics stay low-cardinality."""
+    parts = [p for p in path.split("/") if p]
+    if len(parts) >= 3 and parts[:2] == ["server", "company"]:
+        return parts[2]
+    return "/" + "/".join(parts)
+
+
+class Profiler(Hooks):
+    """Thread-safe `Hooks` that aggregates everything it sees and exports it without any network."""
+
+    def __init__(self, prefix: str = "cogs"):
+        self.prefix = prefix
+        self._lock = threading.Lock()
+        self._stats: Dict[Tuple[str, str], _Stat] = {}
+        self.http_status: Dict[str, int] = {}
+
+    def _add(self, metric: str, label: str, value: float) -> None:
+        with self._lock:
+            stat = self._stats.get((metric, label))
+            if stat is None:
+                stat = self._stats[(metric, label)] = _Stat()
+            stat.add(value)
+
+    def on_node(self, node: str, seconds: float) -> None:
+        self._add("node_seconds", node, seconds)
+
+    def on_http(self, path: str, status: Optional[int], seconds: float, bytes_received: int, decode_seconds: float) -> None:
+        endpoint = _endpoint(path)
+        self._add("http_seconds", endpoint, seconds)
+        self._add("http_response_bytes", endpoint, bytes_received)
+        self._add("json_decode_seconds", endpoint, decode_seconds)
+        with self._lock:
+            key = str(status)
+            self.http_status[key] = self.http_status.get(key, 0) + 1
+
+    def on_extract(self, path: str, seconds: float) -> None:
+        self._add("extract_seconds", path, seconds)
+
+    def summary(self) -> Dict[str, Dict[str, Dict[str, float]]]:
+        with self._lock:
+            out: Dict[str, Dict[str, Dict[str, float]]] = {}
+            for (metric, label), stat in sorted(self._stats.items()):
+                out.setdefault(metric, {})[label] = stat.as_dict()
+            return out
+
+    def format_summary(self) -> str:
+        """Human-readable table for `main.py --profile`."""
+        lines = [f"{'metric':22s} {'label':28s} {'count':>7s} {'total':>12s} {'mean':>12s} {'max':>12s}"]
+        for metric, labels in self.summary().items():
+            unit = "B" if metric.endswith("bytes") else "ms"
+            scale = 1 if unit == "B" else 1000
+            for label, s in labels.items():
+                lines.append(
+                    f"{metric:22s} {label:28s} {s['count']:7d} {s['total'] * scale:10.2f}{unit:>2s} "
+                    f"{s['mean'] * scale:10.2f}{unit:>2s} {s['max'] * scale:10.2f}{unit:>2s}"
+                )
+        if self.http_status:
+            lines.append("http status counts: " + ", ".join(f"{k}={v}" for k, v in sorted(self.http_status.items())))
+        return "\n".join(lines)
+
+    def to_prometheus(self) -> str:
+        """Prometheus text exposition format (summaries as `_count`/`_sum` pairs)."""
+        lines: List[str] = []
+        for metric, labels in self.summary().items():
+            help_text, label_name = _METRICS[metric]
+            name = f"{self.prefix}_{metric}"
+            lines.append(f"# HELP {name} {help_text}")
+            lines.append(f"# TYPE {name} summary")
+            for label, s in labels.items():
+                escaped = label.replace("\\", "\\\\").replace('"', '\\"')
+                lines.append(f'{name}_count{{{label_name}="{escaped}"}} {s["count"]}')
+                lines.append(f'{name}_sum{{{label_name}="{escaped}"}} {s["total"]!r}')
+        if self.http_status:
+            name = f"{self.prefix}_http_responses_total"
+            lines.append(f"# HELP {name} HTTP responses by status code")
+            lines.append(f"# TYPE {name} counter")
+            for status, count in sorted(self.http_status.items()):
+                lines.append(f'{name}{{status="{status}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+    def to_otlp(self) -> Dict:
+        """OTLP/JSON `ExportMetricsServiceRequest` body, ready to write to a file or hand to a collector."""
+        now = str(time.time_ns())
+        metrics = []
+        for metric, labels in self.summary().items():
+            help_text, label_name = _METRICS[metric]
+            points = [
+                {
+                    "attributes": [{"key": label_name, "value": {"stringValue": label}}],
+                    "timeUnixNano": now,
+                    "count": str(s["count"]),
+                    "sum": s["total"],
+                    "quantileValues": [{"quantile": 0.0, "value": s["min"]}, {"quantile": 1.0, "value": s["max"]}],
+                }
+                for label, s in labels.items()
+            ]
+            metrics.append({
+                "name": f"{self.prefix}.{metric}",
+                "description": help_text,
+                "unit": "By" if metric.endswith("bytes") else "s",
+                "summary": {"dataPoints": points},
+            })
+        return {
+            "resourceMetrics": [{
+                "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": self.prefix}}]},
+                "scopeMetrics": [{"scope": {"name": "src.instrumentation"}, "metrics": metrics}],
+            }]
+        }
+
+    def write(self, path: str) -> None:
+        """Write Prometheus text, or OTLP/JSON when `path` ends in `.json`."""
+        with open(path, "w", encoding="utf-8") as fh:
+            if path.endswith(".json"):
+                json.dump(self.to_otlp(), fh, indent=2)
+            else:
+                fh.write(self.to_prometheus())
@@ -0,0 +1,92 @@
+"""Columnar COGS kernel for bulk recomputation over stored panels (requires numpy).
+
+Same formulas as `src.cogs`:
+    cwip_transfers    = cwip_opening - cwip_closing
+    implied_purchases = cost_of_revenue - opening_inventory - cwip_transfers + closing_inventory
+    cogs              = opening_inventory + implied_purchases + cwip_transfers - closing_inventory
+    reconciliation    = cogs - cost_of_revenue
+"""
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP
+from typing import Dict, Iterable, Sequence
+
+import numpy as np
+
+from .models import FIELDS, OUTPUTS  # noqa: F401 - column order of the kernel's inputs and outputs
+
+# Largest magnitude an input may have at its scale: four terms are summed, so keep clear of int64 overflow
+_MAX_SCALED = 2 ** 60
+
+
+def _compute(opening, closing, cwip_opening, cwip_closing, cost_of_revenue) -> Dict[str, np.ndarray]:
+    transfers = cwip_opening - cwip_closing
+    purchases = cost_of_revenue - opening - transfers + closing
+    cogs = opening + purchases + transfers - closing
+    return {
+        "cogs": cogs,
+        "implied_purchases": purchases,
+        "cwip_transfers": transfers,
+        "reconciliation": cogs - cost_of_revenue,
+    }
+
+
+def cogs_kernel(opening_inventory, closing_inventory, cwip_opening, cwip_closing, cost_of_revenue) -> Dict[str, np.ndarray]:
+    """Fast float64 path: array-in, array-out, no rounding. Use `cogs_kernel_exact` when cents must match."""
+    cols = [np.asarray(c, dtype=np.float64) for c in (opening_inventory, closing_inventory, cwip_opening, cwip_closing, cost_of_revenue)]
+    return _compute(*cols)
+
+
+def to_scaled(values: Iterable, decimals: int = 4) -> np.ndarray:
+    """Convert Decimals/strings/numbers to int64 units of 10**-decimals, exactly.
+
+    Raises ValueError if a value is not a finite number, has more fractional digits than `decimals` or does
+    not fit in int64.
+    """
+    quantum = Decimal(1).scaleb(-decimals)
+    out = []
+    for v in values:
+        try:
+            d = v if isinstance(v, Decimal) else Decimal(str(v if v is not None else 0))
+            q = d.quantize(quantum)
+        except InvalidOperation:
+            # non-numeric, NaN/infinite, or more digits than the context precision at this scale
+            raise ValueError(f"{v!r} is not a number the int64 kernel can hold at {decimals} decimals") from None
+        if q != d:
+            raise ValueError(f"{v!r} has more than {decimals} decimal places")
+        scaled = int(q.scaleb(decimals))
+        if abs(scaled) >= _MAX_SCALED:
+            raise ValueError(f"{v!r} is too large for the int64 kernel at {decimals} decimals")
+        out.append(scaled)
+    return np.array(out, dtype=np.int64)
+
+
+def round_half_up_to_cents(scaled: np.ndarray, decimals: int = 4) -> np.ndarray:
+    """Round int64 units of 10**-decimals to int64 cents, ROUND_HALF_UP (ties away from zero) like `src.cogs`."""
+    if decimals < 2:
+        return scaled * (10 ** (2 - decimals))
+    factor = 10 ** (decimals - 2)
+    if factor == 1:
+        return scaled.copy()
+    magnitude = (np.abs(scaled) + factor // 2) // factor
+    return np.where(scaled < 0, -magnitude, magnitude)
+
+
+def cogs_kernel_exact(opening_inventory, closing_inventory, cwip_opening, cwip_closing, cost_of_revenue,
+                      decimals: int = 4) -> Dict[str, np.ndarray]:
+    """Exact path on scaled int64 inputs (units of 10**-decimals, e.g. from `to_scaled`).
+
+    Returns int64 cents, rounded exactly as the Decimal path formats its results.
+    """
+    cols = [np.asarray(c, dtype=np.int64) for c in (opening_inventory, closing_inventory, cwip_opening, cwip_closing, cost_of_revenue)]
+    for col in cols:
+        if col.size and int(np.abs(col).max()) >= _MAX_SCALED:
+            raise ValueError("input too large for the int64 kernel")
+    raw = _compute(*cols)
+    return {name: round_half_up_to_cents(arr, decimals) for name, arr in raw.items()}
+
+
+def cents_to_strings(cents: Sequence[int]) -> list:
+    """Format int64 cents like `src.cogs` formats currency (e.g. -575 -> '-5.75').
+
+    Cents carry no sign for zero, so a Decimal result of '-0.00' comes back as '0.00'.
+    """
+    return [str(Decimal(int(c)).scaleb(-2).quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)) for c in cents]
@@ -1,22 +1,130 @@
+import threading
 from decimal import Decimal, InvalidOperation
-from pydantic import BaseModel, validator
-from typing import Optional
+from typing import TYPE_CHECKING, Optional, Protocol
 
+# pydantic is imported when `FinancialState` is first used (see `__getattr__`): the calculation path builds
+# `CompactFinancialState`, so store-only and offline runs never pay for it
+if TYPE_CHECKING:
+    from pydantic import BaseModel
+
+    class FinancialState(BaseModel):
+        opening_inventory: Decimal
+        closing_inventory: Decimal
+        cwip_opening: Decimal
+        cwip_closing: Decimal
+        cost_of_revenue: Decimal
+
+
+FIELDS = ("opening_inventory", "closing_inventory", "cwip_opening", "cwip_closing", "cost_of_revenue")
+# Computed report values, in the column order of src.kernel and src.columnar
+OUTPUTS = ("cogs", "implied_purchases", "cwip_transfers", "reconciliation")
+
+
+def to_decimal(v) -> Decimal:
+    """Coerce an API/raw value to Decimal (None -> 0); raises ValueError if it is not numeric."""
+    if v is None:
+        return Decimal("0")
+    if not isinstance(v, Decimal):
+        try:
+            v = Decimal(str(v))
+        except (InvalidOperation, ValueError):
+            raise ValueError("Value must be coercible to Decimal")
+    # FinancialState's Decimal fields reject NaN and infinities; CompactFinancialState must agree
+    if not v.is_finite():
+        raise ValueError("Value must be a finite number")
+    return v
+
+
+def _financial_state_model() -> "type[FinancialState]":
+    """The pydantic `FinancialState`, created under its own name so it imports and pickles as src.models.FinancialState."""
+    from pydantic import create_model, validator
+
+    def coerce(cls, v):
+        return to_decimal(v)
+
+    return create_model(
+        "FinancialState",
+        __module__=__name__,
+        __validators__={"to_decimal": validator(*FIELDS, pre=True)(coerce)},
+        **{f: (Decimal, ...) for f in FIELDS},
+    )
+
+
+_model_lock = threading.Lock()
+
+
+def _model() -> "type[FinancialState]":
+    with _model_lock:
+        cls = globals().get("FinancialState")
+        if cls is None:
+            cls = globals()["FinancialState"] = _financial_state_model()
+        return cls
+
+
+def __getattr__(name: str):
+    if name == "FinancialState":
+        return _model()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+class AnyFinancialState(Protocol):
+    """Anything the compute functions accept: `FinancialState` or `CompactFinancialState`.
+
+    A protocol rather than a Union so annotations using it resolve at runtime without importing pydantic.
+    """
 
-class FinancialState(BaseModel):
     opening_inventory: Decimal
     closing_inventory: Decimal
     cwip_opening: Decimal
     cwip_closing: Decimal
     cost_of_revenue: Decimal
 
-    @validator("opening_inventory", "closing_inventory", "cwip_opening", "cwip_closing", "cost_of_revenue", pre=True)
-    def to_decimal(cls, v):
-        if v is None:
-            return Decimal("0")
-        if isinstance(v, Decimal):
-            return v
-        try:
-            return Decimal(str(v))
-        except (InvalidOperation, ValueError):
-            raise ValueError("Value must be coercible to Decimal")
+
+class CompactFinancialState:
+    """Slotted, pydantic-free stand-in for `FinancialState` for bulk recomputation.
+
+    The constructor validates and coerces like `FinancialState`; `from_decimals` trusts its inputs and skips
+    validation entirely. The compute functions in `src.cogs` accept either class.
+    """
+
+    __slots__ = FIELDS
+
+    def __init__(self, opening_inventory=None, closing_inventory=None, cwip_opening=None, cwip_closing=None, cost_of_revenue=None):
+        self.opening_inventory = to_decimal(opening_inventory)
+        self.closing_inventory = to_decimal(closing_inventory)
+        self.cwip_opening = to_decimal(cwip_opening)
+        self.cwip_closing = to_decimal(cwip_closing)
+        self.cost_of_revenue = to_decimal(cost_of_revenue)
+
+    @classmethod
+    def from_decimals(cls, opening_inventory: Decimal, closing_inventory: Decimal, cwip_opening: Decimal,
+                      cwip_closing: Decimal, cost_of_revenue: Decimal) -> "CompactFinancialState":
+        """Trusted constructor: the caller guarantees every argument is already a Decimal."""
+        inst = object.__new__(cls)
+        inst.opening_inventory = opening_inventory
+        inst.closing_inventory = closing_inventory
+        inst.cwip_opening = cwip_opening
+        inst.cwip_closing = cwip_closing
+        inst.cost_of_revenue = cost_of_revenue
+        return inst
+
+    @classmethod
+    def from_model(cls, fin: "FinancialState") -> "CompactFinancialState":
+        return cls.from_decimals(*(getattr(fin, f) for f in FIELDS))
+
+    def to_model(self) -> "FinancialState":
+        return _model()(**self.dict())
+
+    def dict(self) -> dict:
+        return {f: getattr(self, f) for f in FIELDS}
+
+    def __eq__(self, other) -> bool:
+        # FinancialState only exists once something has used it
+        if not isinstance(other, (CompactFinancialState, globals().get("FinancialState", CompactFinancialState))):
+            return NotImplemented
+        return all(getattr(self, f) == getattr(other, f) for f in FIELDS)
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return "CompactFinancialState(" + ", ".join(f"{f}={getattr(self, f)!r}" for f in FIELDS) + ")"
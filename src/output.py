@@ -0,0 +1,148 @@
+import gzip
+import io
+import json
+import os
+import sys
+import threading
+import zlib
+from typing import Any, Dict, IO, Optional, Set, Tuple
+
+
+def _is_gzip(path: str, compress: Optional[bool]) -> bool:
+    return compress if compress is not None else path.endswith(".gz")
+
+
+def _dumps(report: Dict[str, Any]) -> str:
+    return json.dumps(report, separators=(",", ":"), ensure_ascii=False)
+
+
+class JsonlWriter:
+    """Thread-safe NDJSON sink: one compact JSON line per report.
+
+    Plain files are flushed after every line. Paths ending in `.gz` (or `compress=True`) are gzip-compressed
+    and flushed every `gzip_flush_every` lines and on close: each gzip flush ends a deflate block, so flushing
+    per line would make the file several times larger. After a crash, `--resume` recomputes the pairs written
+    since the last flush. With `append=True` new reports are added after existing ones (for gzip as an extra
+    member, which readers handle transparently). `path=None` or `"-"` writes to stdout. Call it like a
+    function to use it as a `StateGraph` sink.
+    """
+
+    def __init__(self, path: Optional[str] = None, compress: Optional[bool] = None, append: bool = False,
+                 gzip_flush_every: int = 1000):
+        self.path = path
+        self.written = 0
+        self._lock = threading.Lock()
+        self._owned = path not in (None, "-")
+        self._flush_every = 1
+        if self._owned and append and os.path.exists(path):
+            repair_jsonl(path, compress)
+        if not self._owned:
+            self._fh: IO[str] = sys.stdout
+        elif _is_gzip(path, compress):
+            # write_through: lines go straight to the compressor; only `flush` forces a deflate block out
+            self._fh = io.TextIOWrapper(gzip.open(path, "ab" if append else "wb"), encoding="utf-8", write_through=True)
+            self._flush_every = max(1, gzip_flush_every)
+        else:
+            self._fh = open(path, "a" if append else "w", encoding="utf-8")
+
+    def write(self, report: Dict[str, Any]) -> None:
+        line = _dumps(report) + "\n"
+        with self._lock:
+            self._fh.write(line)
+            self.written += 1
+            if self.written % self._flush_every == 0:
+                self._fh.flush()
+
+    def flush(self) -> None:
+        """Make everything written so far readable from the file, even if the process dies before `close`."""
+        with self._lock:
+            self._fh.flush()
+
+    __call__ = write
+
+    def close(self) -> None:
+        with self._lock:
+            if self._owned:
+                self._fh.close()
+            else:
+                self._fh.flush()
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_jsonl(path: str, compress: Optional[bool] = None):
+    """Yield reports from a JSONL file, stopping quietly at a truncated tail left by an interrupted run."""
+    opener = gzip.open if _is_gzip(path, compress) else open
+    with opener(path, "rt", encoding="utf-8") as fh:
+        try:
+            for line in fh:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError:
+                    return
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            return
+
+
+# log prefixes of reports whose fetch or calculation failed (src.graph.check_fetch_node, src.batch)
+_ERROR_LOGS = ("balancesheet(current) error:", "balancesheet(prior) error:", "pnl error:", "error:")
+
+
+def _failed(report: Dict[str, Any]) -> bool:
+    return any(isinstance(line, str) and line.startswith(_ERROR_LOGS) for line in report.get("logs") or ())
+
+
+def completed_pairs(path: str, compress: Optional[bool] = None) -> Set[Tuple[str, int]]:
+    """(company, year) pairs already present in an output file; empty if the file does not exist.
+
+    Reports whose logs record a fetch or calculation error do not count, so `--resume` retries them; the
+    retry appends a second record for the pair, and the later one is the one to keep.
+    """
+    if not os.path.exists(path):
+        return set()
+    ok: Dict[Tuple[str, int], bool] = {}
+    for r in read_jsonl(path, compress):
+        if "company" in r:
+            ok[(r.get("company"), r.get("year"))] = not _failed(r)
+    return {pair for pair, good in ok.items() if good}
+
+
+def repair_jsonl(path: str, compress: Optional[bool] = None) -> None:
+    """Drop a partial last record left by an interrupted writer so the file can be appended to."""
+    if _is_gzip(path, compress):
+        try:
+            with gzip.open(path, "rb") as fh:
+                while fh.read(1 << 20):
+                    pass
+            return
+        except (EOFError, zlib.error, gzip.BadGzipFile):
+            pass
+        # an unterminated gzip member cannot be appended to; rewrite the readable records
+        tmp = f"{path}.repair"
+        with gzip.open(tmp, "wt", encoding="utf-8") as out:
+            for report in read_jsonl(path, compress=True):
+                out.write(_dumps(report) + "\n")
+        os.replace(tmp, path)
+        return
+
+    with open(path, "rb+") as fh:
+        end = fh.seek(0, os.SEEK_END)
+        pos = end
+        # scan backwards for the last newline without reading the whole file
+        while pos > 0:
+            step = min(64 * 1024, pos)
+            pos -= step
+            fh.seek(pos)
+            idx = fh.read(step).rfind(b"\n")
+            if idx != -1:
+                pos += idx + 1
+                break
+        if pos != end:
+            fh.truncate(pos)
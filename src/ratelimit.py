@@ -0,0 +1,168 @@
+import os
+import struct
+import threading
+import time
+from typing import Any, Callable, Dict, Mapping, Optional
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """Thread-safe token bucket: `rate` tokens per second with bursts of up to `burst` tokens.
+
+    `acquire()` blocks until a token is available; callers are served in arrival order. `stats()` reports
+    how many acquisitions had to wait and for how long.
+    """
+
+    def __init__(self, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = float(rate)
+        self.burst = float(burst if burst is not None else max(1.0, rate))
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.burst
+        self._updated = clock()
+        self._lock = threading.Lock()
+        self.acquired = 0
+        self.throttled = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def _take(self, tokens: float, updated: float, now: float):
+        """Refill for the time since `updated`, take one token (possibly going into debt); returns (tokens, wait)."""
+        tokens = min(self.burst, tokens + max(0.0, now - updated) * self.rate) - 1
+        return tokens, (0.0 if tokens >= 0 else -tokens / self.rate)
+
+    def _record(self, wait: float) -> None:
+        # caller holds self._lock
+        self.acquired += 1
+        if wait > 0:
+            self.throttled += 1
+            self.wait_total += wait
+            self.wait_max = max(self.wait_max, wait)
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt) and return how long the caller must wait for it."""
+        with self._lock:
+            now = self._clock()
+            self._tokens, wait = self._take(self._tokens, self._updated, now)
+            self._updated = now
+            self._record(wait)
+            return wait
+
+    def acquire(self) -> float:
+        """Block until a token is available; returns the time spent waiting."""
+        wait = self._reserve()
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "acquired": self.acquired,
+                "throttled": self.throttled,
+                "wait_total_s": round(self.wait_total, 6),
+                "wait_max_s": round(self.wait_max, 6),
+            }
+
+
+class FileTokenBucket(TokenBucket):
+    """`TokenBucket` whose state lives in a small file guarded by `flock`, so every process using the same
+    `path` draws from one budget (POSIX only).
+
+    The clock must be comparable across processes; the default `time.monotonic` is system-wide on Linux.
+    """
+
+    _STATE = struct.Struct("dd")
+
+    def __init__(self, path: str, rate: float, burst: Optional[float] = None, clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        import fcntl  # noqa: F401 - fail early where flock is unavailable
+
+        super().__init__(rate, burst, clock=clock, sleep=sleep)
+        self.path = path
+        self._fd: Optional[int] = None
+        self._pid: Optional[int] = None
+
+    def _file(self) -> int:
+        # flock is held per open file: a forked child must open its own
+        if self._fd is None or self._pid != os.getpid():
+            self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            self._pid = os.getpid()
+        return self._fd
+
+    def _reserve(self) -> float:
+        import fcntl
+
+        with self._lock:
+            fd = self._file()
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                raw = os.pread(fd, self._STATE.size, 0)
+                now = self._clock()
+                tokens, updated = self._STATE.unpack(raw) if len(raw) == self._STATE.size else (self.burst, now)
+                tokens, wait = self._take(tokens, updated, now)
+                os.pwrite(fd, self._STATE.pack(tokens, now), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._record(wait)
+            return wait
+
+    def close(self) -> None:
+        if self._fd is not None and self._pid == os.getpid():
+            os.close(self._fd)
+        self._fd = None
+
+
+class RequestScheduler:
+    """Per-host token buckets shared by every thread using it, and with `shared_dir` by every process too.
+
+    `rate` applies to any host without an entry in `per_host`; a host with neither is not limited. Callers
+    queue in arrival order rather than failing, and `stats()` reports wait time and throttled counts per host.
+    """
+
+    def __init__(self, rate: Optional[float] = None, per_host: Optional[Mapping[str, float]] = None,
+                 burst: Optional[float] = None, shared_dir: Optional[str] = None,
+                 clock: Callable[[], float] = time.monotonic, sleep: Callable[[float], None] = time.sleep):
+        self.rate = rate
+        self.per_host = dict(per_host or {})
+        self.burst = burst
+        self.shared_dir = shared_dir
+        self._clock = clock
+        self._sleep = sleep
+        self._buckets: Dict[str, Optional[TokenBucket]] = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, host: str) -> Optional[TokenBucket]:
+        with self._lock:
+            if host not in self._buckets:
+                rate = self.per_host.get(host, self.rate)
+                if rate is None:
+                    self._buckets[host] = None
+                elif self.shared_dir is not None:
+                    os.makedirs(self.shared_dir, exist_ok=True)
+                    path = os.path.join(self.shared_dir, host.replace(":", "_") + ".bucket")
+                    self._buckets[host] = FileTokenBucket(path, rate, self.burst, clock=self._clock, sleep=self._sleep)
+                else:
+                    self._buckets[host] = TokenBucket(rate, self.burst, clock=self._clock, sleep=self._sleep)
+            return self._buckets[host]
+
+    def acquire(self, url: str) -> float:
+        """Wait for a request slot for `url`'s host; returns the time spent waiting."""
+        bucket = self.bucket(urlparse(url).netloc)
+        return bucket.acquire() if bucket is not None else 0.0
+
+    def wrap(self, get: Callable[..., Any]) -> Callable[..., Any]:
+        """`get(url, **kwargs)` that first waits for a slot; wrap the per-attempt callable so retries queue too."""
+        def limited(url: str, **kwargs: Any) -> Any:
+            self.acquire(url)
+            return get(url, **kwargs)
+
+        return limited
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {host: b.stats() for host, b in buckets.items() if b is not None}
@@ -0,0 +1,169 @@
+"""What-if / sensitivity analysis over already-built financial states (requires numpy).
+
+Each scenario shocks fields by a percentage (`{"closing_inventory": 5}` means 5% higher) or overrides them with an
+absolute value; an override wins over a shock on the same field. All companies x scenarios are computed in
+one broadcast pass of the float64 `src.kernel` formulas, so nothing is refetched. Results are analysis-grade
+floats; use `src.cogs` (Decimal) for audited figures.
+"""
+import csv
+import itertools
+from dataclasses import dataclass, field
+from typing import Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+from .kernel import cogs_kernel
+from .models import FIELDS, OUTPUTS, AnyFinancialState
+
+
+# Rows of a company chunk x scenarios computed at once; bounds the temporaries to a few hundred MB
+_CHUNK_CELLS = 2_000_000
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    shocks: Mapping[str, float] = field(default_factory=dict)
+    overrides: Mapping[str, float] = field(default_factory=dict)
+
+    def __post_init__(self):
+        for name in (*self.shocks, *self.overrides):
+            if name not in FIELDS:
+                raise ValueError(f"unknown field {name!r}; expected one of {FIELDS}")
+
+
+def scenario_grid(shocks: Optional[Mapping[str, Sequence[float]]] = None,
+                  overrides: Optional[Mapping[str, Sequence[float]]] = None) -> List[Scenario]:
+    """Every combination of the given per-field shock percentages and override values.
+
+    `scenario_grid({"closing_inventory": [-5, 0, 5], "cwip_closing": [0, 10]})` gives 6 scenarios named like
+    `closing_inventory=+5%,cwip_closing=+10%`.
+    """
+    shocks = dict(shocks or {})
+    overrides = dict(overrides or {})
+    axes = [("shock", f, values) for f, values in shocks.items()] + [("override", f, values) for f, values in overrides.items()]
+    scenarios = []
+    for combo in itertools.product(*(values for _, _, values in axes)):
+        s, o, parts = {}, {}, []
+        for (kind, name, _), value in zip(axes, combo):
+            if kind == "shock":
+                s[name] = value
+                parts.append(f"{name}={value:+g}%")
+            else:
+                o[name] = value
+                parts.append(f"{name}={value:g}")
+        scenarios.append(Scenario(",".join(parts) or "base", s, o))
+    return scenarios
+
+
+def _matrices(scenarios: Sequence[Scenario]):
+    """(S, 5) multipliers and overrides (NaN where a field is not overridden)."""
+    mult = np.ones((len(scenarios), len(FIELDS)))
+    over = np.full((len(scenarios), len(FIELDS)), np.nan)
+    col = {f: i for i, f in enumerate(FIELDS)}
+    for row, sc in enumerate(scenarios):
+        for name, pct in sc.shocks.items():
+            mult[row, col[name]] = 1 + float(pct) / 100
+        for name, value in sc.overrides.items():
+            over[row, col[name]] = float(value)
+    return mult, over
+
+
+def base_matrix(states: Iterable[AnyFinancialState]) -> np.ndarray:
+    """(N, 5) float64 inputs in `src.models.FIELDS` order from `FinancialState`s or `CompactFinancialState`s."""
+    return np.array([[float(getattr(s, f)) for f in FIELDS] for s in states], dtype=np.float64).reshape(-1, len(FIELDS))
+
+
+class ScenarioTable:
+    """Companies x scenarios outcomes: `columns[name]` is an (N, S) float64 array for each of `src.kernel.OUTPUTS`."""
+
+    def __init__(self, companies: List, scenarios: List[Scenario], columns: Dict[str, np.ndarray]):
+        self.companies = companies
+        self.scenarios = scenarios
+        self.columns = columns
+
+    @property
+    def shape(self):
+        return len(self.companies), len(self.scenarios)
+
+    def __len__(self) -> int:
+        return len(self.companies) * len(self.scenarios)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.nbytes for a in self.columns.values())
+
+    def long(self) -> Dict[str, np.ndarray]:
+        """Long format: `company` and `scenario` index columns plus one flat column per output (views, no copies)."""
+        n, s = self.shape
+        out = {
+            "company": np.repeat(np.arange(n, dtype=np.int32), s),
+            "scenario": np.tile(np.arange(s, dtype=np.int32), n),
+        }
+        out.update({name: arr.reshape(-1) for name, arr in self.columns.items()})
+        return out
+
+    def rows(self) -> Iterator[Dict]:
+        """One dict per (company, scenario), values rounded to cents."""
+        names = list(self.columns)
+        for i, company in enumerate(self.companies):
+            cells = [np.round(self.columns[name][i], 2).tolist() for name in names]
+            for j, sc in enumerate(self.scenarios):
+                row = {"company": company, "scenario": sc.name}
+                row.update((name, cells[k][j]) for k, name in enumerate(names))
+                yield row
+
+    def to_csv(self, path: str) -> int:
+        """Write `rows()` as CSV; returns the number of rows written."""
+        count = 0
+        with open(path, "w", newline="", encoding="utf-8") as fh:
+            writer = csv.DictWriter(fh, fieldnames=["company", "scenario", *self.columns])
+            writer.writeheader()
+            for row in self.rows():
+                writer.writerow(row)
+                count += 1
+        return count
+
+
+def run_scenarios(states: Union[Mapping[object, AnyFinancialState], Sequence[AnyFinancialState], np.ndarray],
+                  scenarios: Sequence[Scenario], outputs: Sequence[str] = OUTPUTS) -> ScenarioTable:
+    """Compute `outputs` for every state under every scenario in one batched pass.
+
+    `states` is a mapping of labels to states, a sequence of states (labelled by position), or an (N, 5)
+    array from `base_matrix`. Only the requested `outputs` are kept, which bounds memory for large grids.
+    """
+    unknown = set(outputs) - set(OUTPUTS)
+    if unknown:
+        raise ValueError(f"unknown outputs {sorted(unknown)}; expected some of {OUTPUTS}")
+    if isinstance(states, np.ndarray):
+        base = np.asarray(states, dtype=np.float64).reshape(-1, len(FIELDS))
+        companies = list(range(len(base)))
+    elif isinstance(states, Mapping):
+        companies = list(states)
+        base = base_matrix(states.values())
+    else:
+        base = base_matrix(states)
+        companies = list(range(len(base)))
+    scenarios = list(scenarios)
+    mult, over = _matrices(scenarios)
+    n, s = len(base), len(scenarios)
+    columns = {name: np.empty((n, s), dtype=np.float64) for name in outputs}
+
+    # fields no scenario touches stay (rows, 1) and broadcast for free
+    shocked = [bool((mult[:, f] != 1).any()) for f in range(len(FIELDS))]
+    overridden = [bool((~np.isnan(over[:, f])).any()) for f in range(len(FIELDS))]
+    step = max(1, _CHUNK_CELLS // max(1, s))
+    for lo in range(0, n, step):
+        chunk = base[lo:lo + step]
+        inputs = []
+        for f in range(len(FIELDS)):
+            col = chunk[:, f:f + 1]
+            if shocked[f]:
+                col = col * mult[:, f]
+            if overridden[f]:
+                col = np.where(np.isnan(over[:, f]), col, over[:, f])
+            inputs.append(col)
+        result = cogs_kernel(*inputs)
+        for name in outputs:
+            columns[name][lo:lo + step] = result[name]
+    return ScenarioTable(companies, scenarios, columns)
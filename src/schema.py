@@ -0,0 +1,212 @@
+"""Declared AC payload shapes with compiled accessors that short-cut the generic field search.
+
+A shape is a path such as `sections[].lineItems[]`: `name` steps into a dict key, `[]` iterates a list.
+Whatever the path ends at is read the usual way: list items by their `name`/`label` entry, dict keys by name.
+Accessors give exactly the result of `FieldExtractor`'s generic walk (and so of `src.cogs._find_value`);
+when a payload strays from the declared shape where it matters, they bail out and the generic walk runs.
+"""
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .extract import FieldExtractor, _extract_numeric, _normalize_name
+
+
+class _Mismatch(Exception):
+    pass
+
+
+_EACH = None  # path step marker for "[]"
+
+
+def parse_path(path: str) -> List[Optional[str]]:
+    """`sections[].lineItems[]` -> ['sections', None, 'lineItems', None] (None = iterate a list)."""
+    steps: List[Optional[str]] = []
+    for part in (p for p in path.split(".") if p):
+        name = part
+        count = 0
+        while name.endswith("[]"):
+            name = name[:-2]
+            count += 1
+        if name:
+            steps.append(name)
+        steps.extend([_EACH] * count)
+    return steps
+
+
+class PayloadShape:
+    """One declared payload layout, compiled into a direct accessor."""
+
+    def __init__(self, name: str, path: str):
+        self.name = name
+        self.path = path
+        self.steps = tuple(parse_path(path))
+
+    def __repr__(self) -> str:
+        return f"PayloadShape({self.name!r}, {self.path!r})"
+
+    def extract(self, obj, ex: FieldExtractor) -> Optional[Dict[str, Any]]:
+        """Resolved fields, or None if `obj` does not follow this shape."""
+        try:
+            return self._eval(obj, 0, set(ex.keys), ex)
+        except _Mismatch:
+            return None
+
+    def _eval(self, obj, depth: int, pending: set, ex: FieldExtractor) -> Dict[str, Any]:
+        # Mirrors FieldExtractor._walk level by level (same order, same None-match rules), but only follows
+        # the declared path and raises _Mismatch on any container the generic walk would have searched.
+        if depth == len(self.steps):
+            return self._fields(obj, pending, ex)
+        step = self.steps[depth]
+        active = pending
+        found: Dict[str, Any] = {}
+
+        if step is _EACH:
+            if not isinstance(obj, list):
+                raise _Mismatch
+            leaf = depth + 1 == len(self.steps)
+            inert = ex._inert_keys
+            for item in obj:
+                if isinstance(item, dict):
+                    hit = ex._labelled(item, active)
+                    if hit:
+                        if active is pending:
+                            active = set(pending)
+                        ex._settle(*hit, active, found)
+                        if not active:
+                            break
+                    if leaf and item.keys() <= inert:
+                        # typical line item ({'label': .., 'amount': ..}): nothing to match, only check it is flat
+                        for v in item.values():
+                            if isinstance(v, (dict, list)):
+                                raise _Mismatch
+                        continue
+                    sub = self._eval(item, depth + 1, active, ex)
+                elif isinstance(item, list):
+                    raise _Mismatch
+                else:
+                    continue
+                if sub:
+                    if active is pending:
+                        active = set(pending)
+                    found.update(sub)
+                    active.difference_update(sub)
+                    if not active:
+                        break
+            return found
+
+        if not isinstance(obj, dict) or step not in obj:
+            raise _Mismatch
+        for k, v in obj.items():
+            active = self._key_match(k, v, active, pending, found, ex)
+            if not active:
+                break
+            if k != step:
+                if isinstance(v, (dict, list)):
+                    raise _Mismatch
+                continue
+            if isinstance(v, dict):
+                hit = ex._labelled(v, active)
+                if hit:
+                    if active is pending:
+                        active = set(pending)
+                    ex._settle(*hit, active, found)
+                    if not active:
+                        break
+            elif not isinstance(v, list):
+                raise _Mismatch
+            sub = self._eval(v, depth + 1, active, ex)
+            if sub:
+                if active is pending:
+                    active = set(pending)
+                found.update(sub)
+                active.difference_update(sub)
+                if not active:
+                    break
+        return found
+
+    @staticmethod
+    def _key_match(k, v, active: set, pending: set, found: Dict[str, Any], ex: FieldExtractor) -> set:
+        if k in ex._inert_keys:
+            return active
+        keys = ex._index.get(_normalize_name(k))
+        if not keys:
+            ex._inert_keys.add(k)
+            return active
+        if active.isdisjoint(keys):
+            return active
+        if active is pending:
+            active = set(pending)
+        ex._settle(keys, _extract_numeric(v), active, found)
+        return active
+
+    def _fields(self, obj, pending: set, ex: FieldExtractor) -> Dict[str, Any]:
+        """End of the path: a dict read by key (a label entry, or a flat field dict)."""
+        if not isinstance(obj, dict):
+            if isinstance(obj, list):
+                raise _Mismatch
+            return {}
+        active = pending
+        found: Dict[str, Any] = {}
+        for k, v in obj.items():
+            active = self._key_match(k, v, active, pending, found, ex)
+            if not active:
+                break
+            if isinstance(v, (dict, list)):
+                raise _Mismatch
+        return found
+
+
+# Layouts the AC server is known to return
+DEFAULT_SHAPES = (
+    PayloadShape("sections.lineItems", "sections[].lineItems[]"),
+    PayloadShape("metrics", "metrics[]"),
+    PayloadShape("flat", ""),
+)
+
+
+class ShapeRegistry:
+    """Ordered set of `PayloadShape`s with per-shape hit counters (`"generic"` counts fallbacks)."""
+
+    def __init__(self, shapes=DEFAULT_SHAPES):
+        self.shapes: List[PayloadShape] = list(shapes)
+        self._lock = threading.Lock()
+        self.stats: Dict[str, int] = {}
+        self.reset_stats()
+
+    def register(self, name: str, path: str, first: bool = True) -> PayloadShape:
+        shape = PayloadShape(name, path)
+        with self._lock:
+            self.shapes.insert(0 if first else len(self.shapes), shape)
+            self.stats.setdefault(name, 0)
+        return shape
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self.stats = {s.name: 0 for s in self.shapes}
+            self.stats["generic"] = 0
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self.stats[name] = self.stats.get(name, 0) + 1
+
+    def match(self, obj, ex: FieldExtractor) -> Optional[Dict[str, Any]]:
+        """Fields from the first shape `obj` follows; None (counted as "generic") if none applies."""
+        hit = self.match_name(obj, ex)
+        return hit[1] if hit is not None else None
+
+    def match_name(self, obj, ex: FieldExtractor) -> Optional[Tuple[str, Dict[str, Any]]]:
+        """Like `match`, but returns `(shape name, fields)`."""
+        for shape in self.shapes:
+            found = shape.extract(obj, ex)
+            if found is not None:
+                self._count(shape.name)
+                return shape.name, found
+        self._count("generic")
+        return None
+
+    def hit_rates(self) -> Dict[str, float]:
+        total = sum(self.stats.values())
+        return {name: (count / total if total else 0.0) for name, count in self.stats.items()}
+
+
+DEFAULT_REGISTRY = ShapeRegistry()
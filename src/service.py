@@ -0,0 +1,294 @@
+"""Long-running HTTP service around `StateGraph`: one warm client shared by every request.
+
+Each `main.py` run starts a fresh process with a cold connection pool, no response cache and no coalescing.
+`CogsService` keeps all three warm, so repeated or overlapping lookups skip the network and the startup cost.
+
+Routes (JSON unless noted):
+
+    GET  /cogs/{company}/{year}   final report; `?audit=off|structured|text`, `?fail_fast=1`
+    POST /cogs/batch              body `{"pairs": [[company, year], ...]}` or `{"companies": [...], "years": "2020-2023"}`,
+                                  optional `"audit"`; returns `{"results": [...], "summary": {...}}`
+    GET  /metrics                 Prometheus text: service latency per route plus the client's HTTP/node timings
+    GET  /stats                   service latency and throughput, cache and coalescing counters
+    GET  /health
+"""
+import json
+import threading
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Any, Deque, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlparse
+
+from .audit import check_audit_mode
+from .batch import _has_fetch_error, _percentile, dedupe_pairs, parse_years, run_batch
+from .graph import StateGraph
+from .instrumentation import Profiler
+
+if TYPE_CHECKING:
+    from .ac_api_client import ACAPIClient
+
+
+def _is_year(year: Any) -> bool:
+    """An int (not a bool) or a digit string; JSON floats and nulls are rejected rather than truncated."""
+    if isinstance(year, str):
+        return year.isdigit()
+    return isinstance(year, int) and not isinstance(year, bool)
+
+
+def _is_pair(company: Any, year: Any) -> bool:
+    return isinstance(company, str) and bool(company.strip()) and _is_year(year)
+
+
+class ServiceMetrics:
+    """Thread-safe per-route request counts, error counts and latency percentiles over the last `window` requests."""
+
+    def __init__(self, window: int = 10000):
+        self.window = window
+        self.started = monotonic()
+        self.inflight = 0
+        self._lock = threading.Lock()
+        self._counts: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+        self._total: Dict[str, float] = {}
+        self._latencies: Dict[str, Deque[float]] = {}
+
+    def begin(self) -> None:
+        with self._lock:
+            self.inflight += 1
+
+    def observe(self, route: str, status: int, seconds: float) -> None:
+        with self._lock:
+            self.inflight -= 1
+            self._counts[route] = self._counts.get(route, 0) + 1
+            self._total[route] = self._total.get(route, 0.0) + seconds
+            if status >= 500:
+                self._errors[route] = self._errors.get(route, 0) + 1
+            latencies = self._latencies.get(route)
+            if latencies is None:
+                latencies = self._latencies[route] = deque(maxlen=self.window)
+            latencies.append(seconds)
+
+    def _snapshot(self) -> Tuple[float, int, Dict[str, Tuple[int, int, float, List[float]]]]:
+        """(uptime, inflight, {route: (count, errors, total seconds, sorted latencies)})."""
+        with self._lock:
+            routes = {route: (count, self._errors.get(route, 0), self._total[route], sorted(self._latencies[route]))
+                      for route, count in sorted(self._counts.items())}
+            return monotonic() - self.started, self.inflight, routes
+
+    def summary(self) -> Dict[str, Any]:
+        uptime, inflight, routes = self._snapshot()
+        requests = sum(count for count, _, _, _ in routes.values())
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": requests,
+            "inflight": inflight,
+            "requests_per_sec": round(requests / uptime, 2) if uptime else 0.0,
+            "routes": {
+                route: {
+                    "count": count,
+                    "errors": errors,
+                    "mean_ms": round(total / count * 1000, 2),
+                    "p50_ms": round(_percentile(ordered, 50) * 1000, 2),
+                    "p99_ms": round(_percentile(ordered, 99) * 1000, 2),
+                }
+                for route, (count, errors, total, ordered) in routes.items()
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "cogs") -> str:
+        """Prometheus text: a latency summary (p50/p99 quantiles, `_count`, `_sum`) and 5xx count per route."""
+        _, inflight, routes = self._snapshot()
+        name = f"{prefix}_service_request_seconds"
+        errors = f"{prefix}_service_errors_total"
+        gauge = f"{prefix}_service_inflight_requests"
+        lines = [f"# HELP {name} Service request latency by route", f"# TYPE {name} summary"]
+        for route, (count, _, total, ordered) in routes.items():
+            for q in (50, 99):
+                lines.append(f'{name}{{route="{route}",quantile="{q / 100}"}} {_percentile(ordered, q)!r}')
+            lines.append(f'{name}_count{{route="{route}"}} {count}')
+            lines.append(f'{name}_sum{{route="{route}"}} {total!r}')
+        lines += [f"# HELP {errors} Requests answered with a 5xx status", f"# TYPE {errors} counter"]
+        lines += [f'{errors}{{route="{route}"}} {err}' for route, (_, err, _, _) in routes.items()]
+        lines += [f"# HELP {gauge} Requests being served", f"# TYPE {gauge} gauge", f"{gauge} {inflight}"]
+        return "\n".join(lines) + "\n"
+
+
+class CogsService:
+    """Threaded HTTP server answering COGS lookups from one shared client and `StateGraph`.
+
+    The client should be built once with a pooled transport and a response cache (see `main.py --serve`);
+    its cache, connection pool and in-flight coalescing then serve every request. The graph fetches on a
+    pool of `fetch_workers` threads shared by all requests, and a batch request runs `run_batch` on up to
+    `batch_workers` threads. `hooks` defaults to a `Profiler`, whose timings `/metrics` exports; the client
+    should be built with the same hooks to report its HTTP calls there too. Use as a context manager, or
+    `start()`/`stop()`, or `serve_forever()` from the CLI.
+    """
+
+    def __init__(self, client: "ACAPIClient", host: str = "127.0.0.1", port: int = 8080,
+                 hooks: Optional[Profiler] = None, fetch_workers: int = 32, batch_workers: int = 8,
+                 max_batch: int = 10000):
+        self.client = client
+        self.hooks = hooks if hooks is not None else Profiler()
+        self.graph = StateGraph(client, hooks=self.hooks, workers=fetch_workers)
+        self.batch_workers = batch_workers
+        self.max_batch = max_batch
+        self.metrics = ServiceMetrics()
+        self.httpd = ThreadingHTTPServer((host, port), self._handler())
+        self.httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def cogs(self, company: str, year: int, audit: str = "text", fail_fast: bool = False) -> Tuple[int, Dict]:
+        """One lookup: 200 with the final report, or 502 (same body) when a statement fetch failed."""
+        state = self.graph.run(company, year, audit=audit, fail_fast=fail_fast)
+        return (502 if _has_fetch_error(state) else 200), state["final_report"]
+
+    def batch(self, body: Dict[str, Any]) -> Tuple[int, Dict]:
+        """Run `run_batch` over the requested pairs; results come back in request order.
+
+        `companies` is a list of tickers or a comma-separated string (as `--companies`); `years` is a list of
+        years or a `--years` spec such as "2015-2024,2026". Malformed input raises `ValueError`.
+        """
+        if not isinstance(body, dict):
+            raise ValueError("expected a JSON object")
+        audit = check_audit_mode(body.get("audit", "text"))
+        raw_pairs = body.get("pairs", [])
+        if not isinstance(raw_pairs, list) or not all(isinstance(p, list) and len(p) == 2 and _is_pair(*p)
+                                                      for p in raw_pairs):
+            raise ValueError('"pairs" must be a list of [company, year] pairs')
+        pairs: List[Tuple[str, int]] = [(c, int(y)) for c, y in raw_pairs]
+        companies = body.get("companies")
+        if companies:
+            if isinstance(companies, str):
+                companies = [c.strip() for c in companies.split(",") if c.strip()]
+            elif not (isinstance(companies, list) and all(isinstance(c, str) for c in companies)):
+                raise ValueError('"companies" must be a list of tickers or a comma-separated string')
+            years = body.get("years", [])
+            if isinstance(years, list) and all(_is_year(y) for y in years):
+                years = [int(y) for y in years]
+            elif isinstance(years, (str, int)):
+                years = parse_years(str(years))
+            else:
+                raise ValueError('"years" must be a list of years or a spec such as "2020-2023"')
+            pairs.extend((c, y) for c in companies for y in years)
+        pairs = dedupe_pairs(pairs)
+        if not pairs:
+            return 400, {"error": True, "message": "no (company, year) pairs given", "status_code": 400}
+        if len(pairs) > self.max_batch:
+            return 413, {"error": True, "message": f"at most {self.max_batch} pairs per batch", "status_code": 413}
+        reports: Dict[Tuple[str, int], Dict] = {}
+
+        def keep(final: Dict) -> None:
+            reports[(final["company"], final["year"])] = final
+
+        stats = run_batch(self.client, pairs, workers=min(self.batch_workers, len(pairs)), sink=keep,
+                          audit=audit, hooks=self.hooks)
+        return 200, {"results": [reports[p] for p in pairs if p in reports], "summary": stats.summary()}
+
+    def stats(self) -> Dict[str, Any]:
+        out = self.metrics.summary()
+        client = getattr(self.client, "client", None) or self.client  # unwrap a StoreBackedClient
+        cache = getattr(client, "cache", None)
+        if cache is not None:
+            out["cache"] = cache.stats()
+        flight = getattr(client, "flight", None)
+        if flight is not None:
+            out["coalesced"] = flight.coalesced
+        return out
+
+    def _route(self, method: str, raw_path: str, body: bytes) -> Tuple[str, int, Any]:
+        """(route label, status, JSON body or Prometheus text) for one request."""
+        url = urlparse(raw_path)
+        parts = [p for p in url.path.split("/") if p]
+        if method == "GET" and parts == ["health"]:
+            return "/health", 200, {"status": "ok"}
+        if method == "GET" and parts == ["metrics"]:
+            return "/metrics", 200, self.metrics.to_prometheus(self.hooks.prefix) + self.hooks.to_prometheus()
+        if method == "GET" and parts == ["stats"]:
+            return "/stats", 200, self.stats()
+        if method == "POST" and parts == ["cogs", "batch"]:
+            try:
+                payload = json.loads(body or b"{}")
+                return ("/cogs/batch",) + self.batch(payload)
+            except (ValueError, TypeError, AttributeError) as exc:
+                return "/cogs/batch", 400, {"error": True, "message": f"bad batch request: {exc}", "status_code": 400}
+        if method == "GET" and len(parts) == 3 and parts[0] == "cogs":
+            query = parse_qs(url.query)
+            try:
+                year = int(parts[2])
+                return ("/cogs",) + self.cogs(unquote(parts[1]), year, audit=query.get("audit", ["text"])[0],
+                                              fail_fast=query.get("fail_fast", ["0"])[0] in ("1", "true"))
+            except ValueError as exc:
+                return "/cogs", 400, {"error": True, "message": str(exc), "status_code": 400}
+        return "other", 404, {"error": True, "message": "not found", "status_code": 404}
+
+    def _handler(self):
+        service = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def _serve(self, method: str) -> None:
+                start = perf_counter()
+                service.metrics.begin()
+                route, status = "other", 500
+                try:
+                    length = int(self.headers.get("Content-Length") or 0)
+                    body = self.rfile.read(length) if length else b""
+                    try:
+                        route, status, payload = service._route(method, self.path, body)
+                    except Exception as exc:
+                        status, payload = 500, {"error": True, "message": str(exc), "status_code": 500}
+                    if isinstance(payload, str):
+                        data, ctype = payload.encode("utf-8"), "text/plain; version=0.0.4"
+                    else:
+                        data, ctype = json.dumps(payload, default=str).encode("utf-8"), "application/json"
+                    self.send_response(status)
+                    self.send_header("Content-Type", ctype)
+                    self.send_header("Content-Length", str(len(data)))
+                    self.end_headers()
+                    self.wfile.write(data)
+                finally:
+                    service.metrics.observe(route, status, perf_counter() - start)
+
+            def do_GET(self):
+                self._serve("GET")
+
+            def do_POST(self):
+                self._serve("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+    def serve_forever(self) -> None:
+        try:
+            self.httpd.serve_forever()
+        finally:
+            self.close()
+
+    def start(self) -> "CogsService":
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self.httpd.shutdown()
+        self.close()
+
+    def close(self) -> None:
+        self.httpd.server_close()
+        self.graph.close()
+
+    def __enter__(self) -> "CogsService":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
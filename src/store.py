@@ -0,0 +1,183 @@
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from datetime import date
+from typing import TYPE_CHECKING, Any, Dict, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from .ac_api_client import ACAPIClient
+
+
+STORE_MODES = ("incremental", "offline", "refresh")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS statements (
+    company       TEXT    NOT NULL,
+    statement     TEXT    NOT NULL,
+    year          INTEGER NOT NULL,
+    payload       TEXT    NOT NULL,
+    content_hash  TEXT    NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    fetched_at    REAL    NOT NULL,
+    PRIMARY KEY (company, statement, year)
+)
+"""
+
+
+def content_hash(payload: Dict[str, Any]) -> str:
+    """Stable hash of a decoded payload (key order does not matter)."""
+    canonical = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+class StoredStatement(NamedTuple):
+    payload: Dict[str, Any]
+    content_hash: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float
+
+
+class StatementStore:
+    """SQLite store of raw AC payloads keyed by (company, statement, year).
+
+    Safe to share between threads; WAL mode lets several processes read while one writes.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        with self._lock:
+            if path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute(_SCHEMA)
+            self._conn.commit()
+
+    def get(self, company: str, statement: str, year: int) -> Optional[StoredStatement]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT payload, content_hash, etag, last_modified, fetched_at FROM statements "
+                "WHERE company = ? AND statement = ? AND year = ?",
+                (company, statement, year),
+            ).fetchone()
+        if row is None:
+            return None
+        return StoredStatement(json.loads(row[0]), row[1], row[2], row[3], row[4])
+
+    def put(self, company: str, statement: str, year: int, payload: Dict[str, Any],
+            etag: Optional[str] = None, last_modified: Optional[str] = None) -> bool:
+        """Insert or replace an entry; returns True when the content changed (or is new)."""
+        digest = content_hash(payload)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT content_hash FROM statements WHERE company = ? AND statement = ? AND year = ?",
+                (company, statement, year),
+            ).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO statements VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (company, statement, year, json.dumps(payload), digest, etag, last_modified, time.time()),
+            )
+            self._conn.commit()
+        return row is None or row[0] != digest
+
+    def touch(self, company: str, statement: str, year: int) -> None:
+        """Mark an entry as freshly validated (e.g. after a 304)."""
+        with self._lock:
+            self._conn.execute(
+                "UPDATE statements SET fetched_at = ? WHERE company = ? AND statement = ? AND year = ?",
+                (time.time(), company, statement, year),
+            )
+            self._conn.commit()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM statements").fetchone()[0]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+class StoreBackedClient:
+    """`ACAPIClient` stand-in that serves statements from a `StatementStore`.
+
+    Modes:
+    - "incremental": serve stored entries; refetch the current fiscal year (and later), entries older than
+      `max_age` seconds, and anything missing. Refetches send the stored ETag/Last-Modified so an unchanged
+      statement costs a 304.
+    - "offline": never touch the network; missing entries come back as error dicts.
+    - "refresh": refetch everything (still conditional) and update the store.
+    If a refetch fails and a stored copy exists, the stored copy is served.
+    """
+
+    def __init__(self, store: StatementStore, client: Optional["ACAPIClient"] = None, mode: str = "incremental",
+                 max_age: Optional[float] = None, current_year: Optional[int] = None):
+        if mode not in STORE_MODES:
+            raise ValueError(f"mode must be one of {STORE_MODES}, got {mode!r}")
+        if client is None and mode != "offline":
+            raise ValueError("a client is required unless mode is 'offline'")
+        self.store = store
+        self.client = client
+        self.mode = mode
+        self.max_age = max_age
+        self.current_year = current_year if current_year is not None else date.today().year
+        self.stats = {"store_hits": 0, "fetched": 0, "not_modified": 0, "changed": 0, "stale_served": 0}
+        self._lock = threading.Lock()
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _needs_refresh(self, stored: StoredStatement, year: int) -> bool:
+        if self.mode == "refresh":
+            return True
+        if year >= self.current_year:
+            return True
+        return self.max_age is not None and time.time() - stored.fetched_at >= self.max_age
+
+    def _statement(self, endpoint: str, company: str, calendarYear: int | None) -> Dict[str, Any]:
+        if calendarYear is None:
+            # "latest" requests are not addressable by year; pass straight through
+            if self.client is None:
+                return {"error": True, "message": "offline: unversioned request", "status_code": None}
+            return getattr(self.client, f"get_{endpoint}")(company, calendarYear)
+
+        stored = self.store.get(company, endpoint, calendarYear)
+        if self.mode == "offline":
+            if stored is None:
+                return {"error": True, "message": f"offline: {endpoint} {company} {calendarYear} not in store", "status_code": None}
+            self._count("store_hits")
+            return stored.payload
+        if stored is not None and not self._needs_refresh(stored, calendarYear):
+            self._count("store_hits")
+            return stored.payload
+
+        self._count("fetched")
+        payload, meta = self.client.conditional_get(
+            f"/server/company/{endpoint}/{company}",
+            params={"calendarYear": calendarYear},
+            etag=stored.etag if stored else None,
+            last_modified=stored.last_modified if stored else None,
+        )
+        if payload is None and stored is not None:
+            self._count("not_modified")
+            self.store.touch(company, endpoint, calendarYear)
+            return stored.payload
+        if payload is None or (isinstance(payload, dict) and payload.get("error")):
+            if stored is not None:
+                self._count("stale_served")
+                return stored.payload
+            return payload if payload is not None else {"error": True, "message": "304 without a stored copy", "status_code": 304}
+        if self.store.put(company, endpoint, calendarYear, payload, etag=meta.get("etag"), last_modified=meta.get("last_modified")):
+            self._count("changed")
+        return payload
+
+    def get_balancesheet(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+        return self._statement("balancesheet", company, calendarYear)
+
+    def get_pnl(self, company: str, calendarYear: int | None = None) -> Dict[str, Any]:
+        return self._statement("pnl", company, calendarYear)
@@ -0,0 +1,99 @@
+import random
+import time
+from dataclasses import dataclass, field
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+
+@dataclass
+class RetryPolicy:
+    """Retry transient failures (429/5xx, connection errors, timeouts) with exponential backoff and full jitter.
+
+    The n-th retry waits `uniform(0, min(max_backoff, backoff_factor * 2**n))` seconds, unless the server
+    sent a `Retry-After` header, which is honoured (capped at `max_backoff`).
+    """
+
+    max_retries: int = 3
+    backoff_factor: float = 0.5
+    max_backoff: float = 30.0
+    status_forcelist: Tuple[int, ...] = (429, 500, 502, 503, 504)
+    jitter: bool = True
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        if retry_after is not None:
+            return min(max(retry_after, 0.0), self.max_backoff)
+        ceiling = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a `Retry-After` header (delta-seconds or HTTP-date form)."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return when.timestamp() - time.time()
+
+
+def get_with_retry(get: Callable[..., requests.Response], url: str, policy: Optional[RetryPolicy], **kwargs: Any) -> requests.Response:
+    """Call `get(url, **kwargs)`, retrying per `policy`.
+
+    Returns the last response (its status is left for the caller's `raise_for_status`) or re-raises the
+    last connection error once retries are exhausted.
+    """
+    attempt = 0
+    while True:
+        try:
+            resp = get(url, **kwargs)
+        except (requests.ConnectionError, requests.Timeout):
+            if policy is None or attempt >= policy.max_retries:
+                raise
+            policy.sleep(policy.backoff(attempt))
+            attempt += 1
+            continue
+
+        status = getattr(resp, "status_code", None)
+        if policy is None or attempt >= policy.max_retries or status not in policy.status_forcelist:
+            return resp
+        headers = getattr(resp, "headers", None) or {}
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+        resp.close()
+        policy.sleep(policy.backoff(attempt, retry_after))
+        attempt += 1
+
+
+class PooledTransport:
+    """Keep-alive HTTP transport backed by a `requests.Session` with a sized connection pool.
+
+    Share one instance across clients/threads talking to the same host to reuse TCP/TLS connections.
+    """
+
+    def __init__(self, pool_size: int = 10, pool_block: bool = False, session: Optional[requests.Session] = None):
+        self.pool_size = pool_size
+        self.session = session or requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, pool_block=pool_block, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None, params: Optional[Dict[str, Any]] = None,
+            timeout: Optional[float] = None) -> requests.Response:
+        return self.session.get(url, headers=headers, params=params, timeout=timeout)
+
+    def close(self) -> None:
+        self.session.close()
+
+    def __enter__(self) -> "PooledTransport":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,76 @@
+import asyncio
+import json
+import time
+import unittest
+from urllib.parse import parse_qs, urlparse
+
+from src.async_client import AsyncACAPIClient
+from src.graph import AsyncStateGraph, StateGraph
+from src.transport import RetryPolicy
+
+
+PAYLOADS = {
+    ("balancesheet", "2023"): {"inventory": 120, "capitalWorkInProgress": 10},
+    ("balancesheet", "2022"): {"inventory": 100, "capitalWorkInProgress": 15},
+    ("pnl", "2023"): {"costOfRevenue": 80},
+}
+
+
+async def _start_stub(latency: float, fail_pnl: bool = False):
+    """Minimal asyncio HTTP stub for the AC endpoints (one request per connection)."""
+
+    async def handle(reader, writer):
+        request_line = (await reader.readline()).decode()
+        while (await reader.readline()) not in (b"\r\n", b""):
+            pass
+        url = urlparse(request_line.split()[1])
+        endpoint = url.path.split("/")[3]
+        year = parse_qs(url.query)["calendarYear"][0]
+        await asyncio.sleep(latency)
+        status, body = (500, {}) if fail_pnl and endpoint == "pnl" else (200, PAYLOADS[(endpoint, year)])
+        data = json.dumps(body).encode()
+        writer.write(
+            f"HTTP/1.1 {status} X\r\nContent-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+            f"Connection: close\r\n\r\n".encode() + data
+        )
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+    return server, f"http://{host}:{port}"
+
+
+class TestAsyncStateGraph(unittest.TestCase):
+    def test_fetches_run_concurrently_and_match_sync_output(self):
+        latency = 0.3
+
+        async def scenario():
+            server, base = await _start_stub(latency)
+            async with server:
+                graph = AsyncStateGraph(AsyncACAPIClient(base, api_key="k"))
+                start = time.perf_counter()
+                state = await graph.arun("AAPL", 2023)
+                return state, time.perf_counter() - start
+
+        state, elapsed = asyncio.run(scenario())
+        # three sequential calls would need >= 3 x latency
+        self.assertLess(elapsed, 2 * latency)
+        self.assertEqual(state["final_report"]["report"]["cogs"], "80.00")
+
+    def test_errors_are_logged_like_sync_graph(self):
+        async def scenario():
+            server, base = await _start_stub(0, fail_pnl=True)
+            async with server:
+                client = AsyncACAPIClient(base, api_key="k", retry=RetryPolicy(max_retries=0))
+                async_state = await AsyncStateGraph(client).arun("AAPL", 2023)
+                sync_state = await asyncio.to_thread(StateGraph(client.sync).run, "AAPL", 2023)
+                return async_state, sync_state
+
+        async_state, sync_state = asyncio.run(scenario())
+        self.assertTrue(async_state["logs"][0].startswith("pnl error: 500"))
+        self.assertEqual(async_state["final_report"], sync_state["final_report"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,74 @@
+import json
+import unittest
+from unittest.mock import patch
+
+from src.ac_api_client import ACAPIClient
+from src.audit import AuditTrail
+from src.cogs import calculate_cogs_for_company
+from src.graph import StateGraph
+
+
+EXPECTED_TEXT = (
+    "Fetched balancesheet for AAPL 2023 and 2022. Opening inventory=100.12, Closing inventory=120.67, "
+    "CWIP opening=15.876, CWIP closing=10.123. Fetched P&L costOfRevenue=80.555."
+    " | CWIP transfers = cwip_opening (15.876) - cwip_closing (10.123) = 5.753"
+    " | Implied purchases = costOfRevenue (80.555) - opening_inventory (100.12) - cwip_transfers (5.753) "
+    "+ closing_inventory (120.67) = 95.352"
+    " | COGS = opening_inventory (100.12) + purchases (95.352) + cwip_transfers (5.753) "
+    "- closing_inventory (120.67) = 80.555"
+    " | Reconciliation (calculated COGS - reported costOfRevenue) = 0.000"
+)
+
+
+@patch.object(ACAPIClient, "get_pnl", return_value={"costOfRevenue": "80.555"})
+class TestAuditModes(unittest.TestCase):
+    def setUp(self):
+        self.client = ACAPIClient("http://example.local", api_key="k")
+        patcher = patch.object(ACAPIClient, "get_balancesheet", side_effect=lambda company, year: {
+            2023: {"inventory": "120.67", "capitalWorkInProgress": "10.123"},
+            2022: {"inventory": "100.12", "capitalWorkInProgress": "15.876"},
+        }[year])
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_text_mode_is_unchanged(self, _):
+        self.assertEqual(calculate_cogs_for_company(self.client, "AAPL", 2023)["audit_trail"], EXPECTED_TEXT)
+
+    def test_structured_mode_renders_identical_text(self, _):
+        res = calculate_cogs_for_company(self.client, "AAPL", 2023, audit="structured")
+        trail = res["audit_trail"]
+        self.assertIsInstance(trail, AuditTrail)
+        self.assertEqual([s.operation for s in trail], ["fetch", "cwip_transfers", "implied_purchases", "cogs", "reconciliation"])
+        self.assertEqual(trail.render(), EXPECTED_TEXT)
+        self.assertEqual(trail[1].to_record(), {
+            "operation": "cwip_transfers",
+            "operands": {"cwip_opening": "15.876", "cwip_closing": "10.123"},
+            "result": "5.753",
+        })
+
+    def test_off_mode_keeps_data(self, _):
+        res = calculate_cogs_for_company(self.client, "AAPL", 2023, audit="off")
+        self.assertIsNone(res["audit_trail"])
+        self.assertEqual(res["data"], calculate_cogs_for_company(self.client, "AAPL", 2023)["data"])
+
+    def test_graph_modes(self, _):
+        graph = StateGraph(self.client)
+        text = graph.run("AAPL", 2023)["final_report"]
+        structured = graph.run("AAPL", 2023, audit="structured")
+        off = graph.run("AAPL", 2023, audit="off")["final_report"]
+
+        self.assertEqual(" | ".join(text["logs"]), EXPECTED_TEXT.rsplit(" | ", 1)[0])
+        self.assertEqual(structured["audit_trail"].render(), EXPECTED_TEXT.rsplit(" | ", 1)[0])
+        self.assertEqual(structured["final_report"]["logs"], [])
+        json.dumps(structured["final_report"])
+        self.assertEqual(off["logs"], [])
+        self.assertNotIn("audit", off)
+        self.assertEqual(off["report"], text["report"])
+
+    def test_unknown_mode_rejected(self, _):
+        with self.assertRaises(ValueError):
+            StateGraph(self.client).run("AAPL", 2023, audit="verbose")
+
+
+if __name__ == "__main__":
+    unittest.main()
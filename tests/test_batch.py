@@ -0,0 +1,129 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from array import array
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+
+import requests
+
+from src.ac_api_client import ACAPIClient
+from src.batch import BatchStats, load_pairs_csv, parse_years, run_batch
+from src.transport import RetryPolicy
+
+
+def _fake_statements():
+    calls = []
+    lock = threading.Lock()
+
+    def bs(company, year):
+        with lock:
+            calls.append(("bs", company, year))
+        return {"inventory": 100 + year % 10, "capitalWorkInProgress": 10}
+
+    def pnl(company, year):
+        with lock:
+            calls.append(("pnl", company, year))
+        return {"costOfRevenue": 80}
+
+    return calls, bs, pnl
+
+
+class TestBatch(unittest.TestCase):
+    def test_parse_years(self):
+        self.assertEqual(parse_years("2019-2021,2023"), [2019, 2020, 2021, 2023])
+
+    def test_load_pairs_csv(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "pairs.csv")
+            with open(path, "w") as fh:
+                fh.write("ticker,year\nAAPL,2023\nMSFT,\n")
+            self.assertEqual(load_pairs_csv(path, [2021, 2022]), [("AAPL", 2023), ("MSFT", 2021), ("MSFT", 2022)])
+
+    def test_shared_prior_year_sheets_fetched_once(self):
+        calls, bs, pnl = _fake_statements()
+        client = ACAPIClient("http://example.local", api_key="k")
+        pairs = [(c, y) for c in ("AAPL", "MSFT") for y in range(2015, 2025)] + [("AAPL", 2020)]
+        results = []
+        with patch.object(client, "get_balancesheet", side_effect=bs), patch.object(client, "get_pnl", side_effect=pnl):
+            stats = run_batch(client, pairs, workers=4, on_result=results.append)
+
+        # 10 years -> 11 balance sheets + 10 P&Ls per company, instead of 30 calls
+        self.assertEqual(len(calls), 42)
+        self.assertEqual(len(set(calls)), 42)
+        self.assertEqual(stats.requests, 42)
+        self.assertEqual(stats.pairs, 20)
+        self.assertEqual(len(results), 20)
+        self.assertEqual(stats.failed, 0)
+
+    def test_fetch_errors_are_counted_and_not_reused(self):
+        client = ACAPIClient("http://example.local", api_key="k")
+        with patch.object(client, "get_balancesheet", return_value={"error": True, "message": "boom"}) as mock_bs, \
+                patch.object(client, "get_pnl", return_value={"costOfRevenue": 80}):
+            stats = run_batch(client, [("AAPL", 2023), ("AAPL", 2024)], workers=1)
+        self.assertEqual(stats.failed, 2)
+        self.assertEqual(mock_bs.call_count, 4)
+
+    def test_failing_pair_does_not_stop_the_batch(self):
+        client = ACAPIClient("http://example.local", api_key="k")
+
+        def bs(company, year):
+            return {"inventory": "1.2.3" if year == 2021 else 100, "capitalWorkInProgress": 10}
+
+        out, results = [], []
+        with patch.object(client, "get_balancesheet", side_effect=bs), \
+                patch.object(client, "get_pnl", return_value={"costOfRevenue": 80}):
+            stats = run_batch(client, [("AAPL", y) for y in range(2020, 2024)], workers=1, sink=out.append,
+                              on_result=results.append)
+        # 2021 is unreadable as both the current and the prior year
+        self.assertEqual((stats.pairs, stats.failed), (4, 2))
+        self.assertEqual([r["year"] for r in out], [2020, 2021, 2022, 2023])
+        failed = [r for r in out if r["year"] in (2021, 2022)]
+        self.assertTrue(all(r["report"] == {} and r["logs"][0].startswith("error: ValueError") for r in failed))
+        self.assertEqual(sum("error" in s for s in results), 2)
+
+    def test_bad_audit_mode_raises(self):
+        client = ACAPIClient("http://example.local", api_key="k")
+        with patch.object(client, "get_balancesheet") as mock_bs:
+            with self.assertRaises(ValueError):
+                run_batch(client, [("AAPL", 2023)], audit="bogus")
+        mock_bs.assert_not_called()
+
+    @patch("src.ac_api_client.requests.get")
+    def test_process_pool_matches_threaded_run(self, mock_get):
+        def get(url, params=None, **kwargs):
+            endpoint, company = urlparse(url).path.split("/")[3:5]
+            year = params["calendarYear"]
+            if (company, year) == ("MSFT", 2020):
+                return MagicMock(status_code=404, headers={}, raise_for_status=MagicMock(side_effect=requests.HTTPError("404")))
+            body = {"costOfRevenue": 80 + year % 7} if endpoint == "pnl" else {
+                "sections": [{"lineItems": [{"label": "Inventory", "amount": f"{100 + year % 10:,}"}]}], "cwip": year % 3}
+            # one 200 whose body is not JSON: a failed fetch in both modes
+            content = b"<html>maintenance</html>" if (endpoint, company, year) == ("pnl", "AAPL", 2019) else json.dumps(body).encode()
+            resp = MagicMock(status_code=200, headers={}, content=content)
+            resp.json.side_effect = lambda: json.loads(resp.content)
+            return resp
+
+        mock_get.side_effect = get
+        client = ACAPIClient("http://example.local", api_key="k", retry=RetryPolicy(max_retries=0))
+        pairs = [(c, y) for c in ("AAPL", "MSFT") for y in range(2018, 2023)]
+        reports = {}
+        for processes in (0, 2):
+            out = []
+            stats = run_batch(client, pairs, workers=2, sink=out.append, processes=processes)
+            reports[processes] = sorted(out, key=lambda r: (r["company"], r["year"]))
+            self.assertEqual((stats.pairs, stats.failed, stats.requests), (10, 3, 23))
+        self.assertEqual(reports[0], reports[2])
+
+    def test_summary_percentiles(self):
+        stats = BatchStats(pairs=100, elapsed=2.0, latencies=array("d", [i / 1000 for i in range(1, 101)]))
+        summary = stats.summary()
+        self.assertEqual(summary["pairs_per_sec"], 50.0)
+        self.assertEqual(summary["p50_ms"], 50.0)
+        self.assertEqual(summary["p99_ms"], 99.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.ac_api_client import ACAPIClient
+from src.cache import DiskCache, MemoryCache
+from src.graph import StateGraph
+
+
+def _response(payload):
+    resp = MagicMock()
+    resp.json.return_value = payload
+    resp.raise_for_status.return_value = None
+    return resp
+
+
+class TestMemoryCache(unittest.TestCase):
+    def test_lru_eviction(self):
+        cache = MemoryCache(maxsize=2)
+        cache.set(("balancesheet", "A", 1), {"v": 1})
+        cache.set(("balancesheet", "A", 2), {"v": 2})
+        cache.get(("balancesheet", "A", 1))
+        cache.set(("balancesheet", "A", 3), {"v": 3})
+        self.assertIsNone(cache.get(("balancesheet", "A", 2)))
+        self.assertEqual(cache.get(("balancesheet", "A", 1)), {"v": 1})
+        self.assertEqual(cache.stats(), {"hits": 2, "misses": 1})
+
+    def test_ttl_expiry(self):
+        now = [0.0]
+        cache = MemoryCache(ttl=10, clock=lambda: now[0])
+        cache.set(("pnl", "A", 1), {"v": 1})
+        now[0] = 9.9
+        self.assertIsNotNone(cache.get(("pnl", "A", 1)))
+        now[0] = 10.0
+        self.assertIsNone(cache.get(("pnl", "A", 1)))
+
+    def test_disk_backend_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            MemoryCache(backend=DiskCache(tmp)).set(("pnl", "A", 2023), {"costOfRevenue": 80})
+            fresh = MemoryCache(backend=DiskCache(tmp))
+            self.assertEqual(fresh.get(("pnl", "A", 2023)), {"costOfRevenue": 80})
+            self.assertEqual(len(fresh), 1)
+
+
+class TestClientCaching(unittest.TestCase):
+    @patch("src.ac_api_client.requests.get")
+    def test_prior_year_reused_across_runs(self, mock_get):
+        payloads = {
+            "2022": {"inventory": 100, "capitalWorkInProgress": 15},
+            "2023": {"inventory": 120, "capitalWorkInProgress": 10},
+            "2024": {"inventory": 130, "capitalWorkInProgress": 5},
+        }
+
+        def fake_get(url, headers=None, params=None, timeout=None):
+            year = str(params["calendarYear"])
+            return _response({"costOfRevenue": 80} if "/pnl/" in url else payloads[year])
+
+        mock_get.side_effect = fake_get
+        cache = MemoryCache()
+        graph = StateGraph(ACAPIClient("http://example.local", api_key="k", cache=cache))
+        graph.run("AAPL", 2023)
+        graph.run("AAPL", 2024)
+
+        # 2 runs x 3 fetches, with the 2023 balance sheet served from cache the second time
+        self.assertEqual(mock_get.call_count, 5)
+        self.assertEqual(cache.stats(), {"hits": 1, "misses": 5})
+
+    @patch("src.ac_api_client.requests.get")
+    def test_errors_are_not_cached(self, mock_get):
+        mock_get.side_effect = [requests.RequestException("502"), _response({"inventory": 1})]
+        client = ACAPIClient("http://example.local", api_key="k", cache=MemoryCache())
+        self.assertTrue(client.get_balancesheet("AAPL", 2023).get("error"))
+        self.assertEqual(client.get_balancesheet("AAPL", 2023), {"inventory": 1})
+        self.assertEqual(client.get_balancesheet("AAPL", 2023), {"inventory": 1})
+        self.assertEqual(mock_get.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - pyarrow is optional
+    pa = None
+
+from src.ac_api_client import ACAPIClient
+from src.batch import run_batch
+from src.cogs import compute_cogs_from_formula, compute_cwip_transfers, compute_implied_purchases
+from src.models import FIELDS
+
+if pa is not None:
+    from src.columnar import OUTPUTS, ColumnarWriter, read_states, read_table
+
+
+def _bs(company, year):
+    if (company, year) == ("MSFT", 2019):
+        return {"error": True, "message": "boom", "status_code": 500}
+    return {"inventory": f"{1000 + year % 10 * 37.125}", "capitalWorkInProgress": str(10 + year % 3)}
+
+
+def _pnl(company, year):
+    return {"costOfRevenue": f"{5000 + year % 5}.335"}
+
+
+@unittest.skipIf(pa is None, "pyarrow not installed")
+class TestColumnar(unittest.TestCase):
+    def _export(self, path, pairs, row_group_size):
+        client = ACAPIClient("http://example.local", api_key="k")
+        reports = {}
+        with ColumnarWriter(path, row_group_size=row_group_size) as writer, \
+                patch.object(client, "get_balancesheet", side_effect=_bs), patch.object(client, "get_pnl", side_effect=_pnl):
+            run_batch(client, pairs, workers=2, audit="off", on_result=writer,
+                      sink=lambda r: reports.__setitem__((r["company"], r["year"]), r["report"]))
+        return reports
+
+    def test_round_trip_and_recompute(self):
+        pairs = [(c, y) for c in ("AAPL", "MSFT") for y in range(2016, 2024)]
+        for ext in ("parquet", "arrow"):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, f"results.{ext}")
+                reports = self._export(path, pairs, row_group_size=5)
+                if ext == "parquet":
+                    self.assertEqual(pq.ParquetFile(path).num_row_groups, 4)
+
+                table = read_table(path)
+                self.assertEqual(table.num_rows, 16)
+                self.assertEqual(table.schema.field("cogs").type, pa.decimal128(38, 2))
+                self.assertEqual(table.schema.field("closing_inventory").type, pa.decimal128(38, 6))
+                for row in table.to_pylist():
+                    report = reports[(row["company"], row["year"])]
+                    self.assertEqual({f: str(row[f]) for f in OUTPUTS}, {f: report[f] for f in OUTPUTS})
+                # MSFT 2019 and 2020 read the failed 2019 balance sheet
+                self.assertEqual(sum(table.column("fetch_error").to_pylist()), 2)
+
+                states = list(read_states(path))
+                self.assertEqual(len(states), 14)
+                for company, year, fin in states:
+                    self.assertEqual(fin.closing_inventory, Decimal(_bs(company, year)["inventory"]))
+                    cwip = compute_cwip_transfers(fin, audit="off")["data"]
+                    purchases = compute_implied_purchases(fin, audit="off")["data"]
+                    cogs = compute_cogs_from_formula(fin.opening_inventory, purchases, cwip, fin.closing_inventory, audit="off")["data"]
+                    self.assertEqual(f"{cogs.quantize(Decimal('0.01'))}", reports[(company, year)]["cogs"])
+                self.assertEqual(len(list(read_states(path, skip_errors=False))), 16)
+
+    def test_halted_states_get_null_columns(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "results.parquet")
+            with ColumnarWriter(path) as writer:
+                writer({"company": "AAPL", "year": 2023, "raw_pnl": {"error": True}})
+            row = read_table(path).to_pylist()[0]
+            self.assertTrue(row["fetch_error"])
+            self.assertTrue(all(row[f] is None for f in (*FIELDS, *OUTPUTS)))
+            self.assertEqual(list(read_states(path, skip_errors=False)), [])
+        with self.assertRaises(ValueError):
+            ColumnarWriter(os.path.join(tmp, "results.csv"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import json
+import random
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.ac_api_client import ACAPIClient
+from src.decode import get_decoder, stream_extract
+from src.extract import FieldExtractor
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+KEYS = ["inventory", "capitalWorkInProgress", "costOfRevenue"]
+LABELS = ["Inventory", "Total Inventory", "CWIP", "cost of sales", "Other", "Cash", "", None, 7]
+VALUES = ["1,200", "(300)", "n/a", "", None, 0, 12.5, -4, {"nested": 1}, [1, 2]]
+
+
+def _random_payload(rng: random.Random, depth: int = 0):
+    roll = rng.random()
+    if depth > 3 or roll < 0.3:
+        return rng.choice(VALUES)
+    if roll < 0.6:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    obj = {}
+    if rng.random() < 0.5:
+        obj[rng.choice(["name", "label"])] = rng.choice(LABELS)
+        obj[rng.choice(["value", "amount", "quantity"])] = rng.choice(VALUES)
+    for _ in range(rng.randint(0, 3)):
+        key = rng.choice(["sections", "lineItems", "data", "inventory", "cogs", "cwip", "title"])
+        obj[key] = _random_payload(rng, depth + 1)
+    return obj
+
+
+def _response(body: bytes):
+    resp = MagicMock(status_code=200, headers={}, content=body)
+    resp.json.side_effect = AssertionError("resp.json() should not be used")
+    return resp
+
+
+class TestDecode(unittest.TestCase):
+    def test_stream_extract_matches_full_decode(self):
+        rng = random.Random(7)
+        ex = FieldExtractor(KEYS)
+        for _ in range(2000):
+            payload = _random_payload(rng)
+            body = json.dumps(payload, indent=rng.choice([None, 1]))
+            self.assertEqual(stream_extract(ex, body.encode()), ex.extract(payload), body)
+
+    def test_stream_extract_stops_at_settled_keys(self):
+        ex = FieldExtractor(["inventory"])
+        # the tail is never read, so trailing garbage goes unnoticed once the key is settled
+        self.assertEqual(stream_extract(ex, b'{"inventory": "5", "rest": [garbage'), {"inventory": "5"})
+        with self.assertRaises(ValueError):
+            stream_extract(ex, b'{"other": [garbage')
+        # a None match only ends the search inside its own list; the outer level keeps looking
+        body = b'{"a": [{"label": "Inventory", "amount": "n/a"}, {"x": 1}], "inventory": 5}'
+        self.assertEqual(stream_extract(ex, body), ex.extract(json.loads(body)))
+        self.assertEqual(stream_extract(ex, body), {"inventory": 5})
+
+    def test_decoders_agree_with_stdlib(self):
+        body = b'{"a": [1, 2.5, "x"], "b": NaN, "big": 123456789012345678901234567890}'
+        expected = json.loads(body)
+        for name in ("auto", "json") + (("orjson",) if orjson else ()):
+            got = get_decoder(name)(body)
+            self.assertEqual(got["big"], expected["big"])
+            self.assertEqual(got["a"], expected["a"])
+        with self.assertRaises(ValueError):
+            get_decoder("yaml")
+
+    @patch("src.ac_api_client.requests.get")
+    def test_client_decoder_and_partial_mode(self, mock_get):
+        payload = {"sections": [{"lineItems": [{"label": "Other", "amount": "1"}]},
+                                {"lineItems": [{"label": "Inventory", "amount": "1,200"}, {"name": "CWIP", "value": "(5)"}]}]}
+        body = json.dumps(payload).encode()
+        mock_get.side_effect = lambda *a, **kw: _response(body)
+
+        client = ACAPIClient("http://example.local", api_key="k", decoder="auto")
+        self.assertEqual(client.get_balancesheet("AAPL", 2023), payload)
+
+        partial = ACAPIClient("http://example.local", api_key="k", partial=True)
+        fields = partial.get_balancesheet("AAPL", 2023)
+        self.assertEqual(fields, {"inventory": "1200", "capitalWorkInProgress": "-5"})
+        # the reduced payload extracts to the same values as the full one
+        ex = FieldExtractor(["inventory", "capitalWorkInProgress"])
+        self.assertEqual(ex.extract(fields), ex.extract(payload))
+
+    def test_stream_extract_rejects_non_json(self):
+        ex = FieldExtractor(["inventory"])
+        for body in (b"<html>oops</html>", b"", b'{"sections": [{"label": "Inv'):
+            with self.assertRaises(ValueError):
+                stream_extract(ex, body)
+        # scalar documents are valid JSON and extract like the full decode
+        self.assertEqual(stream_extract(ex, b"7"), ex.extract(7))
+
+    @patch("src.ac_api_client.requests.get")
+    def test_client_returns_error_dict_for_non_json_body(self, mock_get):
+        for body in (b"<html>bad gateway</html>", b'{"sections": [{"lineItems": ['):
+            mock_get.side_effect = lambda *a, **kw: _response(body)
+            for client in (ACAPIClient("http://example.local", api_key="k", decoder="auto"),
+                           ACAPIClient("http://example.local", api_key="k", decoder="json"),
+                           ACAPIClient("http://example.local", api_key="k", partial=True)):
+                res = client.get_balancesheet("AAPL", 2023)
+                self.assertTrue(res.get("error"), body)
+                self.assertIn("invalid JSON body", res["message"])
+                self.assertEqual(res["status_code"], 200)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import random
+import unittest
+
+from src.cogs import _find_value
+from src.extract import FieldExtractor
+
+
+KEYS = ["inventory", "capitalWorkInProgress", "costOfRevenue"]
+
+
+def _random_payload(rng: random.Random, depth: int = 0):
+    labels = ["Inventory", "Inventories", "CWIP", "Cost of Sales", "cogs", "Cash", "Receivables", "Goodwill"]
+    values = [None, "", "(1,200)", "1,000.50", 0, 42, 3.5, "n/a"]
+    if depth > 3:
+        return rng.choice(values)
+    kind = rng.random()
+    if kind < 0.35:
+        return {rng.choice(labels + ["sections", "lineItems", "totals"]): _random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))}
+    if kind < 0.7:
+        return [_random_payload(rng, depth + 1) for _ in range(rng.randint(0, 4))]
+    if kind < 0.9:
+        return {rng.choice(["name", "label"]): rng.choice(labels), rng.choice(["value", "amount", "quantity"]): rng.choice(values)}
+    return rng.choice(values)
+
+
+class TestFieldExtractor(unittest.TestCase):
+    def assertMatchesFindValue(self, payload):
+        got = FieldExtractor(KEYS).extract(payload)
+        for key in KEYS:
+            self.assertEqual(got[key], _find_value(payload, key), f"{key} in {payload!r}")
+
+    def test_nested_sections(self):
+        payload = {
+            "sections": [
+                {"lineItems": [{"label": "Inventory", "amount": "(1,200)"}]},
+                {"lineItems": [{"name": "CapitalWorkInProgress", "value": "300"}]},
+            ],
+            "metrics": [{"name": "CostOfRevenue", "value": "150"}],
+        }
+        got = FieldExtractor(KEYS).extract(payload)
+        self.assertEqual(got, {"inventory": "-1200", "capitalWorkInProgress": "300", "costOfRevenue": "150"})
+
+    def test_none_match_stops_search_at_that_level_only(self):
+        # An empty match ends the search inside its own dict, but the parent keeps looking
+        payload = {"a": {"inventory": "", "Inventories": 5}, "b": {"totalInventory": 7}}
+        self.assertEqual(FieldExtractor(["inventory"]).extract(payload), {"inventory": 7})
+        self.assertMatchesFindValue(payload)
+
+    def test_missing_and_none_payloads(self):
+        self.assertEqual(FieldExtractor(KEYS).extract(None), {k: None for k in KEYS})
+        self.assertEqual(FieldExtractor(KEYS).extract({"cash": 1}), {k: None for k in KEYS})
+
+    def test_matches_find_value_on_random_payloads(self):
+        rng = random.Random(1234)
+        for _ in range(2000):
+            self.assertMatchesFindValue(_random_payload(rng))
+
+
+if __name__ == "__main__":
+    unittest.main()
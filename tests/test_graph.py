@@ -1,8 +1,34 @@
+import asyncio
+import threading
+import time
 import unittest
 from unittest.mock import patch
 
 from src.ac_api_client import ACAPIClient
-from src.graph import StateGraph
+from src.graph import AsyncStateGraph, HaltGraph, StateGraph
+
+
+class SlowClient:
+    """Client stand-in whose calls each take `delay` seconds; records the threads that served them."""
+
+    def __init__(self, delay=0.0, fail_pnl=False):
+        self.delay = delay
+        self.fail_pnl = fail_pnl
+        self.threads = set()
+
+    def _wait(self):
+        self.threads.add(threading.get_ident())
+        time.sleep(self.delay)
+
+    def get_balancesheet(self, company, year):
+        self._wait()
+        return {"inventory": 100 + year - 2022, "capitalWorkInProgress": 10}
+
+    def get_pnl(self, company, year):
+        self._wait()
+        if self.fail_pnl:
+            return {"error": True, "message": "HTTP 500", "status_code": 500}
+        return {"costOfRevenue": 80}
 
 
 class TestStateGraph(unittest.TestCase):
@@ -24,3 +50,80 @@ class TestStateGraph(unittest.TestCase):
         self.assertEqual(fr["company"], "AAPL")
         self.assertEqual(fr["year"], 2023)
         self.assertIn("report", fr)
+
+    def test_nodes_declare_dependencies(self):
+        graph = StateGraph(SlowClient())
+        self.assertEqual(graph.dependencies("fetch_pnl"), [])
+        self.assertEqual(graph.dependencies("check_fetch"),
+                         ["fetch_balancesheet_current", "fetch_balancesheet_prior", "fetch_pnl"])
+        self.assertIn("check_fetch", graph.dependencies("calculate"))
+        self.assertEqual(graph.dependencies("audit"), ["check_fetch", "calculate"])
+        with self.assertRaises(ValueError):
+            graph.add_node("audit", lambda state: None)
+
+    def test_parallel_fetches_match_serial_output(self):
+        delay = 0.2
+        serial = StateGraph(SlowClient()).run("AAPL", 2023)
+        client = SlowClient(delay)
+        with StateGraph(client, workers=3) as graph:
+            start = time.perf_counter()
+            state = graph.run("AAPL", 2023)
+            elapsed = time.perf_counter() - start
+        self.assertLess(elapsed, 2 * delay)
+        self.assertEqual(len(client.threads), 3)
+        self.assertEqual(state["final_report"], serial["final_report"])
+
+    def test_fail_fast_skips_calculation(self):
+        for workers in (1, 3):
+            graph = StateGraph(SlowClient(fail_pnl=True), workers=workers)
+            state = graph.run("AAPL", 2023, fail_fast=True)
+            self.assertEqual(state["halted"], "pnl fetch failed")
+            self.assertEqual(state["final_report"]["report"], {})
+            self.assertEqual(state["final_report"]["logs"], ["pnl error: HTTP 500"])
+            # without fail_fast the calculation still runs on whatever was fetched
+            state = graph.run("AAPL", 2023)
+            self.assertNotIn("halted", state)
+            self.assertEqual(state["final_report"]["report"]["cogs"], "0.00")
+            graph.close()
+
+    def test_added_node_runs_after_its_inputs(self):
+        graph = StateGraph(SlowClient(), workers=2)
+
+        def margin(state):
+            if state["report"].get("cogs") is None:
+                raise HaltGraph("no cogs")
+            return {"margin_note": f"cogs={state['report']['cogs']}"}
+
+        graph.add_node("margin", margin, reads=("report",), writes=("margin_note",))
+        self.assertEqual(graph.dependencies("margin"), ["calculate"])
+        state = graph.run("AAPL", 2023)
+        self.assertEqual(state["margin_note"], "cogs=80.00")
+        graph.close()
+
+    def test_added_node_runs_in_series_and_async_runs(self):
+        def note(state):
+            return {"margin_note": f"{state['year']}:{state['report']['cogs']}"}
+
+        graph = StateGraph(SlowClient())
+        graph.add_node("margin", note, reads=("year", "report"), writes=("margin_note",))
+        series = graph.run_range("AAPL", 2022, 2023)
+        self.assertEqual([s["margin_note"] for s in series["states"]], ["2022:80.00", "2023:80.00"])
+
+        class AsyncClient:
+            sync = SlowClient()
+
+            async def get_balancesheet(self, company, year):
+                return self.sync.get_balancesheet(company, year)
+
+            async def get_pnl(self, company, year):
+                return self.sync.get_pnl(company, year)
+
+        agraph = AsyncStateGraph(AsyncClient())
+        agraph.add_node("margin", note, reads=("year", "report"), writes=("margin_note",))
+        state = asyncio.run(agraph.arun("AAPL", 2023))
+        self.assertEqual(state["margin_note"], "2023:80.00")
+        self.assertEqual(state["final_report"], graph.run("AAPL", 2023)["final_report"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+from urllib.parse import urlparse
+
+from src.ac_api_client import ACAPIClient
+from src.batch import run_batch
+from src.incremental import ResultTracker, dependents, input_hashes
+from src.transport import RetryPolicy
+
+
+class Statements:
+    """Mutable fake AC data: balance sheets and P&Ls per year, with optional failures."""
+
+    def __init__(self):
+        self.bs = {y: {"inventory": 100 + y % 10, "capitalWorkInProgress": 10} for y in range(2017, 2023)}
+        self.pnl = {y: {"costOfRevenue": 800 + y % 7} for y in range(2018, 2023)}
+        self.failing = set()
+
+    def get_balancesheet(self, company, year):
+        if ("balancesheet", year) in self.failing:
+            return {"error": True, "message": "boom", "status_code": 503}
+        return dict(self.bs[year])
+
+    def get_pnl(self, company, year):
+        return dict(self.pnl[year])
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmp.name, "results.sqlite")
+        self.data = Statements()
+        self.pairs = [("AAPL", y) for y in range(2018, 2023)]
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def _run(self, **kwargs):
+        client = ACAPIClient("http://example.local", api_key="k")
+        reports = {}
+        with ResultTracker(self.db) as tracker, \
+                patch.object(client, "get_balancesheet", side_effect=self.data.get_balancesheet), \
+                patch.object(client, "get_pnl", side_effect=self.data.get_pnl):
+            stats = run_batch(client, self.pairs, workers=1, tracker=tracker,
+                              sink=lambda r: reports.__setitem__(r["year"], r), **kwargs)
+            counts = tracker.stats()
+        return stats, counts, reports
+
+    def test_only_changed_inputs_are_recomputed(self):
+        _, counts, first = self._run()
+        self.assertEqual(counts, {"reused": 0, "recomputed": 5})
+
+        stats, counts, second = self._run()
+        self.assertEqual(counts, {"reused": 5, "recomputed": 0})
+        self.assertEqual(stats.reused, 5)
+        self.assertEqual(second, first)
+
+        # year 2020's balance sheet is also 2021's prior year
+        self.data.bs[2020]["inventory"] = 555
+        states = []
+        _, counts, third = self._run(on_result=states.append)
+        self.assertEqual(counts, {"reused": 3, "recomputed": 2})
+        self.assertEqual(sorted(s["year"] for s in states if not s.get("reused")), [2020, 2021])
+        self.assertNotEqual(third[2020]["report"], first[2020]["report"])
+        self.assertNotEqual(third[2021]["report"], first[2021]["report"])
+        reused = next(s for s in states if s.get("reused"))
+        self.assertEqual(str(reused["financial_data"].closing_inventory), str(self.data.bs[reused["year"]]["inventory"]))
+
+    def test_error_payloads_are_never_reused(self):
+        self.data.failing.add(("balancesheet", 2019))
+        _, counts, _ = self._run()
+        self.assertEqual(counts, {"reused": 0, "recomputed": 3})
+        _, counts, _ = self._run()
+        self.assertEqual(counts, {"reused": 3, "recomputed": 0})
+        self.assertIsNone(input_hashes([{"error": True}, {}, {}]))
+
+    def test_audit_mode_is_part_of_the_key(self):
+        self._run(audit="off")
+        _, counts, reports = self._run(audit="structured")
+        self.assertEqual(counts["reused"], 0)
+        self.assertIn("audit", reports[2020])
+
+    def test_dependents_and_invalidate(self):
+        self.assertEqual(dependents("AAPL", "balancesheet", 2020), [("AAPL", 2020), ("AAPL", 2021)])
+        self.assertEqual(dependents("AAPL", "pnl", 2020), [("AAPL", 2020)])
+        self._run()
+        with ResultTracker(self.db) as tracker:
+            self.assertEqual(tracker.invalidate("AAPL", "balancesheet", 2022), 1)
+            self.assertEqual(len(tracker), 4)
+
+    @patch("src.ac_api_client.requests.get")
+    def test_process_pool_reuses_by_raw_body(self, mock_get):
+        def get(url, params=None, **kwargs):
+            endpoint = urlparse(url).path.split("/")[3]
+            year = params["calendarYear"]
+            body = self.data.pnl[year] if endpoint == "pnl" else self.data.bs[year]
+            return MagicMock(status_code=200, headers={}, content=json.dumps(body).encode())
+
+        mock_get.side_effect = get
+        client = ACAPIClient("http://example.local", api_key="k", retry=RetryPolicy(max_retries=0))
+        for expected in ({"reused": 0, "recomputed": 5}, {"reused": 5, "recomputed": 0}):
+            with ResultTracker(self.db) as tracker:
+                run_batch(client, self.pairs, workers=1, processes=1, tracker=tracker)
+                self.assertEqual(tracker.stats(), expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
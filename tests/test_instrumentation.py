@@ -0,0 +1,84 @@
+import json
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.ac_api_client import ACAPIClient
+from src.graph import StateGraph
+from src.instrumentation import Hooks, Profiler
+
+
+class Recorder(Hooks):
+    def __init__(self):
+        self.events = []
+
+    def on_node(self, node, seconds):
+        self.events.append(("node", node))
+
+    def on_http(self, path, status, seconds, bytes_received, decode_seconds):
+        self.events.append(("http", path, status, bytes_received))
+
+    def on_extract(self, path, seconds):
+        self.events.append(("extract", path))
+
+
+def _response(payload):
+    body = json.dumps(payload).encode()
+    resp = MagicMock(status_code=200, headers={}, content=body)
+    resp.json.return_value = payload
+    return resp
+
+
+class TestInstrumentation(unittest.TestCase):
+    @patch("src.ac_api_client.requests.get")
+    def test_hooks_see_http_nodes_and_extraction(self, mock_get):
+        bs = {"sections": [{"lineItems": [{"name": "Inventory", "value": 10}]}]}
+        pnl = {"costOfRevenue": 80}
+        mock_get.side_effect = [_response(bs), _response(bs), _response(pnl)]
+        rec = Recorder()
+        client = ACAPIClient("http://example.local", api_key="k", hooks=rec)
+        state = StateGraph(client, hooks=rec).run("AAPL", 2023)
+
+        self.assertEqual(state["final_report"]["report"]["cogs"], "80.00")
+        http = [e for e in rec.events if e[0] == "http"]
+        self.assertEqual(len(http), 3)
+        self.assertEqual(http[2], ("http", "/server/company/pnl/AAPL", 200, len(json.dumps(pnl))))
+        self.assertEqual([e[1] for e in rec.events if e[0] == "node"],
+                         ["fetch_balancesheet_current", "fetch_balancesheet_prior", "fetch_pnl", "check_fetch",
+                          "calculate", "audit"])
+        self.assertEqual([e[1] for e in rec.events if e[0] == "extract"],
+                         ["sections.lineItems", "sections.lineItems", "flat"])
+
+    @patch("src.ac_api_client.requests.get")
+    def test_profiler_exports(self, mock_get):
+        mock_get.return_value = _response({"costOfRevenue": 80})
+        prof = Profiler()
+        client = ACAPIClient("http://example.local", api_key="k", hooks=prof)
+        StateGraph(client, hooks=prof).run("AAPL", 2023)
+
+        summary = prof.summary()
+        self.assertEqual(summary["http_seconds"]["balancesheet"]["count"], 2)
+        self.assertEqual(summary["http_seconds"]["pnl"]["count"], 1)
+        self.assertEqual(summary["node_seconds"]["fetch_pnl"]["count"], 1)
+        self.assertEqual(prof.http_status, {"200": 3})
+
+        text = prof.to_prometheus()
+        self.assertIn("# TYPE cogs_http_seconds summary", text)
+        self.assertIn('cogs_http_seconds_count{endpoint="balancesheet"} 2', text)
+        self.assertIn('cogs_http_responses_total{status="200"} 3', text)
+
+        otlp = prof.to_otlp()
+        names = [m["name"] for m in otlp["resourceMetrics"][0]["scopeMetrics"][0]["metrics"]]
+        self.assertIn("cogs.node_seconds", names)
+        self.assertIn("node_seconds", prof.format_summary())
+
+    @patch.object(ACAPIClient, "get_balancesheet", return_value={"inventory": 1})
+    @patch.object(ACAPIClient, "get_pnl", return_value={"costOfRevenue": 1})
+    def test_no_hooks_by_default(self, mock_pnl, mock_bs):
+        client = ACAPIClient("http://example.local", api_key="k")
+        self.assertIsNone(client.hooks)
+        state = StateGraph(client).run("AAPL", 2023)
+        self.assertEqual(state["final_report"]["report"]["cogs"], "1.00")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,65 @@
+import random
+import unittest
+from decimal import Decimal, ROUND_HALF_UP
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from src.cogs import compute_cogs_from_formula, compute_cwip_transfers, compute_implied_purchases
+from src.models import FinancialState
+
+if np is not None:
+    from src.kernel import FIELDS, cogs_kernel, cogs_kernel_exact, round_half_up_to_cents, to_scaled
+
+
+def _scalar(fin: FinancialState) -> dict:
+    cwip = compute_cwip_transfers(fin)["data"]
+    purchases = compute_implied_purchases(fin)["data"]
+    cogs = compute_cogs_from_formula(fin.opening_inventory, purchases, cwip, fin.closing_inventory)["data"]
+    return {"cogs": cogs, "implied_purchases": purchases, "cwip_transfers": cwip, "reconciliation": cogs - fin.cost_of_revenue}
+
+
+def _cents(d: Decimal) -> int:
+    return int(d.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP).scaleb(2))
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestKernel(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(7)
+        self.rows = [
+            FinancialState(**{f: Decimal(rng.randint(-10 ** 12, 10 ** 12)).scaleb(-rng.randint(0, 4)) for f in FIELDS})
+            for _ in range(500)
+        ]
+        self.columns = {f: [getattr(r, f) for r in self.rows] for f in FIELDS}
+
+    def test_exact_mode_matches_decimal_path_to_the_cent(self):
+        out = cogs_kernel_exact(*(to_scaled(self.columns[f]) for f in FIELDS))
+        for i, row in enumerate(self.rows):
+            for name, value in _scalar(row).items():
+                self.assertEqual(int(out[name][i]), _cents(value), f"{name} row {i}")
+
+    def test_float_mode_is_close(self):
+        out = cogs_kernel(*(np.array([float(v) for v in self.columns[f]]) for f in FIELDS))
+        expected = np.array([float(_scalar(r)["implied_purchases"]) for r in self.rows])
+        np.testing.assert_allclose(out["implied_purchases"], expected, rtol=1e-9, atol=1e-3)
+
+    def test_round_half_up_ties_away_from_zero(self):
+        scaled = np.array([50, -50, 49, -49, 150, -150], dtype=np.int64)
+        self.assertEqual(round_half_up_to_cents(scaled, decimals=4).tolist(), [1, -1, 0, 0, 2, -2])
+
+    def test_to_scaled_rejects_lossy_and_oversized_inputs(self):
+        with self.assertRaises(ValueError):
+            to_scaled(["1.00001"])
+        with self.assertRaises(ValueError):
+            to_scaled([Decimal(10) ** 16])
+        for bad in ("1e25", "abc", "NaN", float("inf")):
+            with self.assertRaises(ValueError):
+                to_scaled([bad])
+        self.assertEqual(to_scaled(["12.5", None, 3]).tolist(), [125000, 0, 30000])
+
+
+if __name__ == "__main__":
+    unittest.main()
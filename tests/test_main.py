@@ -0,0 +1,59 @@
+import contextlib
+import io
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
+
+# Pulled in by the HTTP client only; a CLI process that never makes a request should not pay for them
+HEAVY = ("requests", "urllib3", "dotenv", "pydantic")
+
+
+def _loaded_after(code: str) -> list:
+    probe = code + f"\nimport sys\nprint('loaded:' + ','.join(m for m in {HEAVY!r} if m in sys.modules))"
+    out = subprocess.run([sys.executable, "-c", probe], cwd=ROOT, capture_output=True, text=True, check=True)
+    return [m for m in out.stdout.rsplit("loaded:", 1)[1].strip().split(",") if m]
+
+
+class TestStartup(unittest.TestCase):
+    def test_help_and_import_skip_heavy_dependencies(self):
+        self.assertEqual(_loaded_after("import main\ntry:\n    main.parse_args(['--help'])\nexcept SystemExit:\n    pass"), [])
+
+    def test_graph_and_store_do_not_import_the_http_client(self):
+        self.assertEqual(_loaded_after("import src.graph, src.batch, src.store"), [])
+
+    def test_offline_calculation_skips_pydantic(self):
+        code = ("from src.graph import StateGraph\nfrom src.hybrid import Prefetched\n"
+                "bs = {'inventory': 5, 'capitalWorkInProgress': 1}\n"
+                "StateGraph(Prefetched(2023, bs, bs, {'costOfRevenue': 3})).run('AAPL', 2023)")
+        self.assertEqual(_loaded_after(code), [])
+        self.assertEqual(_loaded_after("from src.models import FinancialState"), ["pydantic"])
+
+    def test_client_loads_dotenv_on_first_use_not_on_import(self):
+        self.assertEqual(_loaded_after("import src.ac_api_client"), ["requests", "urllib3"])
+        self.assertIn("dotenv", _loaded_after("from src.ac_api_client import ACAPIClient\nACAPIClient('http://x')"))
+
+
+
+class TestParseArgs(unittest.TestCase):
+    def test_shared_rate_limit_needs_a_rate(self):
+        import main
+
+        with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+            main.parse_args(["--rate-limit-shared", "/tmp/rl"])
+        args = main.parse_args(["--rate-limit", "5", "--rate-limit-shared", "/tmp/rl"])
+        self.assertEqual((args.rate_limit, args.rate_limit_shared), (5.0, "/tmp/rl"))
+
+    def test_series_must_be_an_ordered_range(self):
+        import main
+
+        for bad in ("2020", "abc", "2024-2020", "2020-", "-2020"):
+            with self.assertRaises(SystemExit), contextlib.redirect_stderr(io.StringIO()):
+                main.parse_args(["--series", bad])
+        self.assertEqual(main.parse_args(["--series", "2010-2024"]).series, (2010, 2024))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,66 @@
+import pickle
+import typing
+import unittest
+from decimal import Decimal
+
+from src.cogs import build_financial_state, compute_cogs_from_formula, compute_cwip_transfers, compute_implied_purchases
+from src.graph import State
+from src.models import AnyFinancialState, CompactFinancialState, FinancialState
+
+
+RAW = {
+    "opening_inventory": "100.12",
+    "closing_inventory": 120.67,
+    "cwip_opening": Decimal("15.876"),
+    "cwip_closing": None,
+    "cost_of_revenue": 80,
+}
+
+
+class TestCompactFinancialState(unittest.TestCase):
+    def test_validated_constructor_coerces_like_pydantic(self):
+        compact = CompactFinancialState(**RAW)
+        model = FinancialState(**RAW)
+        self.assertEqual(compact, model)
+        self.assertEqual(compact.cwip_closing, Decimal("0"))
+        self.assertEqual(compact.to_model(), model)
+        self.assertEqual(CompactFinancialState.from_model(model), compact)
+
+    def test_validated_constructor_rejects_garbage(self):
+        with self.assertRaises(ValueError):
+            CompactFinancialState(opening_inventory="abc")
+
+    def test_from_decimals_skips_validation(self):
+        fin = CompactFinancialState.from_decimals(*(Decimal(i) for i in range(5)))
+        self.assertEqual(fin.cost_of_revenue, Decimal(4))
+        with self.assertRaises(AttributeError):
+            fin.extra = 1
+
+    def test_compute_functions_accept_either(self):
+        for fin in (FinancialState(**RAW), CompactFinancialState(**RAW)):
+            cwip = compute_cwip_transfers(fin)
+            purchases = compute_implied_purchases(fin)
+            cogs = compute_cogs_from_formula(fin.opening_inventory, purchases["data"], cwip["data"], fin.closing_inventory)
+            self.assertEqual(cwip["data"], Decimal("15.876"))
+            self.assertEqual(cogs["data"], Decimal("80"))
+            self.assertIn("cwip_opening (15.876)", cwip["audit_trail"])
+
+    def test_build_financial_state_returns_the_pydantic_model_unless_compact(self):
+        bs, pnl = {"inventory": "120.67", "capitalWorkInProgress": 3}, {"costOfRevenue": 80}
+        fin = build_financial_state(None, "AAPL", 2023, bs_current=bs, bs_prev=bs, pnl_current=pnl)["data"]
+        compact = build_financial_state(None, "AAPL", 2023, bs_current=bs, bs_prev=bs, pnl_current=pnl, compact=True)["data"]
+        self.assertIsInstance(fin, FinancialState)
+        self.assertEqual(fin.model_dump()["closing_inventory"], Decimal("120.67"))
+        self.assertIsInstance(compact, CompactFinancialState)
+        self.assertEqual(compact, fin)
+
+    def test_model_pickles_and_annotations_resolve(self):
+        model = FinancialState(**RAW)
+        self.assertEqual(FinancialState.__qualname__, "FinancialState")
+        self.assertEqual(pickle.loads(pickle.dumps(model)), model)
+        self.assertEqual(typing.get_type_hints(compute_cwip_transfers)["fin"], AnyFinancialState)
+        self.assertEqual(typing.get_type_hints(State)["financial_data"], typing.Optional[AnyFinancialState])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,110 @@
+import gzip
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from src.ac_api_client import ACAPIClient
+from src.batch import run_batch
+from src.graph import StateGraph
+from src.output import JsonlWriter, completed_pairs, read_jsonl
+
+
+class TestJsonlOutput(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    @patch.object(ACAPIClient, "get_balancesheet")
+    @patch.object(ACAPIClient, "get_pnl")
+    def test_graph_streams_compact_line_per_report(self, mock_get_pnl, mock_get_bs):
+        mock_get_bs.side_effect = [
+            {"inventory": 120, "capitalWorkInProgress": 10},
+            {"inventory": 100, "capitalWorkInProgress": 15},
+        ]
+        mock_get_pnl.return_value = {"costOfRevenue": 80}
+        path = self.path("out.jsonl")
+        with JsonlWriter(path) as writer:
+            state = StateGraph(ACAPIClient("http://example.local", api_key="k"), sink=writer).run("AAPL", 2023)
+            # written by audit_node, before the writer is closed
+            self.assertEqual(writer.written, 1)
+
+        with open(path) as fh:
+            lines = fh.read().splitlines()
+        self.assertEqual(len(lines), 1)
+        self.assertNotIn(", ", lines[0][:40])
+        self.assertEqual(list(read_jsonl(path)), [state["final_report"]])
+
+    def test_gzip_resume_skips_completed_pairs(self):
+        path = self.path("out.jsonl.gz")
+        with JsonlWriter(path) as writer:
+            writer.write({"company": "AAPL", "year": 2022})
+        with JsonlWriter(path, append=True) as writer:
+            writer.write({"company": "AAPL", "year": 2023})
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022), ("AAPL", 2023)})
+        with gzip.open(path, "rt") as fh:
+            self.assertEqual(len(fh.read().splitlines()), 2)
+
+    def test_truncated_tail_is_dropped_before_append(self):
+        path = self.path("out.jsonl")
+        with open(path, "w") as fh:
+            fh.write('{"company":"AAPL","year":2022}\n{"company":"AAPL","ye')
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022)})
+        with JsonlWriter(path, append=True) as writer:
+            writer.write({"company": "MSFT", "year": 2023})
+        self.assertEqual([r["company"] for r in read_jsonl(path)], ["AAPL", "MSFT"])
+
+    def test_unterminated_gzip_member_is_repaired(self):
+        path = self.path("out.jsonl.gz")
+        writer = JsonlWriter(path)
+        writer.write({"company": "AAPL", "year": 2022})
+        writer.flush()
+        # simulate a crash: flushed but never closed, so the gzip trailer is missing
+        with open(path, "rb") as fh:
+            partial = fh.read()
+        writer.close()
+        with open(path, "wb") as fh:
+            fh.write(partial)
+
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022)})
+        with JsonlWriter(path, append=True) as writer:
+            writer.write({"company": "AAPL", "year": 2023})
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022), ("AAPL", 2023)})
+
+    def test_gzip_is_not_flushed_per_line(self):
+        reports = [{"company": f"C{i}", "year": 2023, "report": {"cogs": "1000.00"}, "logs": []} for i in range(5000)]
+        sizes = {}
+        for every in (1, 1000):
+            path = self.path(f"out{every}.jsonl.gz")
+            with JsonlWriter(path, gzip_flush_every=every) as writer:
+                for report in reports:
+                    writer.write(report)
+            sizes[every] = os.path.getsize(path)
+            self.assertEqual(len(list(read_jsonl(path))), 5000)
+        self.assertLess(sizes[1000] * 2, sizes[1])
+
+    def test_failed_reports_are_retried_on_resume(self):
+        path = self.path("out.jsonl")
+        with JsonlWriter(path) as writer:
+            writer.write({"company": "AAPL", "year": 2022, "report": {"cogs": "1.00"}, "logs": []})
+            writer.write({"company": "AAPL", "year": 2023, "report": {}, "logs": ["pnl error: 503 Server Error"]})
+            writer.write({"company": "MSFT", "year": 2023, "report": {}, "logs": ["error: ValidationError: bad"]})
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022)})
+        with JsonlWriter(path, append=True) as writer:
+            writer.write({"company": "AAPL", "year": 2023, "report": {"cogs": "2.00"}, "logs": []})
+        self.assertEqual(completed_pairs(path), {("AAPL", 2022), ("AAPL", 2023)})
+
+    def test_batch_sink_receives_every_report(self):
+        client = ACAPIClient("http://example.local", api_key="k")
+        path = self.path("batch.jsonl")
+        with patch.object(client, "get_balancesheet", return_value={"inventory": 1}), \
+                patch.object(client, "get_pnl", return_value={"costOfRevenue": 2}), JsonlWriter(path) as writer:
+            run_batch(client, [("A", 2022), ("A", 2023), ("B", 2023)], workers=2, sink=writer)
+        self.assertEqual(completed_pairs(path), {("A", 2022), ("A", 2023), ("B", 2023)})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import multiprocessing
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.ac_api_client import ACAPIClient
+from src.ratelimit import FileTokenBucket, RequestScheduler, TokenBucket
+from src.transport import RetryPolicy
+
+
+def _drain(path, n):
+    bucket = FileTokenBucket(path, rate=100, burst=1)
+    for _ in range(n):
+        bucket.acquire()
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    def test_burst_then_steady_rate(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+        waits = [bucket.acquire() for _ in range(5)]
+        self.assertEqual(waits[:2], [0.0, 0.0])
+        self.assertAlmostEqual(clock.now, 0.3)
+
+    def test_stats_count_throttled_waits(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=10, burst=2, clock=clock, sleep=clock.sleep)
+        for _ in range(5):
+            bucket.acquire()
+        stats = bucket.stats()
+        self.assertEqual((stats["acquired"], stats["throttled"]), (5, 3))
+        self.assertAlmostEqual(stats["wait_total_s"], 0.3)
+        self.assertAlmostEqual(stats["wait_max_s"], 0.1)
+
+    def test_scheduler_limits_per_host(self):
+        clock = FakeClock()
+        scheduler = RequestScheduler(rate=10, per_host={"slow.local": 1}, burst=1, clock=clock, sleep=clock.sleep)
+        for _ in range(3):
+            scheduler.acquire("http://slow.local/x")
+        self.assertAlmostEqual(clock.now, 2.0)
+        for _ in range(3):
+            scheduler.acquire("http://fast.local:8080/y?a=1")
+        self.assertAlmostEqual(clock.now, 2.2)
+        self.assertEqual(set(scheduler.stats()), {"slow.local", "fast.local:8080"})
+        self.assertIsNone(RequestScheduler(per_host={"a": 1}).bucket("b"))
+
+    def test_file_bucket_is_shared_across_processes(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "host.bucket")
+            ctx = multiprocessing.get_context("fork")
+            start = time.monotonic()
+            procs = [ctx.Process(target=_drain, args=(path, 10)) for _ in range(2)]
+            for p in procs:
+                p.start()
+            for p in procs:
+                p.join(10)
+            # 20 tokens at 100/s with a burst of 1: at least 0.19 s no matter how they interleave
+            self.assertGreaterEqual(time.monotonic() - start, 0.18)
+            self.assertTrue(all(p.exitcode == 0 for p in procs))
+
+    @patch("src.ac_api_client.requests.get")
+    def test_client_waits_for_a_slot_on_every_attempt(self, mock_get):
+        ok = MagicMock(status_code=200, headers={})
+        ok.json.return_value = {"costOfRevenue": 1}
+        busy = MagicMock(status_code=429, headers={})
+        mock_get.side_effect = [busy, ok]
+        clock = FakeClock()
+        scheduler = RequestScheduler(rate=5, burst=1, clock=clock, sleep=clock.sleep)
+        client = ACAPIClient("http://example.local", api_key="k", scheduler=scheduler,
+                             retry=RetryPolicy(backoff_factor=0, jitter=False, sleep=lambda s: None))
+        self.assertEqual(client.get_pnl("AAPL", 2023), {"costOfRevenue": 1})
+        self.assertEqual(scheduler.stats()["example.local"]["acquired"], 2)
+        self.assertAlmostEqual(clock.now, 0.2)
+
+    def test_rejects_non_positive_rate(self):
+        with self.assertRaises(ValueError):
+            TokenBucket(rate=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
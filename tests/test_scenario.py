@@ -0,0 +1,77 @@
+import csv
+import os
+import random
+import tempfile
+import unittest
+from decimal import Decimal
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - numpy is optional
+    np = None
+
+from src.cogs import compute_cogs_from_formula, compute_cwip_transfers, compute_implied_purchases
+from src.models import FIELDS, CompactFinancialState, FinancialState
+
+if np is not None:
+    from src.scenario import Scenario, run_scenarios, scenario_grid
+
+
+def _decimal_outputs(fin) -> dict:
+    cwip = compute_cwip_transfers(fin, audit="off")["data"]
+    purchases = compute_implied_purchases(fin, audit="off")["data"]
+    cogs = compute_cogs_from_formula(fin.opening_inventory, purchases, cwip, fin.closing_inventory, audit="off")["data"]
+    return {"cogs": cogs, "implied_purchases": purchases, "cwip_transfers": cwip, "reconciliation": cogs - fin.cost_of_revenue}
+
+
+@unittest.skipIf(np is None, "numpy not installed")
+class TestScenario(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        self.states = {
+            f"C{i}": FinancialState(**{f: Decimal(rng.randint(0, 10 ** 8)).scaleb(-2) for f in FIELDS})
+            for i in range(20)
+        }
+
+    def test_grid_is_the_cartesian_product(self):
+        grid = scenario_grid({"closing_inventory": [-5, 0, 5], "cwip_closing": [0, 10]}, {"cost_of_revenue": [100]})
+        self.assertEqual(len(grid), 6)
+        self.assertEqual(grid[0].name, "closing_inventory=-5%,cwip_closing=+0%,cost_of_revenue=100")
+        self.assertEqual(scenario_grid()[0].name, "base")
+        with self.assertRaises(ValueError):
+            Scenario("bad", shocks={"inventory": 5})
+
+    def test_matches_decimal_path(self):
+        scenarios = scenario_grid({"closing_inventory": [-5, 0, 12.5], "opening_inventory": [3]}) + [
+            Scenario("fixed", shocks={"cwip_opening": 50}, overrides={"cwip_opening": 7, "closing_inventory": 0}),
+        ]
+        table = run_scenarios(self.states, scenarios)
+        self.assertEqual(table.shape, (20, 4))
+        for i, (label, fin) in enumerate(self.states.items()):
+            for j, sc in enumerate(scenarios):
+                values = {f: getattr(fin, f) * (1 + Decimal(str(sc.shocks.get(f, 0))) / 100) for f in FIELDS}
+                values.update({f: Decimal(str(v)) for f, v in sc.overrides.items()})
+                expected = _decimal_outputs(CompactFinancialState.from_decimals(*(values[f] for f in FIELDS)))
+                for name, value in expected.items():
+                    self.assertAlmostEqual(table.columns[name][i, j], float(value), delta=1e-4, msg=f"{label} {sc.name} {name}")
+
+    def test_outputs_and_table_formats(self):
+        states = list(self.states.values())
+        table = run_scenarios(states, scenario_grid({"closing_inventory": [0, 10]}), outputs=["implied_purchases"])
+        self.assertEqual(list(table.columns), ["implied_purchases"])
+        flat = table.long()
+        self.assertEqual(len(flat["company"]), 40)
+        self.assertEqual(flat["scenario"][:4].tolist(), [0, 1, 0, 1])
+        rows = list(table.rows())
+        self.assertEqual(rows[1]["scenario"], "closing_inventory=+10%")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "out.csv")
+            self.assertEqual(table.to_csv(path), 40)
+            with open(path, newline="") as fh:
+                self.assertEqual(len(list(csv.DictReader(fh))), 40)
+        with self.assertRaises(ValueError):
+            run_scenarios(states, [], outputs=["margin"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import random
+import unittest
+
+from src.cogs import _find_value
+from src.extract import SYNONYMS, FieldExtractor, load_synonyms, register_synonyms
+from src.schema import ShapeRegistry, parse_path
+
+
+KEYS = ["inventory", "capitalWorkInProgress", "costOfRevenue"]
+LABELS = ["Inventory", "Inventories", "CWIP", "Cost of Sales", "Cash", "Receivables", "Goodwill", None]
+VALUES = [None, "", "(1,200)", "1,000.50", 0, 42, "n/a"]
+
+
+def _line_item(rng):
+    item = {rng.choice(["name", "label"]): rng.choice(LABELS), rng.choice(["value", "amount", "quantity"]): rng.choice(VALUES)}
+    roll = rng.random()
+    if roll < 0.05:
+        item["details"] = [{"label": "Inventory", "amount": 7}]
+    elif roll < 0.1:
+        item[rng.choice(["inventory", "cogs", "note"])] = rng.choice(VALUES)
+    return item
+
+
+def _shaped_payload(rng):
+    roll = rng.random()
+    if roll < 0.5:
+        payload = {"sections": [{"title": "S", "lineItems": [_line_item(rng) for _ in range(rng.randint(0, 5))]}
+                                for _ in range(rng.randint(0, 4))]}
+    elif roll < 0.8:
+        payload = {"metrics": [_line_item(rng) for _ in range(rng.randint(0, 6))]}
+    else:
+        payload = {rng.choice(["inventory", "Inventories", "cwip", "costOfSales", "cash"]): rng.choice(VALUES) for _ in range(3)}
+    if rng.random() < 0.15:
+        payload = dict([(rng.choice(["company", "totals", "inventory"]), rng.choice([1, {"inventory": 3}, [5]]))] + list(payload.items()))
+    return payload
+
+
+class TestShapeRegistry(unittest.TestCase):
+    def test_parse_path(self):
+        self.assertEqual(parse_path("sections[].lineItems[]"), ["sections", None, "lineItems", None])
+        self.assertEqual(parse_path(""), [])
+
+    def test_shapes_match_generic_search(self):
+        rng = random.Random(99)
+        registry = ShapeRegistry()
+        extractor = FieldExtractor(KEYS, registry=registry)
+        for _ in range(3000):
+            payload = _shaped_payload(rng)
+            got = extractor.extract(payload)
+            for key in KEYS:
+                self.assertEqual(got[key], _find_value(payload, key), f"{key} in {payload!r}")
+        # most payloads follow a declared shape; the perturbed ones fall back
+        self.assertGreater(registry.stats["sections.lineItems"], 1000)
+        self.assertGreater(registry.stats["metrics"], 500)
+        self.assertGreater(registry.stats["generic"], 0)
+
+    def test_stats_and_custom_shape(self):
+        registry = ShapeRegistry()
+        registry.register("data.rows", "data.rows[]")
+        extractor = FieldExtractor(["inventory"], registry=registry)
+        self.assertEqual(extractor.extract({"data": {"rows": [{"label": "Inventory", "value": 5}]}}), {"inventory": 5})
+        self.assertEqual(extractor.extract([[{"label": "Inventory", "value": 6}]]), {"inventory": 6})
+        self.assertEqual(registry.stats["data.rows"], 1)
+        self.assertEqual(registry.stats["generic"], 1)
+        self.assertAlmostEqual(sum(registry.hit_rates().values()), 1.0)
+
+
+class TestConfigurableSynonyms(unittest.TestCase):
+    def setUp(self):
+        saved = {k: list(v) for k, v in SYNONYMS.items()}
+
+        def restore():
+            SYNONYMS.clear()
+            load_synonyms(saved)
+
+        self.addCleanup(restore)
+
+    def test_register_synonyms_updates_existing_extractors(self):
+        extractor = FieldExtractor(["inventory"], registry=ShapeRegistry())
+        payload = {"metrics": [{"name": "Stock in trade", "value": 9}]}
+        self.assertIsNone(extractor.extract(payload)["inventory"])
+        register_synonyms("inventory", ["Stock in trade"])
+        self.assertEqual(extractor.extract(payload)["inventory"], 9)
+        self.assertEqual(_find_value(payload, "inventory"), 9)
+        self.assertIn("inventories", SYNONYMS["inventory"])
+
+    def test_load_synonyms_replaces_listed_fields(self):
+        load_synonyms({"costOfRevenue": ["cost of materials consumed"]})
+        self.assertEqual(_find_value({"costOfMaterialsConsumed": 4, "cogs": 5}, "costOfRevenue"), 4)
+        self.assertIsNone(_find_value({"cogs": 5}, "costOfRevenue"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+from unittest.mock import patch
+
+from src.ac_api_client import ACAPIClient
+from src.cogs import calculate_cogs_for_company, calculate_cogs_series
+from src.graph import StateGraph
+
+
+def _bs(company, year):
+    return {"inventory": 100 + 10 * (year - 2010), "capitalWorkInProgress": 50 - (year - 2010)}
+
+
+def _pnl(company, year):
+    return {"costOfRevenue": 1000 + year}
+
+
+@patch.object(ACAPIClient, "get_pnl", side_effect=_pnl)
+@patch.object(ACAPIClient, "get_balancesheet", side_effect=_bs)
+class TestSeries(unittest.TestCase):
+    def setUp(self):
+        self.client = ACAPIClient("http://example.local", api_key="k")
+
+    def test_series_fetches_each_statement_once(self, mock_bs, mock_pnl):
+        res = calculate_cogs_series(self.client, "AAPL", 2010, 2024)
+        self.assertEqual(mock_bs.call_count, 16)
+        self.assertEqual(mock_pnl.call_count, 15)
+        self.assertEqual(sorted(c.args[1] for c in mock_bs.call_args_list), list(range(2009, 2025)))
+        self.assertEqual([row["year"] for row in res["data"]], list(range(2010, 2025)))
+        self.assertEqual(len(res["audit_trail"]), 15)
+
+    def test_series_matches_single_year_runs(self, mock_bs, mock_pnl):
+        series = calculate_cogs_series(self.client, "AAPL", 2020, 2022)
+        mock_bs.reset_mock()
+        for row, trail in zip(series["data"], series["audit_trail"]):
+            single = calculate_cogs_for_company(self.client, "AAPL", row["year"])
+            self.assertEqual({k: v for k, v in row.items() if k != "year"}, single["data"])
+            self.assertEqual(trail, single["audit_trail"])
+        # per-year mode: 3 requests per year
+        self.assertEqual(mock_bs.call_count, 6)
+
+    def test_graph_run_range(self, mock_bs, mock_pnl):
+        seen = []
+        graph = StateGraph(self.client, sink=seen.append)
+        result = graph.run_range("AAPL", 2010, 2024)
+        self.assertEqual(mock_bs.call_count + mock_pnl.call_count, 31)
+
+        series = result["final_report"]["series"]
+        self.assertEqual(len(series), 15)
+        self.assertEqual(seen, series)
+        self.assertEqual(series[3], StateGraph(self.client).run("AAPL", 2013)["final_report"])
+
+    def test_invalid_range(self, mock_bs, mock_pnl):
+        with self.assertRaises(ValueError):
+            StateGraph(self.client).run_range("AAPL", 2024, 2020)
+
+
+if __name__ == "__main__":
+    unittest.main()
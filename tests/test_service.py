@@ -0,0 +1,129 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import requests
+
+from src.ac_api_client import ACAPIClient
+from src.cache import MemoryCache
+from src.service import CogsService, ServiceMetrics
+
+
+def _fake_get():
+    calls = []
+    lock = threading.Lock()
+
+    def get(path, params=None, fields=None):
+        with lock:
+            calls.append((path, params["calendarYear"]))
+        if "FAIL" in path:
+            return {"error": True, "message": "boom", "status_code": 503}
+        if "/pnl/" in path:
+            return {"costOfRevenue": 80}
+        return {"inventory": 100 + params["calendarYear"] % 10, "capitalWorkInProgress": 10}
+
+    return calls, get
+
+
+class TestService(unittest.TestCase):
+    def setUp(self):
+        self.calls, get = _fake_get()
+        self.client = ACAPIClient("http://example.local", api_key="k", cache=MemoryCache())
+        patcher = patch.object(self.client, "_get", side_effect=get)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.service = CogsService(self.client, port=0, fetch_workers=6, batch_workers=2).start()
+        self.addCleanup(self.service.stop)
+        self.session = requests.Session()
+        self.addCleanup(self.session.close)
+
+    def test_repeat_lookup_is_served_from_the_shared_cache(self):
+        first = self.session.get(f"{self.service.base_url}/cogs/AAPL/2023", params={"audit": "off"})
+        second = self.session.get(f"{self.service.base_url}/cogs/AAPL/2023", params={"audit": "off"})
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.json(), second.json())
+        self.assertEqual(first.json()["company"], "AAPL")
+        self.assertIn("cogs", first.json()["report"])
+        self.assertEqual(len(self.calls), 3)
+        self.assertEqual(self.service.stats()["cache"], {"hits": 3, "misses": 3})
+
+    def test_concurrent_lookups(self):
+        def fetch(year):
+            with requests.Session() as session:
+                return session.get(f"{self.service.base_url}/cogs/MSFT/{year}").status_code
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            statuses = list(pool.map(fetch, [2015 + i % 4 for i in range(16)]))
+        self.assertEqual(statuses, [200] * 16)
+        # 4 years read 5 balance sheets and 4 P&Ls; every statement lookup not served by the shared cache went upstream
+        self.assertEqual(len(set(self.calls)), 9)
+        self.assertEqual(self.service.stats()["cache"]["hits"] + len(self.calls), 16 * 3)
+
+    def test_batch_returns_results_in_request_order(self):
+        body = {"pairs": [["MSFT", 2022], ["AAPL", 2021]], "companies": ["AAPL"], "years": "2022-2023", "audit": "off"}
+        resp = self.session.post(f"{self.service.base_url}/cogs/batch", json=body)
+        self.assertEqual(resp.status_code, 200)
+        data = resp.json()
+        self.assertEqual([(r["company"], r["year"]) for r in data["results"]],
+                         [("MSFT", 2022), ("AAPL", 2021), ("AAPL", 2022), ("AAPL", 2023)])
+        self.assertEqual(data["summary"]["pairs"], 4)
+        self.assertEqual(data["summary"]["failed"], 0)
+
+    def test_batch_accepts_ticker_strings_and_year_lists(self):
+        body = {"companies": "AB, CD", "years": [2022, 2023], "audit": "off"}
+        resp = self.session.post(f"{self.service.base_url}/cogs/batch", json=body)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual([(r["company"], r["year"]) for r in resp.json()["results"]],
+                         [("AB", 2022), ("AB", 2023), ("CD", 2022), ("CD", 2023)])
+        for bad in ({"companies": {"AB": 1}, "years": "2023"}, {"companies": ["AB"], "years": {"from": 2020}},
+                    {"pairs": "AB"}, {"pairs": [["AB", "soon"]]}, ["AB"], {"pairs": [[None, 2020]]},
+                    {"pairs": [["AB", True]]}, {"pairs": [["AB", 2020.7]]}, {"pairs": [["", 2020]]},
+                    {"companies": ["AB"], "years": [2020, None]}, {"pairs": [["AB", 2020]], "audit": "bogus"}):
+            resp = self.session.post(f"{self.service.base_url}/cogs/batch", json=bad)
+            self.assertEqual(resp.status_code, 400, bad)
+
+    def test_encoded_ticker_is_unquoted(self):
+        resp = self.session.get(f"{self.service.base_url}/cogs/M%26M/2023")
+        self.assertEqual(resp.json()["company"], "M&M")
+        self.assertIn(("/server/company/pnl/M&M", 2023), self.calls)
+
+    def test_errors(self):
+        failed = self.session.get(f"{self.service.base_url}/cogs/FAIL/2023")
+        self.assertEqual(failed.status_code, 502)
+        self.assertTrue(any("error: boom" in line for line in failed.json()["logs"]))
+        self.assertEqual(self.session.get(f"{self.service.base_url}/cogs/AAPL/next").status_code, 400)
+        self.assertEqual(self.session.post(f"{self.service.base_url}/cogs/batch", data=b"{}").status_code, 400)
+        self.assertEqual(self.session.post(f"{self.service.base_url}/cogs/batch", data=b"nope").status_code, 400)
+        self.assertEqual(self.session.get(f"{self.service.base_url}/nowhere").status_code, 404)
+
+    def test_metrics_and_stats(self):
+        self.session.get(f"{self.service.base_url}/cogs/AAPL/2023")
+        self.session.get(f"{self.service.base_url}/cogs/FAIL/2023")
+        text = self.session.get(f"{self.service.base_url}/metrics").text
+        self.assertIn('cogs_service_request_seconds_count{route="/cogs"} 2', text)
+        self.assertIn('cogs_service_errors_total{route="/cogs"} 1', text)
+        self.assertIn('cogs_node_seconds_count{node="calculate"}', text)
+        stats = self.session.get(f"{self.service.base_url}/stats").json()
+        self.assertEqual(stats["routes"]["/cogs"]["count"], 2)
+        self.assertEqual(stats["routes"]["/metrics"]["count"], 1)
+        self.assertIn("coalesced", stats)
+
+
+class TestServiceMetrics(unittest.TestCase):
+    def test_summary(self):
+        metrics = ServiceMetrics()
+        for seconds, status in ((0.01, 200), (0.02, 200), (0.5, 502)):
+            metrics.begin()
+            metrics.observe("/cogs", status, seconds)
+        metrics.begin()
+        route = metrics.summary()["routes"]["/cogs"]
+        self.assertEqual(route["count"], 3)
+        self.assertEqual(route["errors"], 1)
+        self.assertEqual(route["p50_ms"], 20.0)
+        self.assertEqual(route["p99_ms"], 500.0)
+        self.assertEqual(metrics.summary()["inflight"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
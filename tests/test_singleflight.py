@@ -0,0 +1,93 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
+
+from src.ac_api_client import ACAPIClient
+from src.async_client import AsyncACAPIClient
+from src.singleflight import SingleFlight
+
+
+class SlowGet:
+    """Stands in for `requests.get`: holds each call open briefly and counts them."""
+
+    def __init__(self, delay: float = 0.05):
+        self.delay = delay
+        self.urls = []
+        self._lock = threading.Lock()
+
+    def __call__(self, url, **kwargs):
+        with self._lock:
+            self.urls.append((url, kwargs.get("params")))
+        time.sleep(self.delay)
+        resp = MagicMock(status_code=200, headers={})
+        resp.json.return_value = {"inventory": 100, "year": kwargs["params"]["calendarYear"]}
+        return resp
+
+
+class TestSingleFlight(unittest.TestCase):
+    def test_concurrent_identical_fetches_share_one_request(self):
+        slow = SlowGet()
+        with patch("src.ac_api_client.requests.get", side_effect=slow):
+            client = ACAPIClient("http://example.local", api_key="k")
+            with ThreadPoolExecutor(max_workers=8) as pool:
+                results = list(pool.map(lambda _: client.get_balancesheet("AAPL", 2023), range(8)))
+                other = client.get_balancesheet("AAPL", 2022)
+        self.assertEqual(len(slow.urls), 2)
+        self.assertTrue(all(r == {"inventory": 100, "year": 2023} for r in results))
+        self.assertEqual(other["year"], 2022)
+        self.assertEqual(client.flight.stats(), {"calls": 2, "coalesced": 7})
+
+    def test_disabled_and_sequential_calls_are_not_coalesced(self):
+        slow = SlowGet(delay=0.02)
+        with patch("src.ac_api_client.requests.get", side_effect=slow):
+            client = ACAPIClient("http://example.local", api_key="k", coalesce=False)
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                list(pool.map(lambda _: client.get_pnl("AAPL", 2023), range(4)))
+            self.assertIsNone(client.flight)
+            # nothing is remembered once a call finishes
+            coalescing = ACAPIClient("http://example.local", api_key="k")
+            coalescing.get_pnl("AAPL", 2023)
+            coalescing.get_pnl("AAPL", 2023)
+        self.assertEqual(len(slow.urls), 6)
+        self.assertEqual(coalescing.flight.coalesced, 0)
+
+    def test_waiters_see_the_leaders_exception(self):
+        flight = SingleFlight()
+        started = threading.Event()
+
+        def boom():
+            started.set()
+            time.sleep(0.05)
+            raise RuntimeError("down")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            first = pool.submit(flight.do, "k", boom)
+            started.wait()
+            second = pool.submit(flight.do, "k", lambda: "unused")
+            for fut in (first, second):
+                with self.assertRaises(RuntimeError):
+                    fut.result()
+        self.assertEqual(flight.stats(), {"calls": 1, "coalesced": 1})
+        self.assertEqual(flight.do("k", lambda: "fresh"), "fresh")
+
+    def test_async_client_coalesces_awaited_calls(self):
+        slow = SlowGet()
+
+        async def scenario():
+            client = AsyncACAPIClient("http://example.local", api_key="k")
+            results = await asyncio.gather(*(client.get_balancesheet("AAPL", 2023) for _ in range(5)),
+                                           client.get_pnl("AAPL", 2023))
+            return client, results
+
+        with patch("src.ac_api_client.requests.get", side_effect=slow):
+            client, results = asyncio.run(scenario())
+        self.assertEqual(len(slow.urls), 2)
+        self.assertEqual(len({id(r) for r in results[:5]}), 1)
+        self.assertEqual(client.coalesced, 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
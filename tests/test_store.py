@@ -0,0 +1,107 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from src.ac_api_client import ACAPIClient
+from src.graph import StateGraph
+from src.store import StatementStore, StoreBackedClient
+
+
+class FakeServer:
+    """Minimal `conditional_get` implementation with ETags, counting requests."""
+
+    def __init__(self):
+        self.requests = []
+        self.payloads = {
+            ("balancesheet", 2022): {"inventory": 100, "capitalWorkInProgress": 15},
+            ("balancesheet", 2023): {"inventory": 120, "capitalWorkInProgress": 10},
+            ("balancesheet", 2024): {"inventory": 130, "capitalWorkInProgress": 5},
+            ("pnl", 2023): {"costOfRevenue": 80},
+            ("pnl", 2024): {"costOfRevenue": 90},
+        }
+        self.fail = False
+
+    def conditional_get(self, path, params=None, etag=None, last_modified=None):
+        endpoint = path.split("/")[3]
+        key = (endpoint, params["calendarYear"])
+        self.requests.append((key, etag))
+        if self.fail:
+            return {"error": True, "message": "502", "status_code": 502}, {"status_code": 502}
+        tag = f'"{hash(repr(self.payloads[key]))}"'
+        if etag == tag:
+            return None, {"status_code": 304, "etag": tag, "last_modified": None}
+        return self.payloads[key], {"status_code": 200, "etag": tag, "last_modified": None}
+
+
+class TestStatementStore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tmp.cleanup)
+        self.store = StatementStore(os.path.join(self.tmp.name, "s.sqlite"))
+        self.addCleanup(self.store.close)
+        self.server = FakeServer()
+
+    def test_put_reports_content_changes(self):
+        self.assertTrue(self.store.put("AAPL", "pnl", 2023, {"a": 1, "b": 2}))
+        self.assertFalse(self.store.put("AAPL", "pnl", 2023, {"b": 2, "a": 1}))
+        self.assertTrue(self.store.put("AAPL", "pnl", 2023, {"a": 2}))
+        self.assertEqual(self.store.get("AAPL", "pnl", 2023).payload, {"a": 2})
+
+    def test_warm_run_only_revalidates_current_year(self):
+        client = StoreBackedClient(self.store, self.server, current_year=2024)
+        StateGraph(client).run("AAPL", 2023)
+        StateGraph(client).run("AAPL", 2024)
+        # cold: 2023, 2022, pnl 2023, then 2024 + pnl 2024 (2023 sheet reused from the store)
+        self.assertEqual(len(self.server.requests), 5)
+
+        self.server.requests.clear()
+        warm = StoreBackedClient(self.store, self.server, current_year=2024)
+        state = StateGraph(warm).run("AAPL", 2024)
+        self.assertEqual(sorted(k for k, _ in self.server.requests), [("balancesheet", 2024), ("pnl", 2024)])
+        self.assertTrue(all(etag for _, etag in self.server.requests))
+        self.assertEqual(warm.stats["not_modified"], 2)
+        self.assertEqual(state["final_report"]["report"]["cogs"], "90.00")
+
+    def test_offline_mode_never_fetches(self):
+        StateGraph(StoreBackedClient(self.store, self.server, current_year=2024)).run("AAPL", 2023)
+        fetched = len(self.server.requests)
+        offline = StoreBackedClient(self.store, mode="offline")
+        online = StateGraph(StoreBackedClient(self.store, self.server, mode="refresh")).run("AAPL", 2023)
+        state = StateGraph(offline).run("AAPL", 2023)
+        self.assertEqual(state["final_report"], online["final_report"])
+        self.assertEqual(len(self.server.requests), fetched + 3)
+
+        missing = StateGraph(offline).run("AAPL", 2030)
+        self.assertTrue(missing["final_report"]["logs"][0].startswith("balancesheet(current) error: offline"))
+
+    def test_stale_copy_served_when_refetch_fails(self):
+        StoreBackedClient(self.store, self.server, current_year=2024).get_pnl("AAPL", 2024)
+        self.server.fail = True
+        client = StoreBackedClient(self.store, self.server, current_year=2024)
+        self.assertEqual(client.get_pnl("AAPL", 2024), {"costOfRevenue": 90})
+        self.assertEqual(client.stats["stale_served"], 1)
+        self.assertTrue(client.get_pnl("AAPL", 2023).get("error"))
+
+    def test_max_age_forces_refetch(self):
+        StoreBackedClient(self.store, self.server, current_year=2030).get_pnl("AAPL", 2023)
+        client = StoreBackedClient(self.store, self.server, current_year=2030, max_age=0)
+        client.get_pnl("AAPL", 2023)
+        self.assertEqual(client.stats["fetched"], 1)
+
+
+class TestConditionalGet(unittest.TestCase):
+    @patch("src.ac_api_client.requests.get")
+    def test_not_modified_returns_no_payload(self, mock_get):
+        resp = MagicMock(status_code=304, headers={"ETag": '"abc"'})
+        resp.raise_for_status.return_value = None
+        mock_get.return_value = resp
+        payload, meta = ACAPIClient("http://example.local", api_key="k").conditional_get("/x", etag='"abc"')
+        self.assertIsNone(payload)
+        self.assertEqual(meta["etag"], '"abc"')
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["If-None-Match"], '"abc"')
+        resp.json.assert_not_called()
+
+
+if __name__ == "__main__":
+    unittest.main()
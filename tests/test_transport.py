@@ -0,0 +1,83 @@
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from src.ac_api_client import ACAPIClient
+from src.transport import PooledTransport, RetryPolicy, parse_retry_after
+
+
+def _response(status, payload=None, headers=None):
+    resp = MagicMock()
+    resp.status_code = status
+    resp.headers = headers or {}
+    resp.json.return_value = payload
+    if status >= 400:
+        resp.raise_for_status.side_effect = requests.HTTPError(f"{status} Server Error", response=resp)
+    else:
+        resp.raise_for_status.return_value = None
+    return resp
+
+
+class TestRetry(unittest.TestCase):
+    def setUp(self):
+        self.sleeps = []
+        self.policy = RetryPolicy(max_retries=3, backoff_factor=0.5, jitter=False, sleep=self.sleeps.append)
+        self.client = ACAPIClient("http://example.local", api_key="k", retry=self.policy)
+
+    @patch("src.ac_api_client.requests.get")
+    def test_transient_502_is_retried(self, mock_get):
+        mock_get.side_effect = [_response(502), _response(503), _response(200, {"inventory": 1})]
+        self.assertEqual(self.client.get_balancesheet("AAPL", 2023), {"inventory": 1})
+        self.assertEqual(self.sleeps, [0.5, 1.0])
+
+    @patch("src.ac_api_client.requests.get")
+    def test_retry_after_is_respected(self, mock_get):
+        mock_get.side_effect = [_response(429, headers={"Retry-After": "7"}), _response(200, {"inventory": 1})]
+        self.client.get_balancesheet("AAPL", 2023)
+        self.assertEqual(self.sleeps, [7.0])
+
+    @patch("src.ac_api_client.requests.get")
+    def test_exhausted_retries_keep_error_dict_contract(self, mock_get):
+        mock_get.side_effect = [_response(503) for _ in range(4)]
+        res = self.client.get_balancesheet("AAPL", 2023)
+        self.assertTrue(res["error"])
+        self.assertEqual(res["status_code"], 503)
+        self.assertEqual(mock_get.call_count, 4)
+
+    @patch("src.ac_api_client.requests.get")
+    def test_connection_errors_are_retried(self, mock_get):
+        mock_get.side_effect = [requests.ConnectionError("reset"), _response(200, {"inventory": 1})]
+        self.assertEqual(self.client.get_balancesheet("AAPL", 2023), {"inventory": 1})
+
+    @patch("src.ac_api_client.requests.get")
+    def test_client_errors_are_not_retried(self, mock_get):
+        mock_get.side_effect = [_response(404)]
+        self.assertEqual(self.client.get_balancesheet("AAPL", 2023)["status_code"], 404)
+        self.assertEqual(self.sleeps, [])
+
+    def test_jittered_backoff_is_bounded(self):
+        policy = RetryPolicy(backoff_factor=1, max_backoff=5)
+        for attempt in range(6):
+            self.assertLessEqual(policy.backoff(attempt), min(5, 2 ** attempt))
+        self.assertEqual(policy.backoff(0, retry_after=60), 5)
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after("3"), 3.0)
+        self.assertIsNone(parse_retry_after(None))
+        self.assertIsNone(parse_retry_after("soon"))
+        self.assertLess(parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT"), 0)
+
+
+class TestPooledTransport(unittest.TestCase):
+    def test_requests_go_through_session(self):
+        session = MagicMock()
+        session.get.return_value = _response(200, {"costOfRevenue": 80})
+        client = ACAPIClient("http://example.local", api_key="k", transport=PooledTransport(pool_size=2, session=session))
+        self.assertEqual(client.get_pnl("AAPL", 2023), {"costOfRevenue": 80})
+        session.get.assert_called_once()
+        self.assertEqual(session.get.call_args.kwargs["params"], {"calendarYear": 2023})
+
+
+if __name__ == "__main__":
+    unittest.main()